@@ -19,6 +19,9 @@ class Settings(BaseSettings):
 
     log_level: str = "INFO"
 
+    # Сколько поисковых запросов к hh.ru планировщик выполняет одновременно
+    INGESTION_MAX_WORKERS: int = 4
+
     @property
     def database_url(self) -> str:
         if self.DATABASE_URL:
@@ -39,6 +42,9 @@ class HHSettings(BaseSettings):
     hh_client_id: str
     hh_client_secret: str
     hh_redirect_uri: str
+    # Адрес API hh.ru; для бенчмарков можно указать локальную заглушку
+    # (scripts/hh_stub.py)
+    hh_api_url: str = "https://api.hh.ru"
 
     _env = os.getenv("APP_ENV", "dev")
     _env_file = ".env.hh.prod" if _env == "prod" else ".env.hh.dev"
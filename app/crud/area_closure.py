@@ -0,0 +1,40 @@
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import AreaClosure
+
+CLOSURE_CHUNK_SIZE = 5000
+
+
+def closure_rows(areas: dict) -> list[dict]:
+    """Пары (предок, потомок) по справочнику ``{id: [название, родитель]}``."""
+    rows = []
+    for area_id in areas:
+        ancestor, depth = area_id, 0
+        # Ограничение глубины защищает от циклов в испорченном справочнике
+        while ancestor is not None and depth <= len(areas):
+            rows.append(
+                {
+                    "ancestor_id": int(ancestor),
+                    "descendant_id": int(area_id),
+                    "depth": depth,
+                }
+            )
+            parent = areas.get(ancestor)
+            ancestor = parent[1] if parent else None
+            depth += 1
+    return rows
+
+
+def rebuild_area_closure(db: Session, areas: dict) -> int:
+    """
+    Пересобирает замыкание целиком. Коммит остаётся за вызывающим кодом,
+    чтобы читатели видели либо старое, либо новое дерево.
+    """
+    rows = closure_rows(areas)
+    db.execute(delete(AreaClosure))
+    for start in range(0, len(rows), CLOSURE_CHUNK_SIZE):
+        end = start + CLOSURE_CHUNK_SIZE
+        db.execute(insert(AreaClosure).values(rows[start:end]))
+    return len(rows)
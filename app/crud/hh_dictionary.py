@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import HHDictionary
+
+
+def get_dictionaries(db: Session) -> list[HHDictionary]:
+    return db.query(HHDictionary).all()
+
+
+def get_dictionaries_version(db: Session) -> datetime | None:
+    """Время последнего обновления справочников (для перезагрузки)."""
+    return db.query(func.max(HHDictionary.fetched_at)).scalar()
+
+
+def save_dictionary(
+    db: Session, name: str, data: dict, fetched_at: datetime
+) -> None:
+    stmt = insert(HHDictionary).values(
+        name=name, data=data, fetched_at=fetched_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HHDictionary.name],
+        set_={"data": stmt.excluded.data, "fetched_at": fetched_at},
+    )
+    db.execute(stmt)
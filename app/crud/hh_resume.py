@@ -1,14 +1,23 @@
-import httpx
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.config import hh_settings
 from app.models import User
 from app.schemas import ResumeCreate
+from app.services import hh_client
+
+API_URL = hh_settings.hh_api_url.rstrip("/")
 
 
 def hh_request(method: str, url: str, token: str, **kwargs):
-    response = httpx.request(
-        method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs
+    response = hh_client.call(
+        lambda: hh_client.http_client.request(
+            method,
+            url,
+            headers={"Authorization": f"Bearer {token}"},
+            **kwargs,
+        ),
+        key=hh_client.token_limiter_key(token),
     )
     return response
 
@@ -69,7 +78,7 @@ def handle_hh_response(
 def get_resumes(access_token: str) -> dict:
     response = hh_request(
         method="GET",
-        url="https://api.hh.ru/resumes/mine",
+        url=f"{API_URL}/resumes/mine",
         token=access_token,
     )
     return handle_hh_response(response, action="get resumes", return_json=True)
@@ -87,7 +96,7 @@ def select_active_resume(db: Session, user_id: int, resume_id: str) -> dict:
 def publish_resume(resume_id: str, access_token: str) -> dict:
     response = hh_request(
         method="POST",
-        url=f"https://api.hh.ru/resumes/{resume_id}/publish",
+        url=f"{API_URL}/resumes/{resume_id}/publish",
         token=access_token,
     )
     return handle_hh_response(response, action="publish resume")
@@ -96,7 +105,7 @@ def publish_resume(resume_id: str, access_token: str) -> dict:
 def search_vacancies_by_resume(resume_id: str, access_token: str) -> dict:
     response = hh_request(
         method="GET",
-        url=f"https://api.hh.ru/resumes/{resume_id}/similar_vacancies",
+        url=f"{API_URL}/resumes/{resume_id}/similar_vacancies",
         token=access_token,
     )
     return handle_hh_response(
@@ -119,7 +128,7 @@ def create_resume(payload: ResumeCreate, access_token: str) -> dict:
     payload_dict = payload.model_dump(exclude_unset=True)
     response = hh_request(
         method="POST",
-        url="https://api.hh.ru/resume_profile",
+        url=f"{API_URL}/resume_profile",
         token=access_token,
         json=payload_dict,
     )
@@ -137,7 +146,7 @@ def get_active_resume(db: Session, user_id: int, access_token: str) -> dict:
 
     response = hh_request(
         method="GET",
-        url=f"https://api.hh.ru/resumes/{user.active_resume_id}",
+        url=f"{API_URL}/resumes/{user.active_resume_id}",
         token=access_token,
     )
     return handle_hh_response(
@@ -148,7 +157,7 @@ def get_active_resume(db: Session, user_id: int, access_token: str) -> dict:
 def update_resume(resume_id: str, payload: dict, access_token: str):
     response = hh_request(
         method="PUT",
-        url=f"https://api.hh.ru/resumes/{resume_id}",
+        url=f"{API_URL}/resumes/{resume_id}",
         token=access_token,
         json=payload,
     )
@@ -158,7 +167,7 @@ def update_resume(resume_id: str, payload: dict, access_token: str):
 def delete_resume(resume_id: str, access_token: str) -> dict:
     response = hh_request(
         method="DELETE",
-        url=f"https://api.hh.ru/resumes/{resume_id}",
+        url=f"{API_URL}/resumes/{resume_id}",
         token=access_token,
     )
     return handle_hh_response(response, action="delete resume")
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import IngestionRun, IngestionRunTotal
+from app.models.ingestion_run import (
+    RUN_FAILED,
+    RUN_PARTIAL,
+    RUN_RUNNING,
+    RUN_SUCCESS,
+)
+
+
+def start_ingestion_run(
+    db: Session, query_key: str, search_definition_id: int | None = None
+) -> IngestionRun:
+    run = IngestionRun(
+        query_key=query_key,
+        search_definition_id=search_definition_id,
+        status=RUN_RUNNING,
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+# Поля прогона, которые суммируются в ingestion_run_totals
+TOTAL_FIELDS = (
+    "pages",
+    "page_errors",
+    "items_seen",
+    "inserted",
+    "updated",
+    "skipped",
+    "http_seconds",
+    "db_seconds",
+)
+
+
+def _add_run_totals(db: Session, run: IngestionRun) -> None:
+    values = {field: getattr(run, field) for field in TOTAL_FIELDS}
+    stmt = insert(IngestionRunTotal).values(
+        query_key=run.query_key, status=run.status, runs=1, **values
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IngestionRunTotal.query_key, IngestionRunTotal.status],
+        set_={
+            field: getattr(IngestionRunTotal, field)
+            + getattr(stmt.excluded, field)
+            for field in ("runs", *TOTAL_FIELDS)
+        },
+    )
+    db.execute(stmt)
+
+
+def finish_ingestion_run(
+    db: Session,
+    run: IngestionRun,
+    counts: dict | None = None,
+    error: str | None = None,
+) -> IngestionRun:
+    """
+    Записывает итоги прогона по счётчикам ingest_vacancies и добавляет
+    их к накопленным итогам запроса (ingestion_run_totals).
+    """
+    counts = counts or {}
+    run.pages = counts.get("pages", 0)
+    run.page_errors = counts.get("errors", 0)
+    run.items_seen = counts.get("items", 0)
+    run.inserted = counts.get("inserted", 0)
+    run.updated = counts.get("updated", 0)
+    run.skipped = counts.get("unchanged", 0)
+    run.enriched = counts.get("enriched", 0)
+    run.http_seconds = counts.get("http_seconds", 0.0)
+    run.db_seconds = counts.get("db_seconds", 0.0)
+    run.error = error
+    if error is not None:
+        run.status = RUN_FAILED
+    elif run.page_errors:
+        run.status = RUN_PARTIAL
+    else:
+        run.status = RUN_SUCCESS
+    run.finished_at = datetime.now(timezone.utc)
+    _add_run_totals(db, run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def list_ingestion_runs(
+    db: Session,
+    search_definition_id: int | None = None,
+    query_key: str | None = None,
+    status: str | None = None,
+    skip: int = 0,
+    limit: int = 50,
+) -> list[IngestionRun]:
+    query = db.query(IngestionRun)
+    if search_definition_id is not None:
+        query = query.filter(
+            IngestionRun.search_definition_id == search_definition_id
+        )
+    if query_key is not None:
+        query = query.filter(IngestionRun.query_key == query_key)
+    if status is not None:
+        query = query.filter(IngestionRun.status == status)
+    return (
+        query.order_by(IngestionRun.id.desc()).offset(skip).limit(limit).all()
+    )
+
+
+def summarize_ingestion_runs(db: Session) -> list[IngestionRunTotal]:
+    """Итоги завершённых прогонов в разрезе запроса и статуса для метрик."""
+    return db.query(IngestionRunTotal).all()
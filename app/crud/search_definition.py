@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Session
+
+from app.models import SearchDefinition
+
+
+def get_search_definition(
+    db: Session, definition_id: int
+) -> SearchDefinition | None:
+    return (
+        db.query(SearchDefinition)
+        .filter(SearchDefinition.id == definition_id)
+        .first()
+    )
+
+
+def list_active_search_definitions(db: Session) -> list[SearchDefinition]:
+    return (
+        db.query(SearchDefinition)
+        .filter(SearchDefinition.is_active.is_(True))
+        .order_by(SearchDefinition.priority.desc(), SearchDefinition.id)
+        .all()
+    )
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import SyncWatermark
+
+
+def get_watermark(db: Session, query_key: str) -> SyncWatermark | None:
+    return (
+        db.query(SyncWatermark)
+        .filter(SyncWatermark.query_key == query_key)
+        .first()
+    )
+
+
+def advance_watermark(
+    db: Session,
+    query_key: str,
+    published_at: datetime | None,
+    run_at: datetime,
+) -> None:
+    """
+    Сдвигает отметку запроса вперёд. Коммит остаётся за вызывающим кодом,
+    чтобы отметка сохранялась в одной транзакции с последним батчем.
+    """
+    stmt = insert(SyncWatermark).values(
+        query_key=query_key,
+        last_published_at=published_at,
+        last_run_at=run_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncWatermark.query_key],
+        set_={
+            # GREATEST игнорирует NULL, так что пустой прогон
+            # не откатывает отметку назад.
+            "last_published_at": func.greatest(
+                SyncWatermark.last_published_at,
+                stmt.excluded.last_published_at,
+            ),
+            "last_run_at": stmt.excluded.last_run_at,
+        },
+    )
+    db.execute(stmt)
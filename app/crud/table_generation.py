@@ -0,0 +1,28 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import TableGeneration
+
+
+def get_generation(db: Session, name: str) -> int:
+    # Мимо identity map: значение должно читаться из базы каждый раз
+    generation = db.execute(
+        select(TableGeneration.generation).where(TableGeneration.name == name)
+    ).scalar()
+    return generation or 0
+
+
+def bump_generation(db: Session, name: str) -> None:
+    """Увеличивает номер в текущей транзакции; коммитит вызывающий код."""
+    stmt = insert(TableGeneration).values(
+        name=name, generation=1, updated_at=func.now()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TableGeneration.name],
+        set_={
+            "generation": TableGeneration.generation + 1,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
@@ -1,8 +1,51 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+
 from fastapi import HTTPException
+from sqlalchemy import (
+    JSON,
+    Text,
+    bindparam,
+    cast,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, REAL, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models import Vacancy
-from app.schemas import VacancyCreate, VacancyUpdate
+from app.crud.table_generation import bump_generation
+from app.models import AreaClosure, Vacancy, VacancyFacetCount
+from app.models.vacancy import SEARCH_CONFIG
+from app.models.vacancy_facet import FACET_COLUMNS
+from app.schemas import VacancyBulkUpdate, VacancyCreate, VacancyUpdate
+from app.services.listing_cache import invalidate_listings
+from app.services.salary import salary_columns
+
+# Строка table_generations, которая меняется при любой записи в vacancies
+VACANCIES_GENERATION = "vacancies"
+
+
+def commit_vacancy_changes(db: Session, changed: bool = True) -> None:
+    """
+    Фиксирует транзакцию с записью в vacancies. Номер изменения таблицы
+    увеличивается непосредственно перед COMMIT: строку table_generations
+    все пишущие транзакции блокируют по очереди, и так блокировка
+    держится только на время фиксации, а не всей транзакции.
+    """
+    if changed:
+        bump_generation(db, VACANCIES_GENERATION)
+    db.commit()
+    if changed:
+        invalidate_listings()
 
 
 def create_vacancy(db: Session, vacancy: VacancyCreate) -> Vacancy:
@@ -17,15 +60,229 @@ def create_vacancy(db: Session, vacancy: VacancyCreate) -> Vacancy:
         if existing:
             return existing
 
-    db_vacancy = Vacancy(**vacancy.model_dump(mode="json"))
+    row = vacancy.model_dump(mode="json")
+    row.update(salary_columns(row["salary"]))
+    db_vacancy = Vacancy(**row, content_hash=content_hash(row))
     db.add(db_vacancy)
-    db.commit()
+    commit_vacancy_changes(db)
     db.refresh(db_vacancy)
     return db_vacancy
 
 
-def get_vacancies(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(Vacancy).offset(skip).limit(limit).all()
+UPSERT_CHUNK_SIZE = 1000
+# Колонки, которые выводятся из salary
+SALARY_FIELDS = (
+    "salary_from",
+    "salary_to",
+    "salary_currency",
+    "salary_gross",
+    "salary_mid_rub",
+)
+# Поля, которые есть в элементе поисковой выдачи hh.ru
+LIST_FIELDS = (
+    "title",
+    "company",
+    "location",
+    "area_id",
+    "salary",
+    "source",
+) + SALARY_FIELDS
+UPSERT_FIELDS = LIST_FIELDS + (
+    "description",
+    "key_skills",
+    "experience",
+    "employment",
+    "schedule",
+    "list_fingerprint",
+)
+# Поля, от которых считается content_hash
+CONTENT_FIELDS = tuple(
+    field for field in UPSERT_FIELDS if field != "list_fingerprint"
+)
+
+
+def content_hash(values: dict) -> str:
+    """Стабильный хэш содержимого вакансии."""
+    payload = {field: values.get(field) for field in CONTENT_FIELDS}
+    encoded = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _changed_condition(excluded, fields):
+    conditions = []
+    for field in fields:
+        current = getattr(Vacancy, field)
+        incoming = excluded[field]
+        # У json в Postgres нет оператора сравнения, сравниваем как jsonb
+        if isinstance(current.type, JSON):
+            current, incoming = cast(current, JSONB), cast(incoming, JSONB)
+        conditions.append(current.is_distinct_from(incoming))
+    return or_(*conditions)
+
+
+def _chunked(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        end = start + size
+        yield rows[start:end]
+
+
+def _upsert_chunk(
+    db: Session, rows: list[dict], fields: tuple
+) -> tuple[int, int]:
+    # Служебные поля есть не у всех схем, обновляем только переданные
+    fields = [field for field in fields if field in rows[0]]
+    stmt = insert(Vacancy).values(rows)
+    set_ = {field: stmt.excluded[field] for field in fields}
+    if set(CONTENT_FIELDS) <= set(fields):
+        # Строка перезаписывается целиком, достаточно сравнить хэши.
+        # Отпечаток выдачи в хэш не входит и сравнивается отдельно, иначе
+        # изменение только в выдаче не сохранилось бы и карточка
+        # перезапрашивалась бы каждый прогон
+        set_["content_hash"] = stmt.excluded.content_hash
+        changed = Vacancy.content_hash.is_distinct_from(
+            stmt.excluded.content_hash
+        )
+        if "list_fingerprint" in fields:
+            changed = or_(
+                changed,
+                Vacancy.list_fingerprint.is_distinct_from(
+                    stmt.excluded.list_fingerprint
+                ),
+            )
+    else:
+        # Частичное обновление: хэш всей строки заранее неизвестен,
+        # сбрасываем его, чтобы следующая полная запись не была пропущена
+        set_["content_hash"] = None
+        changed = _changed_condition(stmt.excluded, fields)
+    # onupdate колонки на ON CONFLICT DO UPDATE не распространяется
+    set_["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Vacancy.url],
+        set_=set_,
+        where=changed,
+    ).returning(literal_column("xmax = 0"))
+    # RETURNING отдаёт только вставленные и реально изменённые строки,
+    # xmax = 0 у только что вставленных.
+    written = db.execute(stmt).scalars().all()
+    inserted = sum(1 for is_new in written if is_new)
+    return inserted, len(written) - inserted
+
+
+def upsert_vacancies(
+    db: Session,
+    vacancies: list[VacancyCreate],
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+    commit: bool = True,
+    fields: tuple = UPSERT_FIELDS,
+) -> dict:
+    """
+    Пакетно сохраняет вакансии одним INSERT ... ON CONFLICT на чанк.
+
+    Дубликаты определяются по url. У существующей строки перезаписываются
+    только ``fields`` и только если изменилось содержимое: при полной
+    записи сравнивается content_hash, при частичной — сами поля.
+    Возвращает количество вставленных, обновлённых и оставшихся без
+    изменений вакансий. С ``commit=False`` транзакцию фиксирует
+    вызывающий код через commit_vacancy_changes.
+    """
+    by_url = {}
+    without_url = []
+    for vacancy in vacancies:
+        row = vacancy.model_dump(mode="json")
+        row.update(salary_columns(row["salary"]))
+        row["content_hash"] = content_hash(row)
+        if row["url"] is None:
+            without_url.append(row)
+        else:
+            # ON CONFLICT не может задеть одну строку дважды за запрос,
+            # поэтому внутри батча оставляем последнюю версию вакансии.
+            by_url[row["url"]] = row
+
+    rows = list(by_url.values())
+    inserted = updated = 0
+    for chunk in _chunked(rows, chunk_size):
+        chunk_inserted, chunk_updated = _upsert_chunk(db, chunk, fields)
+        inserted += chunk_inserted
+        updated += chunk_updated
+
+    for chunk in _chunked(without_url, chunk_size):
+        db.execute(insert(Vacancy).values(chunk))
+    inserted += len(without_url)
+
+    if commit:
+        commit_vacancy_changes(db, bool(inserted or updated))
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(vacancies) - inserted - updated,
+    }
+
+
+def get_list_fingerprints(db: Session, urls: list[str]) -> dict:
+    """Отпечатки выдачи уже сохранённых вакансий по их url."""
+    if not urls:
+        return {}
+    rows = (
+        db.query(Vacancy.url, Vacancy.list_fingerprint)
+        .filter(Vacancy.url.in_(urls))
+        .all()
+    )
+    return dict(rows)
+
+
+def _select_vacancies(db: Session, fields: tuple | None = None):
+    """
+    Вакансии целиком или только колонки ``fields``: тогда строки приходят
+    кортежами, без ORM-объектов и identity map.
+    """
+    if fields is None:
+        return db.query(Vacancy)
+    return db.query(*(getattr(Vacancy, field) for field in fields))
+
+
+def _contains(column, value: str):
+    """
+    Поиск подстроки без учёта регистра. Спецсимволы LIKE экранируются:
+    иначе ``%`` или ``_`` из запроса превратились бы в шаблон, а у шаблона
+    без букв нет триграмм, и индекс pg_trgm не помог бы.
+    """
+    escaped = (
+        value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def _filter_vacancies(
+    query,
+    company: str | None = None,
+    location: str | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    area_id: int | None = None,
+    title: str | None = None,
+):
+    if area_id is not None:
+        # Регион вместе со всеми вложенными: соединение с area_closure
+        # по первичному ключу (ancestor_id, descendant_id)
+        query = query.join(
+            AreaClosure, AreaClosure.descendant_id == Vacancy.area_id
+        ).filter(AreaClosure.ancestor_id == area_id)
+    # ILIKE '%...%' обслуживают GIN-индексы pg_trgm (TRIGRAM_INDEXES)
+    if title:
+        query = query.filter(_contains(Vacancy.title, title))
+    if company:
+        query = query.filter(_contains(Vacancy.company, company))
+    if location:
+        query = query.filter(_contains(Vacancy.location, location))
+    # Диапазон по середине вилки в рублях (индекс ix_vacancies_salary_mid_rub)
+    if salary_min is not None:
+        query = query.filter(Vacancy.salary_mid_rub >= salary_min)
+    if salary_max is not None:
+        query = query.filter(Vacancy.salary_mid_rub <= salary_max)
+    return query
 
 
 def list_vacancies(
@@ -35,24 +292,371 @@ def list_vacancies(
     location: str | None = None,
     skip: int = 0,
     limit: int = 10,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    area_id: int | None = None,
+    title: str | None = None,
+    fields: tuple | None = None,
 ):
-    query = db.query(Vacancy)
-    if company:
-        query = query.filter(Vacancy.company.ilike(f"%{company}%"))
-    if location:
-        query = query.filter(Vacancy.location.ilike(f"%{location}%"))
-    if sort_by in ["created_at", "title", "company"]:
+    query = _filter_vacancies(
+        _select_vacancies(db, fields),
+        company,
+        location,
+        salary_min,
+        salary_max,
+        area_id,
+        title,
+    )
+    if sort_by == "salary":
+        query = query.order_by(Vacancy.salary_mid_rub.desc().nullslast())
+    elif sort_by in ["created_at", "title", "company"]:
         query = query.order_by(getattr(Vacancy, sort_by).desc())
+    # id последним ключом: при равных значениях сортировки порядок строк
+    # детерминирован, и страницы с OFFSET не пересекаются
+    query = query.order_by(Vacancy.id.desc())
     return query.offset(skip).limit(limit).all()
 
 
+# Сортировки с постраничным курсором; для каждой есть индекс (ключ, id)
+KEYSET_SORTS = ("created_at", "title", "company")
+
+
+def encode_cursor(sort_by: str, key, vacancy_id: int, direction: str) -> str:
+    payload = {
+        "s": sort_by,
+        "k": key.isoformat() if isinstance(key, datetime) else key,
+        "i": vacancy_id,
+        "d": direction,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> dict:
+    """Разбирает курсор; ValueError, если он испорчен или чужой."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        key, vacancy_id, direction = payload["k"], payload["i"], payload["d"]
+        if sort_by == "created_at":
+            key = datetime.fromisoformat(key)
+    except (binascii.Error, ValueError, KeyError, TypeError) as error:
+        raise ValueError("Invalid cursor") from error
+    if payload.get("s") != sort_by or direction not in ("next", "prev"):
+        raise ValueError("Invalid cursor")
+    # Значения уходят в запрос параметрами: тип должен совпадать
+    # с колонкой, иначе вместо 400 была бы ошибка базы
+    if isinstance(vacancy_id, bool) or not isinstance(vacancy_id, int):
+        raise ValueError("Invalid cursor")
+    if sort_by in ("title", "company") and not (
+        key is None or isinstance(key, str)
+    ):
+        raise ValueError("Invalid cursor")
+    return {"key": key, "id": vacancy_id, "direction": direction}
+
+
+def list_vacancies_page(
+    db: Session,
+    sort_by: str = "created_at",
+    limit: int = 10,
+    cursor: str | None = None,
+    company: str | None = None,
+    location: str | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    area_id: int | None = None,
+    title: str | None = None,
+    fields: tuple | None = None,
+) -> tuple[list[Vacancy], str | None, str | None]:
+    """
+    Страница выдачи по курсору (keyset): вместо OFFSET запрос продолжается
+    с ключа сортировки и id последней показанной вакансии, поэтому время
+    не растёт с номером страницы, а новые вакансии не сдвигают выдачу.
+
+    Возвращает вакансии и курсоры следующей и предыдущей страниц. Если
+    заданы ``fields``, к ним добавляются ключ сортировки и id для курсора.
+    """
+    if sort_by not in KEYSET_SORTS:
+        raise ValueError(f"Unsupported sort for cursor: {sort_by}")
+    column = getattr(Vacancy, sort_by)
+    position = decode_cursor(cursor, sort_by) if cursor else None
+    backward = position is not None and position["direction"] == "prev"
+
+    if fields is not None:
+        fields = tuple(dict.fromkeys((*fields, sort_by, "id")))
+    query = _filter_vacancies(
+        _select_vacancies(db, fields),
+        company,
+        location,
+        salary_min,
+        salary_max,
+        area_id,
+        title,
+    )
+    if position is not None:
+        seek = tuple_(column, Vacancy.id)
+        after = tuple_(position["key"], position["id"])
+        query = query.filter(seek > after if backward else seek < after)
+    if backward:
+        query = query.order_by(column.asc(), Vacancy.id.asc())
+    else:
+        query = query.order_by(column.desc(), Vacancy.id.desc())
+    # Лишняя строка показывает, есть ли что-то за этой страницей
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    if backward:
+        # Назад пришли со следующей страницы, значит она есть
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None
+    next_cursor = (
+        encode_cursor(sort_by, getattr(rows[-1], sort_by), rows[-1].id, "next")
+        if has_next
+        else None
+    )
+    prev_cursor = (
+        encode_cursor(sort_by, getattr(rows[0], sort_by), rows[0].id, "prev")
+        if has_prev
+        else None
+    )
+    return rows, next_cursor, prev_cursor
+
+
+def iter_vacancies_export(
+    db: Session,
+    columns: list,
+    since: datetime | None = None,
+    after_id: int | None = None,
+    batch_size: int = 1000,
+    **filters,
+):
+    """
+    Вакансии для выгрузки в порядке id. yield_per читает их серверным
+    курсором порциями по ``batch_size``, не загружая всю выборку.
+    ``since`` отбирает созданные или изменённые не раньше этого момента.
+    """
+    query = _filter_vacancies(db.query(*columns), **filters)
+    if since is not None:
+        query = query.filter(Vacancy.updated_at >= since)
+    if after_id is not None:
+        query = query.filter(Vacancy.id > after_id)
+    return query.order_by(Vacancy.id).yield_per(batch_size)
+
+
+FACET_LIMIT = 20
+
+
+def _filter_facets(
+    query,
+    company: str | None = None,
+    location: str | None = None,
+    area_id: int | None = None,
+    source: str | None = None,
+    salary_band: int | None = None,
+):
+    """
+    Те же фильтры, что у списка, но по строкам свёртки фасетов. ILIKE по
+    компании и городу обслуживают FACET_TRIGRAM_INDEXES.
+    """
+    if area_id is not None:
+        query = query.join(
+            AreaClosure,
+            AreaClosure.descendant_id == VacancyFacetCount.area_id,
+        ).where(AreaClosure.ancestor_id == area_id)
+    if company:
+        query = query.where(_contains(VacancyFacetCount.company, company))
+    if location:
+        query = query.where(_contains(VacancyFacetCount.location, location))
+    if source is not None:
+        query = query.where(VacancyFacetCount.source == source)
+    if salary_band is not None:
+        query = query.where(VacancyFacetCount.salary_band == salary_band)
+    return query
+
+
+def get_vacancy_facets(
+    db: Session,
+    limit: int = FACET_LIMIT,
+    company: str | None = None,
+    location: str | None = None,
+    area_id: int | None = None,
+    source: str | None = None,
+    salary_band: int | None = None,
+) -> tuple[int, dict[str, list[tuple]]]:
+    """
+    Общее число вакансий и по ``limit`` самых частых значений каждого
+    фасета (FACET_COLUMNS) с числом вакансий. Считается по свёртке
+    vacancy_facet_counts одним запросом с GROUPING SETS, таблица
+    vacancies не читается. Фильтры применяются ко всем фасетам.
+    """
+    columns = [getattr(VacancyFacetCount, name) for name in FACET_COLUMNS]
+    count = func.sum(VacancyFacetCount.vacancies)
+    # Бит каждой колонки в grouping() равен 1, если группировки по ней нет
+    grouping = func.grouping(*columns)
+    query = select(
+        grouping.label("grouping"),
+        *columns,
+        count.label("vacancies"),
+        func.row_number()
+        .over(partition_by=grouping, order_by=(count.desc(), *columns))
+        .label("position"),
+    )
+    query = _filter_facets(
+        query, company, location, area_id, source, salary_band
+    )
+    query = (
+        query.group_by(
+            func.grouping_sets(
+                *(tuple_(column) for column in columns), tuple_()
+            )
+        )
+        .having(count > 0)
+        .subquery()
+    )
+    rows = db.execute(
+        select(query)
+        .where(query.c.position <= limit)
+        .order_by(query.c.grouping, query.c.position)
+    ).all()
+
+    everything = (1 << len(FACET_COLUMNS)) - 1
+    total = 0
+    facets = {name: [] for name in FACET_COLUMNS}
+    for row in rows:
+        if row.grouping == everything:
+            total = row.vacancies
+            continue
+        for position, name in enumerate(reversed(FACET_COLUMNS)):
+            if row.grouping == everything ^ (1 << position):
+                facets[name].append((getattr(row, name), row.vacancies))
+    return total, facets
+
+
+def count_vacancies(db: Session, **filters) -> int:
+    """Точное число вакансий под фильтрами списка."""
+    return _filter_vacancies(
+        db.query(func.count(Vacancy.id)), **filters
+    ).scalar()
+
+
+def estimate_vacancies(
+    db: Session,
+    title: str | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    **filters,
+) -> int:
+    """
+    Примерное число вакансий под фильтрами списка без чтения vacancies.
+    Фильтры, которые есть в свёртке фасетов (компания, город, регион),
+    считаются по ней, и такой результат точен с точностью до свёртки.
+    С фильтром по названию или зарплате берётся оценка планировщика
+    из EXPLAIN.
+    """
+    if title is None and salary_min is None and salary_max is None:
+        query = _filter_facets(
+            select(func.coalesce(func.sum(VacancyFacetCount.vacancies), 0)),
+            **filters,
+        )
+        return db.execute(query).scalar()
+
+    query = _filter_vacancies(
+        db.query(Vacancy.id),
+        title=title,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        **filters,
+    )
+    connection = db.connection()
+    compiled = query.statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    return round(plan[0]["Plan"]["Plan Rows"])
+
+
+HEADLINE_OPTIONS = (
+    "StartSel=<b>, StopSel=</b>, MaxWords=30, MinWords=10, MaxFragments=2"
+)
+
+
+def search_vacancies(
+    db: Session, q: str, limit: int = 10, cursor: str | None = None
+) -> tuple[list[tuple[Vacancy, float, str | None]], str | None]:
+    """
+    Полнотекстовый поиск по search_vector (GIN-индекс) с ранжированием.
+
+    Возвращает тройки (вакансия, ранг, фрагмент с подсветкой) и курсор
+    следующей страницы. Страницы идут по (ранг, id), как в
+    list_vacancies_page; фрагменты считаются только для строк страницы.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # Нормализация 1 делит ранг на 1 + log(длины), чтобы длинные описания
+    # не вытесняли совпадения в названии
+    rank = func.ts_rank(Vacancy.search_vector, tsquery, 1)
+    position = decode_cursor(cursor, "rank") if cursor else None
+    # Поиск отдаёт только курсор вперёд, чужой prev-курсор не принимаем.
+    # Ранг приводится к real в запросе, поэтому должен быть числом
+    if position is not None and (
+        position["direction"] != "next"
+        or isinstance(position["key"], bool)
+        or not isinstance(position["key"], (int, float))
+    ):
+        raise ValueError("Invalid cursor")
+
+    ranked = (
+        select(Vacancy.id, rank.label("rank"))
+        .where(Vacancy.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), Vacancy.id.desc())
+        .limit(limit + 1)
+    )
+    if position is not None:
+        # Ранг real: значение из курсора приводится к тому же типу, иначе
+        # сравнение в double не найдёт строку, на которой остановились
+        after = tuple_(cast(position["key"], REAL), position["id"])
+        ranked = ranked.where(tuple_(rank, Vacancy.id) < after)
+    ranked = ranked.subquery()
+
+    document = func.coalesce(
+        func.regexp_replace(Vacancy.description, "<[^>]+>", " ", "g"),
+        Vacancy.title,
+    )
+    headline = func.ts_headline(
+        SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS
+    )
+    rows = (
+        db.query(Vacancy, ranked.c.rank, headline)
+        .join(ranked, ranked.c.id == Vacancy.id)
+        .order_by(ranked.c.rank.desc(), Vacancy.id.desc())
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor("rank", last_rank, last.id, "next")
+    return [tuple(row) for row in rows], next_cursor
+
+
 def update_vacancy(db: Session, vacancy_id: int, vacancy: VacancyUpdate):
     db_vacancy = db.query(Vacancy).get(vacancy_id)
     if not db_vacancy:
         raise HTTPException(status_code=404, detail="Vacancy not found")
-    for key, value in vacancy.model_dump(exclude_unset=True).items():
+    values = vacancy.model_dump(exclude_unset=True)
+    if "salary" in values:
+        values.update(salary_columns(values["salary"]))
+    for key, value in values.items():
         setattr(db_vacancy, key, value)
-    db.commit()
+    db_vacancy.content_hash = content_hash(
+        {field: getattr(db_vacancy, field) for field in CONTENT_FIELDS}
+    )
+    commit_vacancy_changes(db)
     db.refresh(db_vacancy)
     return db_vacancy
 
@@ -62,5 +666,195 @@ def delete_vacancy(db: Session, vacancy_id: int):
     if not db_vacancy:
         raise HTTPException(status_code=404, detail="Vacancy not found")
     db.delete(db_vacancy)
-    db.commit()
+    commit_vacancy_changes(db)
     return {"ok": True}
+
+
+def create_vacancies_bulk(
+    db: Session, vacancies: list[VacancyCreate]
+) -> list[tuple[int, str]]:
+    """
+    Создаёт вакансии пакетом в одной транзакции: INSERT ... ON CONFLICT
+    DO NOTHING для всех строк и SELECT для уже существующих url. Как и
+    create_vacancy, существующую вакансию не перезаписывает. Возвращает
+    (id, "created" | "exists") в порядке ``vacancies``.
+    """
+    rows = []
+    for vacancy in vacancies:
+        row = vacancy.model_dump(mode="json")
+        row.update(salary_columns(row["salary"]))
+        row["content_hash"] = content_hash(row)
+        rows.append(row)
+
+    by_url = {}
+    for row in rows:
+        if row["url"] is not None:
+            by_url.setdefault(row["url"], row)
+    created = {}
+    if by_url:
+        # executemany: запрос компилируется один раз, а insertmanyvalues
+        # отправляет строки пачками в многострочном VALUES
+        stmt = (
+            insert(Vacancy)
+            .on_conflict_do_nothing(index_elements=[Vacancy.url])
+            .returning(Vacancy.url, Vacancy.id)
+        )
+        created.update(db.execute(stmt, list(by_url.values())).tuples().all())
+    existing = {}
+    for chunk in _chunked(
+        [url for url in by_url if url not in created], UPSERT_CHUNK_SIZE
+    ):
+        existing.update(
+            db.query(Vacancy.url, Vacancy.id)
+            .filter(Vacancy.url.in_(chunk))
+            .tuples()
+            .all()
+        )
+
+    # У вакансий без url конфликтов нет; sort_by_parameter_order
+    # сопоставляет возвращённые id с переданными строками
+    without_url = [row for row in rows if row["url"] is None]
+    new_ids = []
+    if without_url:
+        new_ids = db.execute(
+            insert(Vacancy).returning(
+                Vacancy.id, sort_by_parameter_order=True
+            ),
+            without_url,
+        ).scalars()
+    new_ids = iter(new_ids)
+
+    results = []
+    for row in rows:
+        url = row["url"]
+        if url is None:
+            results.append((next(new_ids), "created"))
+        elif url in created:
+            # Повтор url в том же пакете — уже существующая вакансия
+            results.append((created.pop(url), "created"))
+            existing[url] = results[-1][0]
+        else:
+            results.append((existing.get(url), "exists"))
+    commit_vacancy_changes(
+        db, any(status == "created" for _, status in results)
+    )
+    return results
+
+
+def _update_from_arrays(db: Session, rows: list[dict]) -> set[int]:
+    """
+    Одно UPDATE ... FROM unnest(...) для строк с одинаковым набором полей:
+    каждая колонка передаётся одним массивом, так что текст запроса не
+    зависит от числа строк, а триггеры уровня оператора срабатывают один
+    раз на пакет. Переходные таблицы триггеров при этом всё равно растут
+    вместе с числом обновлённых строк.
+    """
+    table = Vacancy.__table__
+    names = list(rows[0])
+    arrays = []
+    for name in names:
+        values = [row[name] for row in rows]
+        item_type = table.c[name].type
+        # Списки внутри ARRAY были бы ещё одним измерением массива,
+        # поэтому json передаётся готовыми строками
+        if isinstance(item_type, JSON):
+            values = [
+                None if value is None else json.dumps(value)
+                for value in values
+            ]
+            item_type = Text()
+        arrays.append(
+            bindparam(f"values_{name}", values, type_=ARRAY(item_type))
+        )
+    data = (
+        func.unnest(*arrays).table_valued(*names).render_derived(name="data")
+    )
+    stmt = (
+        update(Vacancy)
+        .where(Vacancy.id == data.c.id)
+        .values(
+            {
+                # json и массивы из одних NULL приходят текстом,
+                # приводим к типу колонки
+                name: cast(data.c[name], table.c[name].type)
+                for name in names
+                if name != "id"
+            }
+        )
+        .returning(Vacancy.id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(db.execute(stmt).scalars())
+
+
+# Уникальный индекс по url (см. миграцию add_unique_index_ix_vacancies_url)
+URL_UNIQUE_INDEX = "ix_vacancies_url"
+
+
+def _violated_constraint(error: IntegrityError) -> str | None:
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def update_vacancies_bulk(
+    db: Session, vacancies: list[VacancyBulkUpdate]
+) -> list[tuple[int, str]]:
+    """
+    Частично обновляет вакансии по id в одной транзакции, одним запросом
+    на каждый набор изменяемых полей. Возвращает
+    (id, "updated" | "not_found") в порядке ``vacancies``.
+    """
+    # Несколько правок одной вакансии сливаются в порядке пакета
+    values_by_id = {}
+    for vacancy in vacancies:
+        values = vacancy.model_dump(
+            mode="json", exclude_unset=True, exclude={"id"}
+        )
+        if "salary" in values:
+            values.update(salary_columns(values["salary"]))
+        values_by_id.setdefault(vacancy.id, {}).update(values)
+    groups = {}
+    for vacancy_id, values in values_by_id.items():
+        # Хэш всей строки здесь неизвестен, как и при частичном upsert
+        row = {"id": vacancy_id, **values, "content_hash": None}
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    found = set()
+    try:
+        for rows in groups.values():
+            found |= _update_from_arrays(db, rows)
+    except IntegrityError as error:
+        # Пакет не сохраняется целиком; 409 — только если новый url уже
+        # занят, остальные нарушения ограничений не ошибка клиента
+        db.rollback()
+        if _violated_constraint(error) == URL_UNIQUE_INDEX:
+            raise HTTPException(
+                status_code=409, detail="Duplicate vacancy url"
+            )
+        raise
+    commit_vacancy_changes(db, bool(found))
+    return [
+        (vacancy.id, "updated" if vacancy.id in found else "not_found")
+        for vacancy in vacancies
+    ]
+
+
+def delete_vacancies_bulk(
+    db: Session, ids: list[int]
+) -> list[tuple[int, str]]:
+    """
+    Удаляет вакансии одним DELETE ... RETURNING. Возвращает
+    (id, "deleted" | "not_found") в порядке ``ids``, повторяющиеся id
+    учитываются один раз.
+    """
+    ids = list(dict.fromkeys(ids))
+    deleted = set(
+        db.execute(
+            delete(Vacancy).where(Vacancy.id.in_(ids)).returning(Vacancy.id)
+        ).scalars()
+    )
+    commit_vacancy_changes(db, bool(deleted))
+    return [
+        (vacancy_id, "deleted" if vacancy_id in deleted else "not_found")
+        for vacancy_id in ids
+    ]
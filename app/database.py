@@ -1,6 +1,7 @@
 # app/database.py
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
@@ -8,6 +9,29 @@ engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Параметры libpq для соединений с блокировками. Проверка лидерства —
+# запрос на долгоживущем соединении: без таймаутов он повис бы на
+# полуоткрытом TCP, и узел считал бы себя лидером, когда блокировку уже
+# забрал другой. Keepalive обнаруживает пропавший сервер примерно за
+# keepalives_idle + keepalives_interval * keepalives_count секунд.
+LOCK_CONNECT_ARGS = {
+    "connect_timeout": 10,
+    "keepalives": 1,
+    "keepalives_idle": 10,
+    "keepalives_interval": 5,
+    "keepalives_count": 3,
+    "options": "-c statement_timeout=5000",
+}
+
+# Соединения для advisory-блокировок: без пула, чтобы сессия Postgres
+# (а с ней и блокировка) жила ровно столько, сколько открыто соединение.
+lock_engine = create_engine(
+    settings.database_url,
+    poolclass=NullPool,
+    isolation_level="AUTOCOMMIT",
+    connect_args=LOCK_CONNECT_ARGS,
+)
+
 
 def get_db():
     db = SessionLocal()
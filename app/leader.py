@@ -0,0 +1,134 @@
+# app/leader.py
+import threading
+from contextlib import contextmanager
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import lock_engine
+from app.logger import logger
+
+# Пространства ключей для pg_advisory_lock(int, int)
+SCHEDULER_LOCK_NAMESPACE = 1001
+SEARCH_JOB_LOCK_NAMESPACE = 1002
+
+LEADER_ELECTION_INTERVAL_SECONDS = 15
+
+
+def _try_lock(connection: Connection, namespace: int, key: int) -> bool:
+    return connection.execute(
+        text("SELECT pg_try_advisory_lock(:namespace, :key)"),
+        {"namespace": namespace, "key": key},
+    ).scalar()
+
+
+@contextmanager
+def advisory_lock(namespace: int, key: int, engine: Engine = lock_engine):
+    """
+    Пытается взять advisory-блокировку без ожидания.
+
+    Отдаёт True, если блокировка получена. Блокировка снимается при выходе
+    из блока или автоматически, если процесс умер вместе с соединением.
+    """
+    connection = engine.connect()
+    try:
+        acquired = _try_lock(connection, namespace, key)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:namespace, :key)"),
+                    {"namespace": namespace, "key": key},
+                )
+    finally:
+        connection.close()
+
+
+class LeaderElector:
+    """
+    Выбор лидера кластера через сессионную advisory-блокировку Postgres.
+
+    Лидер держит блокировку на отдельном соединении и периодически
+    проверяет, что оно живо. Если лидер умирает, Postgres закрывает его
+    сессию и снимает блокировку, и следующий опрос на другом узле её
+    забирает. Остальные узлы держат соединение открытым только на время
+    попытки.
+    """
+
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        namespace: int = SCHEDULER_LOCK_NAMESPACE,
+        key: int = 0,
+        interval: float = LEADER_ELECTION_INTERVAL_SECONDS,
+        engine: Engine = lock_engine,
+    ):
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._namespace = namespace
+        self._key = key
+        self._interval = interval
+        self._engine = engine
+        self._connection: Connection | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="leader-election", daemon=True
+        )
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self._interval)
+        self._demote()
+
+    def poll(self) -> None:
+        """Один шаг выборов: попытка стать лидером или проверка лидерства."""
+        try:
+            if self.is_leader:
+                self._connection.execute(text("SELECT 1"))
+            else:
+                self._try_acquire()
+        except Exception as error:
+            logger.warning(f"Потеряно соединение лидера: {error}")
+            self._demote()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self._interval)
+
+    def _try_acquire(self) -> None:
+        connection = self._engine.connect()
+        try:
+            acquired = _try_lock(connection, self._namespace, self._key)
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return
+
+        self._connection = connection
+        logger.info("👑 Узел стал лидером кластера")
+        self._on_elected()
+
+    def _demote(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+        logger.info("Узел больше не лидер кластера")
+        self._on_demoted()
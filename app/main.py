@@ -3,14 +3,19 @@
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Response
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy.orm import Session
 
-from app.database import check_connection
+from app.database import SessionLocal, check_connection, get_db
 from app.exceptions import generic_exception_handler, http_exception_handler
+from app.leader import LeaderElector
 from app.logger import logger
-from app.routes import auth, hh_auth, users, vacancies
+from app.metrics import render_metrics
+from app.routes import auth, hh_auth, ingestion, users, vacancies
 from app.scheduler import fin_scheduler, start_scheduler
+from app.services.hh_dictionaries import DictionaryReloader
 
 
 @asynccontextmanager
@@ -19,12 +24,26 @@ async def lifespan(app: FastAPI):
 
     logger.info("✅ Приложение готово")
 
-    if os.getenv("DISABLE_SCHEDULER") != "1":
-        start_scheduler()
+    # Планировщик запускается только на узле, выбранном лидером,
+    # чтобы при нескольких воркерах и репликах задания не дублировались.
+    elector = LeaderElector(
+        on_elected=start_scheduler, on_demoted=fin_scheduler
+    )
+    # Справочники hh.ru читаются из снимка в базе на каждом узле и
+    # перечитываются, когда лидер их обновит. С DISABLE_SCHEDULER=1 узел
+    # не запускает фоновых потоков и читает снимок один раз при старте.
+    reloader = DictionaryReloader(SessionLocal)
+    background = os.getenv("DISABLE_SCHEDULER") != "1"
+    if background:
+        elector.start()
+        reloader.start()
+    else:
+        reloader.poll()
 
     yield
-    if os.getenv("DISABLE_SCHEDULER") != "1":
-        fin_scheduler()
+    if background:
+        reloader.stop()
+        elector.stop()
     print("Приложение остановленно.")
 
 
@@ -44,6 +63,7 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(vacancies.router)
 app.include_router(hh_auth.router)
+app.include_router(ingestion.router)
 
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
@@ -63,3 +83,8 @@ def health_db():
         return JSONResponse(
             status_code=503, content={"db": "unavailable", "detail": str(e)}
         )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(db: Session = Depends(get_db)):
+    return Response(render_metrics(db), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,107 @@
+# app/metrics.py
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy.orm import Session
+
+from app.crud.ingestion_run import summarize_ingestion_runs
+from app.services.listing_cache import ListingCache, listing_cache
+
+# (имя метрики, поле сводки, описание)
+RUN_COUNTERS = [
+    ("ingestion_pages", "pages", "Скачано страниц выдачи hh.ru"),
+    ("ingestion_page_errors", "page_errors", "Страниц, скачанных с ошибкой"),
+    ("ingestion_items_seen", "items_seen", "Вакансий в выдаче hh.ru"),
+    ("ingestion_http_seconds", "http_seconds", "Время ожидания hh.ru"),
+    ("ingestion_db_seconds", "db_seconds", "Время работы с базой"),
+]
+ITEM_RESULTS = ("inserted", "updated", "skipped")
+
+
+class IngestionLedgerCollector:
+    """
+    Счётчики Prometheus по журналу ingestion_runs.
+
+    Сбор выполняется только на лидере, а /metrics может обслуживать любой
+    воркер, поэтому значения берутся из базы при каждом опросе, а не
+    копятся в памяти процесса. Читается свёртка ingestion_run_totals —
+    по строке на запрос и статус, независимо от длины журнала.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def collect(self):
+        rows = summarize_ingestion_runs(self.db)
+
+        runs = CounterMetricFamily(
+            "ingestion_runs",
+            "Завершённых запусков сбора",
+            labels=["query", "status"],
+        )
+        for row in rows:
+            runs.add_metric([row.query_key, row.status], row.runs)
+        yield runs
+
+        items = CounterMetricFamily(
+            "ingestion_items",
+            "Результат записи вакансий",
+            labels=["query", "result"],
+        )
+        totals = {}
+        for row in rows:
+            for result in ITEM_RESULTS:
+                key = (row.query_key, result)
+                totals[key] = totals.get(key, 0) + getattr(row, result)
+        for labels, value in totals.items():
+            items.add_metric(list(labels), value)
+        yield items
+
+        for name, field, documentation in RUN_COUNTERS:
+            metric = CounterMetricFamily(name, documentation, labels=["query"])
+            per_query = {}
+            for row in rows:
+                per_query[row.query_key] = per_query.get(row.query_key, 0) + (
+                    getattr(row, field) or 0
+                )
+            for query_key, value in per_query.items():
+                metric.add_metric([query_key], value)
+            yield metric
+
+
+class ListingCacheCollector:
+    """Счётчики кэша GET /vacancies/ в текущем процессе."""
+
+    def __init__(self, cache: ListingCache):
+        self.cache = cache
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            "listing_cache_requests",
+            "Запросы к кэшу списка вакансий",
+            labels=["result"],
+        )
+        requests.add_metric(["hit"], self.cache.hits)
+        requests.add_metric(["miss"], self.cache.misses)
+        yield requests
+        yield CounterMetricFamily(
+            "listing_cache_evictions",
+            "Записей вытеснено из кэша списка вакансий",
+            value=self.cache.evictions,
+        )
+        yield GaugeMetricFamily(
+            "listing_cache_entries",
+            "Записей в кэше списка вакансий",
+            value=len(self.cache),
+        )
+        yield GaugeMetricFamily(
+            "listing_cache_generation",
+            "Поколение кэша списка вакансий",
+            value=self.cache.generation,
+        )
+
+
+def render_metrics(db: Session) -> bytes:
+    registry = CollectorRegistry()
+    registry.register(IngestionLedgerCollector(db))
+    registry.register(ListingCacheCollector(listing_cache))
+    return generate_latest(registry)
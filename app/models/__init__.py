@@ -1,6 +1,27 @@
+from .area_closure import AreaClosure
+from .hh_dictionary import HHDictionary
 from .hh_token import HHToken
+from .ingestion_run import IngestionRun, IngestionRunTotal
 from .my_api_token import RefreshToken
+from .search_definition import SearchDefinition
+from .sync_watermark import SyncWatermark
+from .table_generation import TableGeneration
 from .user import User, UserAuth
 from .vacancy import Vacancy
+from .vacancy_facet import VacancyFacetCount
 
-__all__ = ["HHToken", "User", "UserAuth", "Vacancy", "RefreshToken"]
+__all__ = [
+    "HHToken",
+    "User",
+    "UserAuth",
+    "Vacancy",
+    "RefreshToken",
+    "SyncWatermark",
+    "SearchDefinition",
+    "IngestionRun",
+    "IngestionRunTotal",
+    "HHDictionary",
+    "AreaClosure",
+    "TableGeneration",
+    "VacancyFacetCount",
+]
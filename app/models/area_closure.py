@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer
+
+from app.database import Base
+
+
+class AreaClosure(Base):
+    """
+    Транзитивное замыкание дерева регионов hh.ru: строка на каждую пару
+    (предок, потомок), включая сам регион с depth = 0. Позволяет выбрать
+    вакансии региона со всеми вложенными городами одним соединением.
+    """
+
+    __tablename__ = "area_closure"
+
+    ancestor_id = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, primary_key=True)
+    depth = Column(Integer, nullable=False)
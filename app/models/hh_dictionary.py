@@ -0,0 +1,15 @@
+from sqlalchemy import JSON, Column, DateTime, String, func
+
+from app.database import Base
+
+
+class HHDictionary(Base):
+    """Снимок справочника hh.ru в компактном виде (см. hh_dictionaries)."""
+
+    __tablename__ = "hh_dictionaries"
+
+    name = Column(String, primary_key=True)  # areas, currencies, roles
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
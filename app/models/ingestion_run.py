@@ -0,0 +1,72 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    func,
+)
+
+from app.database import Base
+
+# Статусы прогона
+RUN_RUNNING = "running"
+RUN_SUCCESS = "success"
+RUN_PARTIAL = "partial"  # часть страниц не скачалась
+RUN_FAILED = "failed"
+
+
+class IngestionRun(Base):
+    """Запись журнала: один запуск задания сбора вакансий."""
+
+    __tablename__ = "ingestion_runs"
+
+    id = Column(Integer, primary_key=True)
+    search_definition_id = Column(
+        Integer,
+        ForeignKey("search_definitions.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    query_key = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, server_default=RUN_RUNNING)
+    started_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    pages = Column(Integer, nullable=False, server_default="0")
+    page_errors = Column(Integer, nullable=False, server_default="0")
+    items_seen = Column(Integer, nullable=False, server_default="0")
+    inserted = Column(Integer, nullable=False, server_default="0")
+    updated = Column(Integer, nullable=False, server_default="0")
+    skipped = Column(Integer, nullable=False, server_default="0")
+    enriched = Column(Integer, nullable=False, server_default="0")
+    http_seconds = Column(Float, nullable=False, server_default="0")
+    db_seconds = Column(Float, nullable=False, server_default="0")
+    error = Column(Text, nullable=True)
+
+
+class IngestionRunTotal(Base):
+    """
+    Накопленные итоги завершённых прогонов по запросу и статусу.
+    Пополняется в finish_ingestion_run в одной транзакции с записью
+    журнала, чтобы опрос /metrics читал по строке на запрос, а не
+    агрегировал весь ingestion_runs.
+    """
+
+    __tablename__ = "ingestion_run_totals"
+
+    query_key = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    runs = Column(BigInteger, nullable=False, server_default="0")
+    pages = Column(BigInteger, nullable=False, server_default="0")
+    page_errors = Column(BigInteger, nullable=False, server_default="0")
+    items_seen = Column(BigInteger, nullable=False, server_default="0")
+    inserted = Column(BigInteger, nullable=False, server_default="0")
+    updated = Column(BigInteger, nullable=False, server_default="0")
+    skipped = Column(BigInteger, nullable=False, server_default="0")
+    http_seconds = Column(Float, nullable=False, server_default="0")
+    db_seconds = Column(Float, nullable=False, server_default="0")
@@ -0,0 +1,17 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
+
+from app.database import Base
+
+
+class SearchDefinition(Base):
+    __tablename__ = "search_definitions"
+
+    id = Column(Integer, primary_key=True)
+    text = Column(String, nullable=False)
+    area = Column(Integer, nullable=True)
+    professional_role = Column(String, nullable=True)  # id роли в hh.ru
+    schedule = Column(String, nullable=True)  # fullDay, remote, ...
+    priority = Column(Integer, nullable=False, server_default="0")
+    interval_minutes = Column(Integer, nullable=False, server_default="60")
+    is_active = Column(Boolean, nullable=False, server_default="true")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
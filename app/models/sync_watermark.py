@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.database import Base
+
+
+class SyncWatermark(Base):
+    __tablename__ = "sync_watermarks"
+
+    id = Column(Integer, primary_key=True)
+    # Нормализованные параметры поискового запроса (text, area, ...)
+    query_key = Column(String, unique=True, index=True, nullable=False)
+    last_published_at = Column(DateTime(timezone=True), nullable=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
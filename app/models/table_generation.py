@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, func
+
+from app.database import Base
+
+
+class TableGeneration(Base):
+    """
+    Номер изменения таблицы: увеличивается в той же транзакции, что и
+    запись в неё. По нему строятся ETag ответов и ключи кэша списков.
+    """
+
+    __tablename__ = "table_generations"
+
+    name = Column(String, primary_key=True)  # имя таблицы
+    generation = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,8 +1,46 @@
 # app/models/vacancy.py
-from sqlalchemy import JSON, Column, DateTime, Integer, String, func
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from app.database import Base
 
+# Конфигурация полнотекстового поиска. russian стеммит кириллицу словарём
+# russian_stem, а латиницу — english_stem, поэтому одного вектора хватает
+# для запросов на обоих языках.
+SEARCH_CONFIG = "russian"
+# Вес A — название, B — компания и навыки, D — описание (HTML-теги парсер
+# to_tsvector пропускает сам)
+SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, "
+    f"coalesce({column}, '')), '{weight}')"
+    for column, weight in (
+        ("title", "A"),
+        ("company", "B"),
+        ("key_skills::text", "B"),
+        ("description", "D"),
+    )
+)
+
+# GIN-индексы pg_trgm для фильтров по подстроке (ILIKE '%...%'). Их создаёт
+# только миграция: расширения может не быть в базе, которую поднимает
+# create_all, а autogenerate пропускает их через include_object.
+TRIGRAM_INDEXES = {
+    "ix_vacancies_title_trgm": "title",
+    "ix_vacancies_company_trgm": "company",
+    "ix_vacancies_location_trgm": "location",
+}
+
 
 class Vacancy(Base):
     __tablename__ = "vacancies"
@@ -11,7 +49,9 @@ class Vacancy(Base):
     title = Column(String, index=True, nullable=False)
     company = Column(String, nullable=False)
     location = Column(String, nullable=True)
-    url = Column(String, nullable=True)
+    # id региона hh.ru; фильтр по региону идёт через area_closure
+    area_id = Column(Integer, nullable=True, index=True)
+    url = Column(String, nullable=True, unique=True, index=True)
     salary = Column(
         JSON, nullable=True
     )  # хранение диапазона зарплаты как JSON
@@ -19,3 +59,56 @@ class Vacancy(Base):
         String, nullable=True
     )  # источник вакансии (hh.ru, rabota.by)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Время последней записи строки, по нему выгрузка с since находит
+    # изменённые вакансии. ORM и update() ставят его через onupdate,
+    # upsert — явно в ON CONFLICT DO UPDATE
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
+    )
+
+    # Зарплата из salary по отдельным колонкам (см. services/salary.py),
+    # чтобы фильтровать и сортировать по индексу
+    salary_from = Column(Integer, nullable=True)
+    salary_to = Column(Integer, nullable=True)
+    salary_currency = Column(String(3), nullable=True)
+    salary_gross = Column(Boolean, nullable=True)
+    salary_mid_rub = Column(Integer, nullable=True)
+
+    # Подробности из /vacancies/{id}, заполняются при обогащении
+    description = Column(Text, nullable=True)
+    key_skills = Column(JSON, nullable=True)  # список названий навыков
+    experience = Column(String, nullable=True)
+    employment = Column(String, nullable=True)
+    schedule = Column(String, nullable=True)
+    # Отпечаток вакансии из поисковой выдачи: подробности перезапрашиваются
+    # только когда он меняется
+    list_fingerprint = Column(String, nullable=True)
+    # sha256 от содержимого вакансии: upsert перезаписывает строку только
+    # когда он меняется
+    content_hash = Column(String(64), nullable=True)
+    # Поисковый вектор для /vacancies/search, Postgres пересчитывает его сам
+    search_vector = Column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True
+    )
+
+    __table_args__ = (
+        # Порядок индекса совпадает с сортировкой sort_by=salary, поэтому
+        # и сортировка, и фильтр по диапазону идут по индексу
+        Index(
+            "ix_vacancies_salary_mid_rub",
+            salary_mid_rub.desc().nullslast(),
+        ),
+        # Постраничная выдача по курсору: поиск по (ключ сортировки, id)
+        Index("ix_vacancies_created_at_id", created_at, id),
+        Index("ix_vacancies_title_id", title, id),
+        Index("ix_vacancies_company_id", company, id),
+        Index(
+            "ix_vacancies_search_vector",
+            search_vector,
+            postgresql_using="gin",
+        ),
+    )
@@ -0,0 +1,123 @@
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+)
+
+from app.database import Base
+
+# Нижние границы зарплатных диапазонов по salary_mid_rub, в рублях
+SALARY_BANDS = (0, 50_000, 100_000, 150_000, 200_000, 300_000)
+SALARY_BAND_SQL = (
+    "CASE "
+    + " ".join(
+        f"WHEN salary_mid_rub >= {band} THEN {band}"
+        for band in reversed(SALARY_BANDS)
+    )
+    + " END"
+)
+# Измерения, по которым считаются фасеты, в порядке ключа свёртки
+FACET_COLUMNS = ("company", "location", "area_id", "source", "salary_band")
+# GIN-индексы pg_trgm для фильтров фасетов по подстроке; как и
+# TRIGRAM_INDEXES вакансий, их создаёт только миграция
+FACET_TRIGRAM_INDEXES = {
+    "ix_vacancy_facet_counts_company_trgm": "company",
+    "ix_vacancy_facet_counts_location_trgm": "location",
+}
+
+
+def _apply_delta_sql(sources: dict) -> str:
+    """
+    Прибавляет к свёртке разницу из переходных таблиц триггера:
+    ``{"new_rows": 1, "old_rows": -1}``. Строки свёртки обновляются в
+    порядке ключа, чтобы параллельные записи не взаимоблокировались.
+    Обнулившиеся строки затем удаляются; удаление трогает только строки,
+    уже заблокированные этим же оператором, поэтому новых ожиданий между
+    транзакциями не добавляет.
+    """
+    columns = ", ".join(FACET_COLUMNS)
+    dimensions = ", ".join(FACET_COLUMNS[:-1])
+    delta = " UNION ALL ".join(
+        f"SELECT {dimensions}, {SALARY_BAND_SQL} AS salary_band, "
+        f"{sign} AS delta FROM {table}"
+        for table, sign in sources.items()
+    )
+    return (
+        "WITH changed AS ("
+        f"INSERT INTO vacancy_facet_counts AS facet ({columns}, vacancies) "
+        f"SELECT {columns}, sum(delta) FROM ({delta}) AS changes "
+        f"GROUP BY {columns} HAVING sum(delta) <> 0 ORDER BY {columns} "
+        f"ON CONFLICT ({columns}) DO UPDATE "
+        "SET vacancies = facet.vacancies + excluded.vacancies "
+        "RETURNING id, vacancies) "
+        "SELECT array_agg(id) INTO emptied FROM changed WHERE vacancies <= 0; "
+        "DELETE FROM vacancy_facet_counts "
+        "WHERE id = ANY(emptied) AND vacancies <= 0;"
+    )
+
+
+def _trigger_sql(operation: str, sources: dict) -> str:
+    name = f"vacancy_facets_{operation.lower()}"
+    referencing = " ".join(
+        f"{'NEW' if sign > 0 else 'OLD'} TABLE AS {table}"
+        for table, sign in sources.items()
+    )
+    return (
+        f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ DECLARE emptied integer[]; BEGIN "
+        f"{_apply_delta_sql(sources)} RETURN NULL; END $$;\n"
+        f"CREATE OR REPLACE TRIGGER {name} AFTER {operation} ON vacancies "
+        f"REFERENCING {referencing} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {name}();\n"
+    )
+
+
+# Триггеры уровня оператора: один пакет upsert при сборе — одно
+# обновление свёртки, каким бы путём ни шла запись в vacancies
+FACET_TRIGGERS_SQL = (
+    _trigger_sql("INSERT", {"new_rows": 1})
+    + _trigger_sql("UPDATE", {"new_rows": 1, "old_rows": -1})
+    + _trigger_sql("DELETE", {"old_rows": -1})
+    + "CREATE OR REPLACE FUNCTION vacancy_facets_truncate() "
+    "RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+    "TRUNCATE vacancy_facet_counts; RETURN NULL; END $$;\n"
+    "CREATE OR REPLACE TRIGGER vacancy_facets_truncate AFTER TRUNCATE "
+    "ON vacancies FOR EACH STATEMENT "
+    "EXECUTE FUNCTION vacancy_facets_truncate();\n"
+)
+
+
+class VacancyFacetCount(Base):
+    """
+    Свёртка вакансий для фасетов: число вакансий на каждое сочетание
+    компании, города, региона, источника и зарплатного диапазона.
+    Поддерживается триггерами на vacancies (FACET_TRIGGERS_SQL), которые
+    удаляют строки, где число вакансий дошло до нуля.
+    """
+
+    __tablename__ = "vacancy_facet_counts"
+
+    id = Column(Integer, primary_key=True)
+    company = Column(String, nullable=True)
+    location = Column(String, nullable=True)
+    area_id = Column(Integer, nullable=True)
+    source = Column(String, nullable=True)
+    # Нижняя граница из SALARY_BANDS, NULL — зарплата не указана
+    salary_band = Column(Integer, nullable=True)
+    vacancies = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            *FACET_COLUMNS,
+            name="uq_vacancy_facet_counts_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+# Базы, которые поднимает create_all (тесты), получают те же триггеры,
+# что и миграция
+event.listen(Base.metadata, "after_create", DDL(FACET_TRIGGERS_SQL))
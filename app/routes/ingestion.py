@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.crud.ingestion_run import list_ingestion_runs
+from app.database import get_db
+from app.schemas import IngestionRunRead
+
+router = APIRouter(prefix="/ingestion", tags=["Ingestion"])
+
+
+@router.get("/runs", response_model=List[IngestionRunRead])
+def get_ingestion_runs(
+    search_definition_id: Optional[int] = None,
+    query_key: Optional[str] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(50, le=500),
+    db: Session = Depends(get_db),
+):
+    return list_ingestion_runs(
+        db,
+        search_definition_id=search_definition_id,
+        query_key=query_key,
+        status=status,
+        skip=skip,
+        limit=limit,
+    )
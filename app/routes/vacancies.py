@@ -1,38 +1,353 @@
-from typing import List, Optional
+import hashlib
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.crud.table_generation import get_generation
 from app.crud.vacancy import (
+    FACET_LIMIT,
+    KEYSET_SORTS,
+    VACANCIES_GENERATION,
+    count_vacancies,
+    create_vacancies_bulk,
     create_vacancy,
+    delete_vacancies_bulk,
     delete_vacancy,
-    get_vacancies,
+    estimate_vacancies,
+    get_vacancy_facets,
     list_vacancies,
+    list_vacancies_page,
+    search_vacancies,
+    update_vacancies_bulk,
     update_vacancy,
 )
 from app.database import get_db
+from app.models.vacancy_facet import SALARY_BANDS
 from app.schemas import (
+    FacetValue,
+    VacancyBulkDelete,
+    VacancyBulkResult,
+    VacancyBulkUpdate,
     VacancyCreate,
     VacancyDelete,
+    VacancyFacets,
     VacancyRead,
+    VacancySearchResult,
     VacancyUpdate,
 )
+from app.schemas.vacancy import BULK_MAX_ITEMS
+from app.services import hh_dictionaries
+from app.services.listing_cache import (
+    count_cache,
+    listing_cache,
+    listing_key,
+)
+from app.services.vacancy_export import (
+    EXPORT_FORMATS,
+    export_rows,
+    to_csv,
+    to_ndjson,
+)
+from app.services.vacancy_json import dump_rows, parse_fields
 
 router = APIRouter(prefix="/vacancies", tags=["Vacancies"])
 
+# Прокси может несколько секунд отдавать ответ сам, дальше перепроверяет
+# его по ETag
+CACHE_CONTROL = "public, max-age=5"
 
-@router.get("/", response_model=List[VacancyRead])
-def get_vacancies_list(
+
+def _cache_headers(generation: int, key: tuple) -> dict:
+    """Слабый ETag: номер изменения vacancies и параметры запроса."""
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return {
+        "ETag": f'W/"{generation}-{digest}"',
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+def _not_modified(headers: dict, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Сравнение слабое: префикс W/ не учитывается
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return headers["ETag"].removeprefix("W/") in tags
+
+
+def _resolve_area(area: str) -> int:
+    """id региона hh.ru или его название из справочника."""
+    if area.isdigit():
+        return int(area)
+    area_id = hh_dictionaries.current().area_id(area)
+    if area_id is None:
+        raise HTTPException(status_code=400, detail="Unknown area")
+    return int(area_id)
+
+
+def _load_listing(
+    db: Session,
+    sort_by: str,
+    skip: int,
+    limit: int,
+    cursor,
+    filters: dict,
+    fields: tuple,
+) -> tuple[list, dict]:
+    # Без skip выдача идёт по курсору: следующая и предыдущая страницы
+    # передаются в заголовках X-Next-Cursor и X-Prev-Cursor
+    if cursor or (skip == 0 and sort_by in KEYSET_SORTS):
+        try:
+            vacancies, next_cursor, prev_cursor = list_vacancies_page(
+                db, sort_by, limit, cursor, fields=fields, **filters
+            )
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        headers = {}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        if prev_cursor:
+            headers["X-Prev-Cursor"] = prev_cursor
+        return vacancies, headers
+
+    vacancies = list_vacancies(
+        db, sort_by, skip=skip, limit=limit, fields=fields, **filters
+    )
+    return vacancies, {}
+
+
+def _total_count_headers(db: Session, mode: str | None, filters: dict):
+    """
+    X-Total-Count в выбранном клиентом режиме: exact — COUNT(*) под
+    фильтрами, cached — он же из count_cache (может отставать на
+    COUNT_CACHE_TTL), estimate — по свёртке фасетов или оценке
+    планировщика, без чтения vacancies.
+    """
+    if mode is None:
+        return {}
+    if mode == "estimate":
+        return {"X-Total-Count": str(estimate_vacancies(db, **filters))}
+    if mode == "cached":
+        key = listing_key(**filters)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached.headers
+        # Поколение до запроса: запись, пришедшая во время COUNT(*),
+        # не даст закэшировать устаревшее число
+        generation = count_cache.generation
+    headers = {"X-Total-Count": str(count_vacancies(db, **filters))}
+    if mode == "cached":
+        count_cache.put(key, b"", headers, generation)
+    return headers
+
+
+def listing_filters(
+    title: Optional[str] = None,
     company: Optional[str] = None,
     location: Optional[str] = None,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    area: Optional[str] = None,
+) -> dict:
+    """Фильтры списка вакансий, общие для выдачи и выгрузки."""
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "area_id": _resolve_area(area) if area else None,
+    }
+
+
+@router.get("/", response_model=List[VacancyRead])
+def get_vacancies_list(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "created_at",
+    cursor: Optional[str] = None,
+    count: Optional[Literal["exact", "cached", "estimate"]] = None,
+    fields: Optional[str] = None,
+    filters: dict = Depends(listing_filters),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    if company or location:
-        return list_vacancies(db, sort_by, company, location, skip, limit)
-    return get_vacancies(db, skip=skip, limit=limit)
+    """
+    ``fields=title,company,salary_mid_rub`` — только эти поля вакансии:
+    в SQL выбираются только их колонки.
+    """
+    try:
+        fields = parse_fields(fields)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    key = listing_key(
+        sort_by=sort_by,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+        fields=",".join(fields),
+        **filters,
+    )
+    # Номер изменения читается по первичному ключу; если он тот же, что у
+    # клиента, ни запроса, ни сериализации не будет
+    generation = get_generation(db, VACANCIES_GENERATION)
+    cache_headers = _cache_headers(generation, key)
+    if _not_modified(cache_headers, if_none_match):
+        return Response(status_code=304, headers=cache_headers)
+
+    cached = listing_cache.get((generation, key))
+    if cached is None:
+        local_generation = listing_cache.generation
+        vacancies, headers = _load_listing(
+            db, sort_by, skip, limit, cursor, filters, fields
+        )
+        headers.update(_total_count_headers(db, count, filters))
+        body = dump_rows(vacancies, fields)
+        listing_cache.put((generation, key), body, headers, local_generation)
+    else:
+        body, headers = cached.body, cached.headers
+    return Response(
+        body,
+        media_type="application/json",
+        headers={**headers, **cache_headers},
+    )
+
+
+@router.get("/search", response_model=List[VacancySearchResult])
+def search_vacancies_list(
+    response: Response,
+    q: str = Query(min_length=1),
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Полнотекстовый поиск по названию, компании, навыкам и описанию.
+    ``q`` в синтаксисе websearch: ``python -java "data engineer"``.
+    """
+    generation = get_generation(db, VACANCIES_GENERATION)
+    cache_headers = _cache_headers(
+        generation, listing_key(q=q, limit=limit, cursor=cursor)
+    )
+    if _not_modified(cache_headers, if_none_match):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+    try:
+        results, next_cursor = search_vacancies(db, q, limit, cursor)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [
+        VacancySearchResult(
+            **VacancyRead.model_validate(vacancy).model_dump(),
+            rank=rank,
+            headline=headline,
+        )
+        for vacancy, rank, headline in results
+    ]
+
+
+def _salary_band_name(band: int | None) -> str | None:
+    if band not in SALARY_BANDS:
+        return None
+    index = SALARY_BANDS.index(band)
+    if index == len(SALARY_BANDS) - 1:
+        return f"от {band}"
+    upper = SALARY_BANDS[index + 1]
+    return f"до {upper}" if band == 0 else f"{band}–{upper}"
+
+
+def _facet_values(values: list[tuple], name=None) -> list[FacetValue]:
+    return [
+        FacetValue(value=value, name=name(value) if name else None, count=n)
+        for value, n in values
+    ]
+
+
+@router.get("/facets", response_model=VacancyFacets)
+def get_vacancy_facets_list(
+    response: Response,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    area: Optional[str] = None,
+    source: Optional[str] = None,
+    salary_band: Optional[int] = None,
+    limit: int = Query(FACET_LIMIT, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Число вакансий по компаниям, городам, регионам, источникам и
+    зарплатным диапазонам (``salary_band`` — нижняя граница диапазона).
+    Считается по свёртке vacancy_facet_counts, а не по vacancies.
+    """
+    filters = {
+        "company": company,
+        "location": location,
+        "area_id": _resolve_area(area) if area else None,
+        "source": source,
+        "salary_band": salary_band,
+    }
+    generation = get_generation(db, VACANCIES_GENERATION)
+    cache_headers = _cache_headers(
+        generation, listing_key(facets=True, limit=limit, **filters)
+    )
+    if _not_modified(cache_headers, if_none_match):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    total, facets = get_vacancy_facets(db, limit, **filters)
+    return VacancyFacets(
+        total=total,
+        company=_facet_values(facets["company"]),
+        location=_facet_values(facets["location"]),
+        area=_facet_values(
+            facets["area_id"], hh_dictionaries.current().area_name
+        ),
+        source=_facet_values(facets["source"]),
+        salary=_facet_values(facets["salary_band"], _salary_band_name),
+    )
+
+
+@router.get("/export")
+def export_vacancies(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+    filters: dict = Depends(listing_filters),
+    db: Session = Depends(get_db),
+):
+    """
+    Потоковая выгрузка вакансий в порядке id. ``since`` — созданные или
+    изменённые не раньше этого момента, ``after_id`` — продолжение
+    прерванной выгрузки.
+    """
+    rows = export_rows(db.get_bind(), since, after_id, **filters)
+    body = to_ndjson(rows) if format == "ndjson" else to_csv(rows)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="vacancies.{format}"'
+            )
+        },
+    )
 
 
 @router.post("/", response_model=VacancyRead)
@@ -40,6 +355,43 @@ def add_vacancy(vacancy: VacancyCreate, db: Session = Depends(get_db)):
     return create_vacancy(db, vacancy)
 
 
+def _bulk_results(results: list[tuple]) -> list[VacancyBulkResult]:
+    return [
+        VacancyBulkResult(id=vacancy_id, status=status)
+        for vacancy_id, status in results
+    ]
+
+
+# Пакетные роуты объявлены до /{vacancy_id}, иначе PATCH и DELETE
+# /bulk попали бы в него. Каждый запрос — одна транзакция: при ошибке
+# (например, повторяющийся url) не сохраняется ничего
+@router.post("/bulk", response_model=List[VacancyBulkResult])
+def add_vacancies_bulk(
+    vacancies: List[VacancyCreate] = Body(
+        min_length=1, max_length=BULK_MAX_ITEMS
+    ),
+    db: Session = Depends(get_db),
+):
+    return _bulk_results(create_vacancies_bulk(db, vacancies))
+
+
+@router.patch("/bulk", response_model=List[VacancyBulkResult])
+def up_vacancies_bulk(
+    vacancies: List[VacancyBulkUpdate] = Body(
+        min_length=1, max_length=BULK_MAX_ITEMS
+    ),
+    db: Session = Depends(get_db),
+):
+    return _bulk_results(update_vacancies_bulk(db, vacancies))
+
+
+@router.delete("/bulk", response_model=List[VacancyBulkResult])
+def del_vacancies_bulk(
+    request: VacancyBulkDelete, db: Session = Depends(get_db)
+):
+    return _bulk_results(delete_vacancies_bulk(db, request.ids))
+
+
 @router.put("/{vacancy_id}", response_model=VacancyRead)
 def up_vacancy(
     vacancy_id: int, vacancy: VacancyUpdate, db: Session = Depends(get_db)
@@ -1,57 +1,193 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from app.crud.vacancy import create_vacancy
+from app.config import settings
+from app.crud.ingestion_run import finish_ingestion_run, start_ingestion_run
+from app.crud.search_definition import (
+    get_search_definition,
+    list_active_search_definitions,
+)
 from app.database import SessionLocal
+from app.leader import SEARCH_JOB_LOCK_NAMESPACE, advisory_lock
 from app.logger import logger
-from app.schemas import VacancyCreate
-from app.services.hh_api import fetch_vacancies
+from app.services import hh_dictionaries
+from app.services.ingestion import ingest_vacancies, search_query_key
 
-scheduler = BackgroundScheduler()
+SEARCH_JOB_PREFIX = "search:"
+SYNC_JOBS_INTERVAL_MINUTES = 5
+# Первые запуски поисковых заданий разносятся во времени в порядке
+# приоритета, чтобы 200 запросов не стартовали в одну секунду.
+SEARCH_JOB_STAGGER_SECONDS = 5
+SEARCH_JOB_JITTER_SECONDS = 60
 
+SYNC_JOBS_JOB_ID = "sync_search_jobs"
+DICTIONARIES_JOB_ID = "refresh_hh_dictionaries"
+DICTIONARIES_CHECK_MINUTES = 60
 
-def job_fetch_vacancies():
+
+def create_scheduler() -> BackgroundScheduler:
+    return BackgroundScheduler(
+        executors={
+            "default": ThreadPoolExecutor(settings.INGESTION_MAX_WORKERS),
+        },
+        job_defaults={"coalesce": True, "max_instances": 1},
+    )
+
+
+scheduler = create_scheduler()
+
+
+def job_fetch_vacancies(definition_id: int):
+    # Планировщик работает только на лидере, но при смене лидера старый
+    # и новый узлы какое-то время могут работать одновременно. Блокировка
+    # на запрос гарантирует, что один запрос не выполняется дважды.
+    with advisory_lock(SEARCH_JOB_LOCK_NAMESPACE, definition_id) as acquired:
+        if not acquired:
+            logger.info(
+                f"Запрос {definition_id} уже выполняется на другом узле"
+            )
+            return
+        _fetch_vacancies(definition_id)
+
+
+def _fetch_vacancies(definition_id: int):
     db = SessionLocal()
+    run = None
+    counts = {}
     try:
-        items = fetch_vacancies("Python", area=1002)
-
-        if not items:
-            logger.info("Нет новых вакансий")
+        definition = get_search_definition(db, definition_id)
+        if definition is None or not definition.is_active:
             return
 
-        for item in items:
-            vacancy_data = VacancyCreate(
-                title=item["name"],
-                company=item.get("employer", {}).get("name", "N/A"),
-                location=item.get("area", {}).get("name", "N/A"),
-                url=item["alternate_url"],
-                salary=None,
-                source=None,
-            )
-            create_vacancy(db, vacancy_data)
+        filters = {
+            "area": definition.area,
+            "professional_role": definition.professional_role,
+            "schedule": definition.schedule,
+        }
+        run = start_ingestion_run(
+            db,
+            search_query_key(text=definition.text, **filters),
+            definition.id,
+        )
+        counts = asyncio.run(
+            ingest_vacancies(db, definition.text, totals=counts, **filters)
+        )
+        finish_ingestion_run(db, run, counts)
 
-        logger.info(f"Собрано {len(items)} вакансий")
+        logger.info(
+            f"Запрос «{definition.text}»: "
+            f"страниц {counts['pages']}, вакансий в выдаче {counts['items']}, "
+            f"добавлено {counts['inserted']}, "
+            f"обновлено {counts['updated']}, "
+            f"без изменений {counts['unchanged']} "
+            f"(hh.ru {counts['http_seconds']:.1f} с, "
+            f"БД {counts['db_seconds']:.1f} с)"
+        )
 
     except Exception as error:
         logger.exception(f"Ошибка при сборе вакансий: {error}")
+        if run is not None:
+            db.rollback()
+            # Батчи до ошибки уже закоммичены — их итоги тоже в журнал
+            finish_ingestion_run(db, run, counts, error=repr(error))
 
     finally:
         db.close()
 
 
+def job_refresh_dictionaries():
+    # Задание проверяет возраст снимка, а не просто идёт раз в сутки:
+    # так справочники не обновляются при каждой смене лидера.
+    db = SessionLocal()
+    try:
+        if hh_dictionaries.is_stale(db):
+            hh_dictionaries.refresh_dictionaries(db)
+            logger.info("📚 Справочники hh.ru обновлены")
+    except Exception as error:
+        logger.exception(f"Ошибка при обновлении справочников: {error}")
+    finally:
+        db.close()
+
+
+def sync_search_jobs():
+    """
+    Приводит задания планировщика в соответствие с таблицей
+    search_definitions: добавляет новые, обновляет изменившийся интервал
+    и удаляет задания отключённых запросов.
+    """
+    db = SessionLocal()
+    try:
+        definitions = list_active_search_definitions(db)
+    finally:
+        db.close()
+
+    existing = {
+        job.id: job
+        for job in scheduler.get_jobs()
+        if job.id.startswith(SEARCH_JOB_PREFIX)
+    }
+    wanted = set()
+    now = datetime.now()
+
+    for rank, definition in enumerate(definitions):
+        job_id = f"{SEARCH_JOB_PREFIX}{definition.id}"
+        wanted.add(job_id)
+        interval = timedelta(minutes=definition.interval_minutes)
+
+        job = existing.get(job_id)
+        if job is not None and job.trigger.interval == interval:
+            continue
+
+        scheduler.add_job(
+            job_fetch_vacancies,
+            "interval",
+            args=[definition.id],
+            id=job_id,
+            replace_existing=True,
+            minutes=definition.interval_minutes,
+            jitter=SEARCH_JOB_JITTER_SECONDS,
+            next_run_time=now
+            + timedelta(seconds=rank * SEARCH_JOB_STAGGER_SECONDS),
+            misfire_grace_time=definition.interval_minutes * 30,
+        )
+
+    for job_id in existing.keys() - wanted:
+        scheduler.remove_job(job_id)
+
+
 def start_scheduler():
+    global scheduler
+    # Остановленный BackgroundScheduler нельзя запустить повторно (его пул
+    # потоков закрыт), поэтому при каждом избрании лидером создаём новый.
+    if scheduler.running:
+        return
+    scheduler = create_scheduler()
+
     logger.info("📅 Планировщик запущен")
 
     scheduler.add_job(
-        job_fetch_vacancies,
+        sync_search_jobs,
         "interval",
-        minutes=60,
+        id=SYNC_JOBS_JOB_ID,
+        minutes=SYNC_JOBS_INTERVAL_MINUTES,
         next_run_time=datetime.now(),
         misfire_grace_time=30,
     )
+    scheduler.add_job(
+        job_refresh_dictionaries,
+        "interval",
+        id=DICTIONARIES_JOB_ID,
+        minutes=DICTIONARIES_CHECK_MINUTES,
+        next_run_time=datetime.now(),
+        misfire_grace_time=60,
+    )
     scheduler.start()
 
 
 def fin_scheduler():
-    scheduler.shutdown(wait=False)
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+        logger.info("Планировщик остановлен")
@@ -5,6 +5,7 @@ from .auth import (
     UserRegisterResponse,
 )
 from .hh_resume import AdditionalProperties, ResumeCreate
+from .ingestion_run import IngestionRunRead
 from .user import (
     LoginSchema,
     UserBase,
@@ -13,28 +14,45 @@ from .user import (
     UserRegisterSchema,
 )
 from .vacancy import (
+    FacetValue,
+    Salary,
     VacancyBase,
+    VacancyBulkDelete,
+    VacancyBulkResult,
+    VacancyBulkUpdate,
     VacancyCreate,
     VacancyDelete,
+    VacancyFacets,
+    VacancyIngest,
     VacancyRead,
+    VacancySearchResult,
     VacancyUpdate,
 )
 
 __all__ = [
     "AdditionalProperties",
+    "FacetValue",
+    "IngestionRunRead",
     "LoginResponse",
     "LoginSchema",
     "RefreshTokenRequest",
     "RefreshTokenResponse",
     "ResumeCreate",
+    "Salary",
     "UserBase",
     "UserCreate",
     "UserRead",
     "UserRegisterResponse",
     "UserRegisterSchema",
     "VacancyBase",
+    "VacancyBulkDelete",
+    "VacancyBulkResult",
+    "VacancyBulkUpdate",
     "VacancyCreate",
     "VacancyDelete",
+    "VacancyFacets",
+    "VacancyIngest",
     "VacancyRead",
+    "VacancySearchResult",
     "VacancyUpdate",
 ]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class IngestionRunRead(BaseModel):
+    id: int
+    search_definition_id: Optional[int] = None
+    query_key: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    pages: int
+    page_errors: int
+    items_seen: int
+    inserted: int
+    updated: int
+    skipped: int
+    enriched: int
+    http_seconds: float
+    db_seconds: float
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,18 +1,68 @@
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    field_validator,
+    model_serializer,
+)
 
 from app.examples import vacancy
 
+# Наибольшее число вакансий в одном запросе к /vacancies/bulk
+BULK_MAX_ITEMS = 5000
+
+
+# Границы вилки хранятся в integer-колонках salary_from и salary_to
+SALARY_MAX = 2**31 - 1
+
+
+class Salary(BaseModel):
+    """
+    Зарплата в формате hh.ru. Прочие ключи (например, ``mode``)
+    сохраняются как есть.
+    """
+
+    model_config = ConfigDict(
+        extra="allow", validate_by_name=True, serialize_by_alias=True
+    )
+
+    from_: Optional[int] = Field(None, alias="from", ge=0, le=SALARY_MAX)
+    to: Optional[int] = Field(None, ge=0, le=SALARY_MAX)
+    currency: Optional[str] = Field(None, pattern=r"^[A-Z]{3}$")
+    gross: Optional[bool] = None
+
+    @model_serializer(mode="wrap")
+    def _only_set(self, handler):
+        # Сохраняется то, что передали: незаданные ключи не дописываются
+        unset = {
+            field.alias or name
+            for name, field in type(self).model_fields.items()
+            if name not in self.model_fields_set
+        }
+        return {
+            key: value
+            for key, value in handler(self).items()
+            if key not in unset
+        }
+
 
 class VacancyBase(BaseModel):
     title: str
     company: str
     location: Optional[str] = None
+    area_id: Optional[int] = None
     url: Optional[HttpUrl] = None
-    salary: Optional[Dict] = None
+    salary: Optional[Salary] = None
     source: Optional[str] = "hh.ru"  # None
+    description: Optional[str] = None
+    key_skills: Optional[List[str]] = None
+    experience: Optional[str] = None
+    employment: Optional[str] = None
+    schedule: Optional[str] = None
 
     class Config:
         json_schema_extra = {"example": vacancy.vacancy_example}
@@ -22,9 +72,22 @@ class VacancyCreate(VacancyBase):
     pass
 
 
+# Вакансия из конвейера загрузки hh.ru: со служебными полями,
+# которые не принимаются через API
+class VacancyIngest(VacancyCreate):
+    list_fingerprint: Optional[str] = None
+
+
 class VacancyRead(VacancyBase):
     id: int
+    # Отдаётся как сохранено, без повторной проверки формата
+    salary: Optional[Dict] = None
     created_at: datetime
+    salary_from: Optional[int] = None
+    salary_to: Optional[int] = None
+    salary_currency: Optional[str] = None
+    salary_gross: Optional[bool] = None
+    salary_mid_rub: Optional[int] = None
 
     class Config:
         from_attributes = True  # для работы с SQLAlchemy моделей
@@ -32,14 +95,64 @@ class VacancyRead(VacancyBase):
         json_schema_extra = {"example": vacancy.vacancy_read_example}
 
 
+class VacancySearchResult(VacancyRead):
+    rank: float
+    # Фрагмент описания с найденными словами в <b>...</b>
+    headline: Optional[str] = None
+
+
+class FacetValue(BaseModel):
+    value: Optional[Union[int, str]] = None  # None — значение не указано
+    # Название региона или границы зарплатного диапазона
+    name: Optional[str] = None
+    count: int
+
+
+class VacancyFacets(BaseModel):
+    total: int
+    company: List[FacetValue]
+    location: List[FacetValue]
+    area: List[FacetValue]
+    source: List[FacetValue]
+    salary: List[FacetValue]
+
+
 class VacancyUpdate(BaseModel):
     title: Optional[str] = None
     company: Optional[str] = None
     location: Optional[str] = None
+    area_id: Optional[int] = None
     url: Optional[HttpUrl] = None
-    salary: Optional[Dict] = None
+    salary: Optional[Salary] = None
     source: Optional[str] = None
+    description: Optional[str] = None
+    key_skills: Optional[List[str]] = None
+    experience: Optional[str] = None
+    employment: Optional[str] = None
+    schedule: Optional[str] = None
+
+    @field_validator("title", "company")
+    @classmethod
+    def required_not_null(cls, value):
+        # Поле можно не передавать, но не обнулять: в базе оно NOT NULL
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
 
 
 class VacancyDelete(BaseModel):
     ok: bool
+
+
+class VacancyBulkUpdate(VacancyUpdate):
+    id: int
+
+
+class VacancyBulkDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class VacancyBulkResult(BaseModel):
+    id: Optional[int] = None
+    # created, exists, updated, deleted или not_found
+    status: str
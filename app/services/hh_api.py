@@ -1,11 +1,290 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator
+
+import httpx
 import requests
 
-BASE_URL = "https://api.hh.ru/vacancies"
+from app.config import hh_settings
+from app.logger import logger
+from app.services import hh_client
+from app.services.json_stream import iter_items
+
+HH_API_URL = hh_settings.hh_api_url.rstrip("/")
+BASE_URL = f"{HH_API_URL}/vacancies"
+
+# hh.ru отдаёт не больше 2000 результатов на один поисковый запрос
+# (page * per_page < 2000), дальше этой глубины страницы пустые.
+MAX_SEARCH_DEPTH = 2000
+HARVEST_PER_PAGE = 100
+HARVEST_CONCURRENCY = 5
+DETAILS_CONCURRENCY = 5
 
 
 def fetch_vacancies(keyword: str, area: int = 1002, per_page: int = 10):
     params = {"text": keyword, "area": area, "per_page": per_page}
-    response = requests.get(BASE_URL, params=params)
+    response = hh_client.call(
+        lambda: requests.get(BASE_URL, params=params),
+        key=hh_client.client_limiter_key(),
+    )
     response.raise_for_status()
     data = response.json()
     return data.get("items", [])
+
+
+def create_async_client(
+    concurrency: int = HARVEST_CONCURRENCY,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    transport = hh_client.AsyncCachingTransport(
+        httpx.AsyncHTTPTransport(limits=limits)
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=hh_client.REQUEST_TIMEOUT,
+        headers={"User-Agent": hh_client.USER_AGENT},
+    )
+
+
+async def stream_vacancies_page(
+    client: httpx.AsyncClient,
+    params: dict,
+    page: int,
+    meta: dict | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Отдаёт вакансии страницы выдачи по мере чтения ответа, не загружая
+    тело целиком. Поля страницы (``pages``, ``found``) записываются в
+    ``meta`` после того, как ответ дочитан.
+    """
+    response = await hh_client.call_async(
+        lambda: client.send(
+            client.build_request(
+                "GET", BASE_URL, params={**params, "page": page}
+            ),
+            stream=True,
+        ),
+        key=hh_client.client_limiter_key(),
+    )
+    try:
+        response.raise_for_status()
+        async for item in iter_items(response.aiter_text(), meta):
+            yield item
+    finally:
+        await response.aclose()
+
+
+async def read_vacancies_page(
+    client: httpx.AsyncClient,
+    params: dict,
+    page: int,
+    meta: dict | None = None,
+) -> list[dict]:
+    """Вакансии страницы выдачи; соединение к возврату уже освобождено."""
+    return [
+        item
+        async for item in stream_vacancies_page(client, params, page, meta)
+    ]
+
+
+def parse_published_at(item: dict) -> datetime | None:
+    # hh.ru отдаёт время в виде 2025-01-31T12:00:00+0300
+    value = item.get("published_at")
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    except ValueError:
+        return None
+
+
+async def _harvest_window(
+    client: httpx.AsyncClient,
+    params: dict,
+    per_page: int,
+    concurrency: int,
+    stats: dict,
+    meta: dict,
+) -> AsyncIterator[dict]:
+    """
+    Одно окно выдачи: страницы до MAX_SEARCH_DEPTH. Поля первой
+    страницы (``found``, ``pages``) записываются в ``meta``.
+    """
+    for item in await read_vacancies_page(client, params, 0, meta):
+        yield item
+    stats["pages"] += 1
+
+    max_pages = max(MAX_SEARCH_DEPTH // per_page, 1)
+    pages = iter(range(1, min(meta.get("pages", 1), max_pages)))
+    queue = asyncio.Queue(maxsize=per_page)
+    done = object()
+
+    async def worker() -> None:
+        for page in pages:
+            try:
+                items = await read_vacancies_page(client, params, page)
+            except (httpx.HTTPError, ValueError) as error:
+                stats["errors"] += 1
+                logger.warning(f"Не удалось получить страницу: {error}")
+                continue
+            stats["pages"] += 1
+            for item in items:
+                await queue.put(item)
+
+    async def run_workers() -> None:
+        # При отмене (потребитель закрыл генератор) метку не кладём:
+        # очередь может быть полна, и put() повис бы навсегда
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        except Exception:
+            await queue.put(done)
+            raise
+        await queue.put(done)
+
+    runner = asyncio.create_task(run_workers())
+    try:
+        while (item := await queue.get()) is not done:
+            yield item
+        # Пробрасываем непредвиденные ошибки воркеров
+        await runner
+    finally:
+        runner.cancel()
+
+
+async def harvest_vacancies(
+    keyword: str,
+    area: int = 1002,
+    per_page: int = HARVEST_PER_PAGE,
+    concurrency: int = HARVEST_CONCURRENCY,
+    client: httpx.AsyncClient | None = None,
+    date_from: datetime | None = None,
+    stats: dict | None = None,
+    professional_role: str | None = None,
+    schedule: str | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Обходит все страницы поисковой выдачи hh.ru и отдаёт вакансии потоком.
+
+    Первая страница запрашивается отдельно, чтобы узнать число страниц,
+    остальные читают параллельно ``concurrency`` воркеров. Страница
+    разбирается по мере чтения ответа, и соединение возвращается в пул
+    до того, как её вакансии отданы дальше: пока потребитель занят
+    (например, качает карточки тем же клиентом), воркеры не держат
+    соединения. Вакансии передаются через ограниченную очередь, поэтому
+    потребление памяти не зависит от числа страниц. Ошибка отдельной
+    страницы логируется и не прерывает обход.
+
+    Выдача идёт от новых вакансий к старым. Если hh.ru нашёл больше
+    MAX_SEARCH_DEPTH, обход продолжается следующим окном с ``date_to``
+    по самой старой уже полученной вакансии, пока выдача окна не
+    поместится в глубину. Вакансии на границе окон могут прийти дважды.
+
+    С ``date_from`` запрашиваются только вакансии, опубликованные
+    начиная с этого момента. В ``stats`` (если передан) записывается
+    число скачанных страниц и ошибок, ``found`` — сколько вакансий нашёл
+    hh.ru, и ``truncated`` — часть выдачи недоступна: в одну секунду
+    публикации пришлось больше MAX_SEARCH_DEPTH вакансий.
+    """
+    params = {
+        "text": keyword,
+        "per_page": per_page,
+        "order_by": "publication_time",
+    }
+    filters = {
+        "area": area,
+        "professional_role": professional_role,
+        "schedule": schedule,
+    }
+    params.update(
+        {key: value for key, value in filters.items() if value is not None}
+    )
+    if date_from is not None:
+        params["date_from"] = date_from.isoformat()
+    if stats is None:
+        stats = {}
+    stats.setdefault("pages", 0)
+    stats.setdefault("errors", 0)
+    stats.setdefault("found", 0)
+    stats.setdefault("truncated", False)
+    own_client = client is None
+    if own_client:
+        client = create_async_client(concurrency)
+
+    try:
+        date_to = None
+        while True:
+            window = dict(params)
+            if date_to is not None:
+                window["date_to"] = date_to.isoformat()
+            meta, oldest = {}, None
+            async for item in _harvest_window(
+                client, window, per_page, concurrency, stats, meta
+            ):
+                published_at = parse_published_at(item)
+                if published_at and (oldest is None or published_at < oldest):
+                    oldest = published_at
+                yield item
+            if date_to is None:
+                stats["found"] = meta.get("found", 0)
+            if meta.get("found", 0) <= MAX_SEARCH_DEPTH:
+                break
+            if oldest is None or (date_to is not None and oldest >= date_to):
+                stats["truncated"] = True
+                logger.warning(
+                    f"Выдача «{keyword}» обрезана: больше "
+                    f"{MAX_SEARCH_DEPTH} вакансий до {date_to or oldest}"
+                )
+                break
+            date_to = oldest
+    finally:
+        if own_client:
+            await client.aclose()
+
+
+async def fetch_vacancy_details(
+    client: httpx.AsyncClient, vacancy_id: str
+) -> dict:
+    # Карточку запрашивают, когда вакансия изменилась в выдаче, поэтому
+    # свежий по TTL ответ из кэша перепроверяется: на 304 тело берётся
+    # из кэша, иначе приходит новая версия
+    response = await hh_client.call_async(
+        lambda: client.get(
+            f"{BASE_URL}/{vacancy_id}", headers={"Cache-Control": "no-cache"}
+        ),
+        key=hh_client.client_limiter_key(),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_vacancies_details(
+    client: httpx.AsyncClient,
+    vacancy_ids: list[str],
+    concurrency: int = DETAILS_CONCURRENCY,
+) -> dict[str, dict]:
+    """
+    Параллельно скачивает подробные карточки вакансий, не больше
+    ``concurrency`` запросов одновременно. Вакансии, карточку которых
+    получить не удалось, в результат не попадают.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(vacancy_id: str) -> dict | None:
+        async with semaphore:
+            try:
+                return await fetch_vacancy_details(client, vacancy_id)
+            except httpx.HTTPError as error:
+                logger.warning(
+                    f"Не удалось получить вакансию {vacancy_id}: {error}"
+                )
+                return None
+
+    results = await asyncio.gather(*(fetch(i) for i in vacancy_ids))
+    return {
+        vacancy_id: details
+        for vacancy_id, details in zip(vacancy_ids, results)
+        if details is not None
+    }
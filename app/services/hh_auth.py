@@ -1,12 +1,12 @@
 import time
 
-import httpx
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.config import hh_settings
 from app.database import get_db
 from app.models.hh_token import HHToken
+from app.services import hh_client
 
 
 def exchange_code_for_token(code: str) -> dict:
@@ -19,7 +19,12 @@ def exchange_code_for_token(code: str) -> dict:
         "redirect_uri": hh_settings.hh_redirect_uri,
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = httpx.post(token_url, data=data, headers=headers)
+    response = hh_client.call(
+        lambda: hh_client.http_client.post(
+            token_url, data=data, headers=headers
+        ),
+        key=hh_client.client_limiter_key(),
+    )
     if response.status_code != 200:
         error_detail = response.text or "OAuth2 exchange failed"
         raise HTTPException(status_code=400, detail=error_detail)
@@ -39,7 +44,12 @@ def refresh_hh_token(user_id: int, db):
         "client_secret": hh_settings.hh_client_secret,
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = httpx.post(token_url, data=data, headers=headers)
+    response = hh_client.call(
+        lambda: hh_client.http_client.post(
+            token_url, data=data, headers=headers
+        ),
+        key=hh_client.client_limiter_key(),
+    )
     if response.status_code != 200:
         error_detail = response.text or "Failed to refresh token"
         raise HTTPException(status_code=400, detail=error_detail)
@@ -0,0 +1,507 @@
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.config import hh_settings
+from app.logger import logger
+
+USER_AGENT = "job_aggregator/1.0"
+REQUEST_TIMEOUT = 30.0
+
+# Стартовая и предельные скорости запросов (в секунду) на один ключ.
+# hh.ru не публикует лимиты, поэтому скорость подбирается на ходу:
+# растёт понемногу после каждого успешного ответа и резко падает на 429.
+INITIAL_RATE = 5.0
+MIN_RATE = 0.5
+MAX_RATE = 20.0
+BURST = 5
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket, скорость которого подстраивается под ответы hh.ru
+    (аддитивный рост, мультипликативное снижение на 429).
+
+    Потокобезопасен: ``reserve`` резервирует токен под блокировкой и
+    возвращает время ожидания, а ждут вызывающие уже без блокировки,
+    поэтому один экземпляр обслуживает и потоки планировщика, и корутины.
+    """
+
+    def __init__(
+        self,
+        rate: float = INITIAL_RATE,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        capacity: int = BURST,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def refund(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def on_throttled(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(
+                    self._blocked_until, now + retry_after
+                )
+
+
+_limiters: dict[str, AdaptiveTokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str) -> AdaptiveTokenBucket:
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveTokenBucket()
+        return limiter
+
+
+def client_limiter_key() -> str:
+    """Ключ лимита для запросов от имени приложения (client credentials)."""
+    return f"client:{hh_settings.hh_client_id}"
+
+
+def token_limiter_key(access_token: str) -> str:
+    """Ключ лимита для запросов с токеном пользователя."""
+    digest = hashlib.sha256(access_token.encode()).hexdigest()[:16]
+    return f"token:{digest}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Экспоненциальная задержка с полным джиттером, не меньше Retry-After."""
+    ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _from_cache(response) -> bool:
+    extensions = getattr(response, "extensions", None) or {}
+    return bool(extensions.get("from_cache"))
+
+
+def _throttled(response, limiter: AdaptiveTokenBucket, key: str, attempt):
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    limiter.on_throttled(retry_after)
+    delay = backoff_delay(attempt, retry_after)
+    logger.warning(
+        f"hh.ru ответил 429 для {key}: повтор через {delay:.1f} с, "
+        f"скорость снижена до {limiter.rate:.2f} запр/с"
+    )
+    return delay
+
+
+def call(send: Callable[[], object], key: str):
+    """
+    Выполняет запрос к hh.ru с учётом лимита ключа ``key``.
+
+    ``send`` — функция без аргументов, отправляющая запрос и возвращающая
+    ответ (httpx или requests). На 429 запрос повторяется с задержкой,
+    пока не кончатся попытки; последний ответ возвращается как есть.
+    """
+    limiter = get_limiter(key)
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        response = send()
+        if _from_cache(response):
+            # Ответ из кэша до hh.ru не доходил, токен возвращаем
+            limiter.refund()
+            return response
+        if response.status_code != 429:
+            limiter.on_success()
+            return response
+        delay = _throttled(response, limiter, key, attempt)
+        if attempt < MAX_RETRIES:
+            time.sleep(delay)
+    return response
+
+
+async def call_async(send: Callable[[], Awaitable], key: str):
+    """Асинхронный вариант :func:`call`."""
+    limiter = get_limiter(key)
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire_async()
+        response = await send()
+        if _from_cache(response):
+            # Ответ из кэша до hh.ru не доходил, токен возвращаем
+            limiter.refund()
+            return response
+        if response.status_code != 429:
+            limiter.on_success()
+            return response
+        delay = _throttled(response, limiter, key, attempt)
+        if attempt < MAX_RETRIES:
+            # Потоковый ответ держит соединение, пока его не закрыть
+            await response.aclose()
+            await asyncio.sleep(delay)
+    return response
+
+
+# Сколько секунд ответ считается свежим и отдаётся без запроса к hh.ru.
+# Устаревший ответ перепроверяется через If-None-Match / If-Modified-Since,
+# и на 304 тело берётся из кэша. Запрос с Cache-Control: no-cache
+# перепроверяется всегда, даже если ответ в кэше ещё свежий.
+CACHE_TTLS = [
+    (re.compile(r"^/vacancies/?$"), 300),
+    (re.compile(r"^/vacancies/[^/]+$"), 3600),
+    (re.compile(r"^/resumes/mine$"), 60),
+    (re.compile(r"^/resumes/[^/]+/similar_vacancies$"), 300),
+    (re.compile(r"^/resumes/[^/]+$"), 60),
+]
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+
+
+def cache_ttl(path: str) -> int | None:
+    for pattern, ttl in CACHE_TTLS:
+        if pattern.match(path):
+            return ttl
+    return None
+
+
+class CachedResponse:
+    def __init__(self, response: httpx.Response, content: bytes, ttl: int):
+        self.status_code = response.status_code
+        self.headers = list(response.headers.multi_items())
+        self.content = content
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+
+class ResponseCache:
+    """LRU-кэш ответов hh.ru, ограниченный суммарным размером тел."""
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        max_entry_bytes: int = CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: CachedResponse) -> None:
+        if entry.size > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def revalidated(self, key: tuple) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate_owner(self, owner: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == owner]:
+                self.size -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+response_cache = ResponseCache()
+
+
+def _cache_owner(request: httpx.Request) -> str:
+    # Ответы с токеном пользователя кэшируются отдельно для каждого токена
+    authorization = request.headers.get("Authorization", "")
+    if not authorization:
+        return ""
+    return hashlib.sha256(authorization.encode()).hexdigest()[:16]
+
+
+class _CacheLookup:
+    """Общая для sync- и async-транспорта логика кэширования GET."""
+
+    def __init__(self, cache: ResponseCache, request: httpx.Request):
+        self.cache = cache
+        self.request = request
+        self.owner = _cache_owner(request)
+        self.key = (self.owner, str(request.url))
+        self.ttl = None
+        self.entry = None
+        if request.method == "GET":
+            self.ttl = cache_ttl(request.url.path)
+        elif self.owner and request.method in ("POST", "PUT", "DELETE"):
+            # Изменение резюме делает устаревшими кэшированные GET
+            # этого пользователя.
+            cache.invalidate_owner(self.owner)
+
+    @property
+    def cacheable(self) -> bool:
+        return self.ttl is not None
+
+    def cached_response(self) -> httpx.Response | None:
+        self.entry = self.cache.get(self.key)
+        if self.entry is None:
+            return None
+        revalidate = "no-cache" in self.request.headers.get(
+            "Cache-Control", ""
+        )
+        if self.entry.is_fresh() and not revalidate:
+            return self.entry.to_response(self.request)
+        self.request.headers.update(self.entry.conditional_headers())
+        return None
+
+    def not_modified(self, response: httpx.Response) -> bool:
+        return response.status_code == 304 and self.entry is not None
+
+    def from_not_modified(self) -> httpx.Response:
+        self.cache.revalidated(self.key)
+        return self.entry.to_response(self.request)
+
+    def should_store(self, response: httpx.Response) -> bool:
+        if response.status_code != 200:
+            return False
+        has_validators = "ETag" in response.headers or (
+            "Last-Modified" in response.headers
+        )
+        return self.ttl > 0 or has_validators
+
+    def put(self, response: httpx.Response, raw: bytes) -> CachedResponse:
+        entry = CachedResponse(response, raw, self.ttl)
+        self.cache.put(self.key, entry)
+        return entry
+
+    def store(self, response: httpx.Response, raw: bytes) -> httpx.Response:
+        return self.put(response, raw).to_response(self.request)
+
+
+class _TeeStream(httpx.AsyncByteStream):
+    """
+    Отдаёт тело ответа по мере чтения и попутно копит его копию для кэша.
+    Копия сохраняется, только если тело дочитано до конца и не превысило
+    ``max_bytes``; иначе буфер отбрасывается, и память не растёт.
+    """
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_complete: Callable[[bytes], object],
+        max_bytes: int,
+    ):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._max_bytes = max_bytes
+
+    async def __aiter__(self):
+        buffer = bytearray()
+        overflow = False
+        async for chunk in self._stream:
+            if not overflow:
+                buffer.extend(chunk)
+                if len(buffer) > self._max_bytes:
+                    overflow = True
+                    buffer = bytearray()
+            yield chunk
+        if not overflow:
+            self._on_complete(bytes(buffer))
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class CachingTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | None = None,
+        cache: ResponseCache = response_cache,
+    ):
+        self._transport = transport or httpx.HTTPTransport()
+        self._cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        lookup = _CacheLookup(self._cache, request)
+        if not lookup.cacheable:
+            return self._transport.handle_request(request)
+
+        cached = lookup.cached_response()
+        if cached is not None:
+            return cached
+
+        response = self._transport.handle_request(request)
+        if lookup.not_modified(response):
+            response.close()
+            return lookup.from_not_modified()
+        if not lookup.should_store(response):
+            return response
+        # На уровне транспорта тело читается из сырого потока (ещё сжатым),
+        # httpx распакует его уже при чтении ответа из кэша.
+        raw = b"".join(response.stream)
+        response.close()
+        return lookup.store(response, raw)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache = response_cache,
+    ):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._cache = cache
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        lookup = _CacheLookup(self._cache, request)
+        if not lookup.cacheable:
+            return await self._transport.handle_async_request(request)
+
+        cached = lookup.cached_response()
+        if cached is not None:
+            return cached
+
+        response = await self._transport.handle_async_request(request)
+        if lookup.not_modified(response):
+            await response.aclose()
+            return lookup.from_not_modified()
+        if not lookup.should_store(response):
+            return response
+        # Тело не буферизуется целиком: оно отдаётся клиенту потоком,
+        # а в кэш попадает копия, если ответ дочитан до конца.
+        stream = _TeeStream(
+            response.stream,
+            lambda raw: lookup.put(response, raw),
+            self._cache.max_entry_bytes,
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=stream,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# Общий клиент для синхронных запросов к hh.ru (резюме, OAuth)
+http_client = httpx.Client(
+    transport=CachingTransport(),
+    timeout=REQUEST_TIMEOUT,
+    headers={"User-Agent": USER_AGENT},
+)
@@ -0,0 +1,208 @@
+"""
+Справочники hh.ru: дерево регионов, курсы валют и профессиональные роли.
+
+Лидер планировщика раз в сутки скачивает их (refresh_dictionaries) и
+сохраняет компактный снимок в таблицу hh_dictionaries. Каждый процесс
+держит снимок в памяти и перечитывает его, когда он обновился
+(DictionaryReloader), поэтому поиск по справочникам не ходит ни в сеть,
+ни в базу.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.crud.area_closure import rebuild_area_closure
+from app.crud.hh_dictionary import (
+    get_dictionaries,
+    get_dictionaries_version,
+    save_dictionary,
+)
+from app.logger import logger
+from app.services import hh_client
+from app.services.hh_api import HH_API_URL
+
+DICTIONARY_REFRESH_HOURS = 24
+DICTIONARY_RELOAD_SECONDS = 300
+
+
+def _area_order(area_id: str) -> int:
+    return int(area_id) if area_id.isdigit() else 0
+
+
+class Dictionaries:
+    """Неизменяемый набор справочников с поиском за O(1)."""
+
+    def __init__(
+        self,
+        areas: dict | None = None,
+        currencies: dict | None = None,
+        roles: dict | None = None,
+        version: datetime | None = None,
+    ):
+        self.areas = areas or {}  # id -> [название, id родителя]
+        self.currencies = currencies or {}  # код -> единиц валюты в рубле
+        self.roles = roles or {}  # id -> название
+        self.version = version
+        # Одноимённых регионов в дереве несколько, по названию находится
+        # тот, что ближе к корню (у него меньше id)
+        self._area_ids = {}
+        for area_id in sorted(self.areas, key=_area_order, reverse=True):
+            self._area_ids[self.areas[area_id][0].lower()] = area_id
+
+    def area_name(self, area_id: str | int | None) -> str | None:
+        area = self.areas.get(str(area_id))
+        return area[0] if area else None
+
+    def area_parent(self, area_id: str | int | None) -> str | None:
+        area = self.areas.get(str(area_id))
+        return area[1] if area else None
+
+    def area_id(self, name: str | None) -> str | None:
+        return self._area_ids.get(name.lower()) if name else None
+
+    def currency_rate(self, code: str | None) -> float | None:
+        return self.currencies.get(code)
+
+    def role_name(self, role_id: str | int | None) -> str | None:
+        return self.roles.get(str(role_id))
+
+
+_current = Dictionaries()
+
+
+def current() -> Dictionaries:
+    return _current
+
+
+def parse_areas(payload: list) -> dict:
+    areas = {}
+    stack = list(payload)
+    while stack:
+        area = stack.pop()
+        areas[area["id"]] = [area["name"], area.get("parent_id")]
+        stack.extend(area.get("areas") or [])
+    return areas
+
+
+def parse_currencies(payload: dict) -> dict:
+    return {
+        currency["code"]: currency["rate"]
+        for currency in payload.get("currency", [])
+        if currency.get("rate")
+    }
+
+
+def parse_roles(payload: dict) -> dict:
+    return {
+        role["id"]: role["name"]
+        for category in payload.get("categories", [])
+        for role in category.get("roles", [])
+    }
+
+
+# Имя снимка -> (путь в API hh.ru, разбор ответа)
+SOURCES = {
+    "areas": ("/areas", parse_areas),
+    "currencies": ("/dictionaries", parse_currencies),
+    "roles": ("/professional_roles", parse_roles),
+}
+
+
+def fetch_dictionary(path: str):
+    response = hh_client.call(
+        lambda: hh_client.http_client.get(f"{HH_API_URL}{path}"),
+        key=hh_client.client_limiter_key(),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def load_dictionaries(db: Session) -> Dictionaries:
+    """Читает снимок из базы и делает его текущим."""
+    global _current
+    snapshot = {row.name: row for row in get_dictionaries(db)}
+    versions = [row.fetched_at for row in snapshot.values()]
+    _current = Dictionaries(
+        areas=snapshot["areas"].data if "areas" in snapshot else None,
+        currencies=(
+            snapshot["currencies"].data if "currencies" in snapshot else None
+        ),
+        roles=snapshot["roles"].data if "roles" in snapshot else None,
+        version=max(versions) if versions else None,
+    )
+    return _current
+
+
+def reload_if_changed(db: Session) -> bool:
+    version = get_dictionaries_version(db)
+    if version == _current.version:
+        return False
+    load_dictionaries(db)
+    logger.info("Справочники hh.ru перечитаны из базы")
+    return True
+
+
+def refresh_dictionaries(db: Session) -> Dictionaries:
+    """
+    Скачивает справочники с hh.ru и сохраняет снимок. Справочник, который
+    не удалось скачать, остаётся в прежней версии. Вместе с регионами
+    в той же транзакции пересобирается area_closure.
+    """
+    fetched_at = datetime.now(timezone.utc)
+    for name, (path, parse) in SOURCES.items():
+        try:
+            data = parse(fetch_dictionary(path))
+        except Exception as error:
+            logger.warning(f"Не удалось обновить справочник {name}: {error}")
+            continue
+        save_dictionary(db, name, data, fetched_at)
+        if name == "areas":
+            rebuild_area_closure(db, data)
+    db.commit()
+    return load_dictionaries(db)
+
+
+def is_stale(db: Session) -> bool:
+    version = get_dictionaries_version(db)
+    if version is None:
+        return True
+    age = datetime.now(timezone.utc) - version
+    return age > timedelta(hours=DICTIONARY_REFRESH_HOURS)
+
+
+class DictionaryReloader:
+    """Фоновый поток, который подхватывает обновлённый снимок из базы."""
+
+    def __init__(
+        self, session_factory, interval: float = DICTIONARY_RELOAD_SECONDS
+    ):
+        self._session_factory = session_factory
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="dictionary-reloader", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self._interval)
+
+    def poll(self) -> None:
+        db = self._session_factory()
+        try:
+            reload_if_changed(db)
+        except Exception as error:
+            logger.warning(f"Не удалось перечитать справочники: {error}")
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self._interval)
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.crud.sync_watermark import advance_watermark, get_watermark
+from app.crud.vacancy import (
+    LIST_FIELDS,
+    UPSERT_CHUNK_SIZE,
+    commit_vacancy_changes,
+    get_list_fingerprints,
+    upsert_vacancies,
+)
+from app.logger import logger
+from app.schemas import VacancyIngest
+from app.services.hh_api import (
+    create_async_client,
+    fetch_vacancies_details,
+    harvest_vacancies,
+    parse_published_at,
+)
+from app.services.vacancy_formatter import format_hh_vacancy
+
+# Поля элемента выдачи, изменение которых означает, что вакансию
+# отредактировали и подробную карточку нужно перезапросить
+FINGERPRINT_FIELDS = (
+    "name",
+    "salary",
+    "snippet",
+    "schedule",
+    "experience",
+    "employment",
+    "published_at",
+    "archived",
+)
+
+
+def hh_item_to_vacancy(
+    item: dict,
+    details: dict | None = None,
+    list_fingerprint: str | None = None,
+) -> VacancyIngest:
+    return format_hh_vacancy(item, details, list_fingerprint)
+
+
+def list_fingerprint(item: dict) -> str:
+    """Отпечаток вакансии по полям поисковой выдачи."""
+    payload = {field: item.get(field) for field in FINGERPRINT_FIELDS}
+    payload["employer"] = (item.get("employer") or {}).get("name")
+    payload["area"] = (item.get("area") or {}).get("id")
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def search_query_key(**params) -> str:
+    """Стабильный ключ поискового запроса для отметки синхронизации."""
+    filled = {key: value for key, value in params.items() if value is not None}
+    return urlencode(sorted(filled.items()))
+
+
+def _add_counts(totals: dict, counts: dict) -> None:
+    for key, value in counts.items():
+        totals[key] = totals.get(key, 0) + value
+
+
+async def enrich_and_store(
+    db: Session,
+    client: httpx.AsyncClient,
+    items: list[dict],
+    commit: bool = True,
+) -> dict:
+    """
+    Сохраняет батч элементов выдачи, дополняя их подробными карточками.
+
+    Карточки запрашиваются только для новых вакансий и тех, у которых
+    изменился отпечаток выдачи, остальные считаются неизменёнными и не
+    пишутся в базу. Если карточку скачать не удалось, сохраняются поля
+    выдачи, а отпечаток не обновляется: следующий прогон повторит запрос.
+
+    В ``http_seconds`` и ``db_seconds`` возвращается время, потраченное
+    на запросы карточек и на работу с базой.
+    """
+    started = time.perf_counter()
+    fingerprints = {
+        item["alternate_url"]: list_fingerprint(item) for item in items
+    }
+    known = get_list_fingerprints(db, list(fingerprints))
+    fresh = [
+        item
+        for item in items
+        if known.get(item["alternate_url"])
+        != fingerprints[item["alternate_url"]]
+    ]
+    fetch_started = time.perf_counter()
+    details = await fetch_vacancies_details(
+        client, [item["id"] for item in fresh]
+    )
+    fetch_finished = time.perf_counter()
+
+    enriched, plain = [], []
+    for item in fresh:
+        if item["id"] in details:
+            enriched.append(
+                hh_item_to_vacancy(
+                    item,
+                    details[item["id"]],
+                    fingerprints[item["alternate_url"]],
+                )
+            )
+        else:
+            plain.append(hh_item_to_vacancy(item))
+
+    counts = upsert_vacancies(db, enriched, commit=False)
+    _add_counts(
+        counts,
+        upsert_vacancies(db, plain, commit=False, fields=LIST_FIELDS),
+    )
+    counts["unchanged"] += len(items) - len(fresh)
+    counts["enriched"] = len(enriched)
+    if commit:
+        commit_vacancy_changes(
+            db, bool(counts["inserted"] or counts["updated"])
+        )
+    counts["http_seconds"] = fetch_finished - fetch_started
+    counts["db_seconds"] = (fetch_started - started) + (
+        time.perf_counter() - fetch_finished
+    )
+    return counts
+
+
+async def ingest_vacancies(
+    db: Session,
+    keyword: str,
+    area: int | None = None,
+    batch_size: int = UPSERT_CHUNK_SIZE,
+    incremental: bool = True,
+    professional_role: str | None = None,
+    schedule: str | None = None,
+    totals: dict | None = None,
+) -> dict:
+    """
+    Забирает выдачу hh.ru потоком и сохраняет её батчами через
+    enrich_and_store. Возвращает суммарные счётчики по всем батчам:
+    результаты записи, число страниц, ошибок и вакансий в выдаче, а также
+    время ожидания hh.ru (``http_seconds``) и базы (``db_seconds``).
+
+    Счётчики копятся в ``totals`` (если передан) по мере записи батчей:
+    при исключении в нём остаются итоги уже закоммиченных батчей.
+
+    В инкрементальном режиме запрашиваются только вакансии, опубликованные
+    после отметки прошлого прогона. Отметка сдвигается в одной транзакции
+    с последним батчем и только если все страницы скачались без ошибок
+    и выдача получена целиком (большая выдача обходится окнами по дате
+    публикации, см. harvest_vacancies), иначе следующий прогон повторит
+    тот же интервал.
+    """
+    filters = {
+        "area": area,
+        "professional_role": professional_role,
+        "schedule": schedule,
+    }
+    query_key = search_query_key(text=keyword, **filters)
+    watermark = get_watermark(db, query_key) if incremental else None
+    date_from = watermark.last_published_at if watermark else None
+    run_at = datetime.now(timezone.utc)
+
+    if totals is None:
+        totals = {}
+    totals.update(
+        {
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "enriched": 0,
+            "items": 0,
+            "http_seconds": 0.0,
+            "db_seconds": 0.0,
+        }
+    )
+    latest_published_at = None
+    batch = []
+
+    async with create_async_client() as client:
+        # Время между элементами выдачи — ожидание страниц hh.ru
+        waiting_since = time.perf_counter()
+        async for item in harvest_vacancies(
+            keyword,
+            client=client,
+            date_from=date_from,
+            stats=totals,
+            **filters,
+        ):
+            totals["http_seconds"] += time.perf_counter() - waiting_since
+            totals["items"] += 1
+            published_at = parse_published_at(item)
+            if published_at and (
+                latest_published_at is None
+                or published_at > latest_published_at
+            ):
+                latest_published_at = published_at
+
+            batch.append(item)
+            if len(batch) >= batch_size:
+                counts = await enrich_and_store(db, client, batch)
+                logger.debug(f"Сохранён батч вакансий: {counts}")
+                _add_counts(totals, counts)
+                batch = []
+            waiting_since = time.perf_counter()
+
+        last_batch = await enrich_and_store(db, client, batch, commit=False)
+
+    commit_started = time.perf_counter()
+    if totals["errors"]:
+        logger.warning(
+            f"Отметка для {query_key} не сдвинута: "
+            f"{totals['errors']} страниц не скачано"
+        )
+    elif totals["truncated"]:
+        # Часть выдачи не получена: со сдвинутой отметкой она бы уже
+        # не попала ни в один прогон
+        logger.warning(
+            f"Отметка для {query_key} не сдвинута: выдача обрезана "
+            "глубиной поиска hh.ru"
+        )
+    else:
+        advance_watermark(db, query_key, latest_published_at, run_at)
+    commit_vacancy_changes(
+        db, bool(last_batch["inserted"] or last_batch["updated"])
+    )
+    # Последний батч учитывается только после коммита
+    _add_counts(totals, last_batch)
+    totals["db_seconds"] += time.perf_counter() - commit_started
+
+    return totals
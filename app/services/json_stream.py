@@ -0,0 +1,122 @@
+import json
+from typing import AsyncIterator
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class _NeedMore(Exception):
+    """В буфере пока нет целого JSON-значения."""
+
+
+class ItemsParser:
+    """
+    Инкрементальный разбор JSON-объекта вида ``{"items": [...], ...}``.
+
+    Текст подаётся кусками через :meth:`feed`, который возвращает элементы
+    массива ``key``, целиком попавшие в буфер. В памяти держится только
+    недочитанный хвост, а не весь ответ. Остальные поля верхнего уровня
+    (``pages``, ``found`` и т.п.) собираются в :attr:`meta`.
+    """
+
+    def __init__(self, key: str = "items"):
+        self.key = key
+        self.meta = {}
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._field = None
+
+    def feed(self, text: str, final: bool = False) -> list:
+        self._buffer += text
+        items = []
+        try:
+            while self._state != "done":
+                self._step(items, final)
+        except _NeedMore:
+            if final:
+                raise json.JSONDecodeError(
+                    "Неожиданный конец JSON", self._buffer, self._pos
+                )
+        # Разобранное начало буфера больше не нужно
+        consumed = self._pos
+        self._buffer = self._buffer[consumed:]
+        self._pos = 0
+        return items
+
+    def close(self) -> list:
+        return self.feed("", final=True)
+
+    def _skip(self, pos: int, chars: str) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in chars:
+            pos += 1
+        if pos == len(self._buffer):
+            raise _NeedMore
+        return pos
+
+    def _expect(self, pos: int, char: str) -> None:
+        if self._buffer[pos] != char:
+            raise json.JSONDecodeError(
+                f"Ожидался символ {char!r}", self._buffer, pos
+            )
+
+    def _decode(self, pos: int, final: bool):
+        try:
+            value, end = _decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            raise _NeedMore
+        # Число в самом конце буфера может продолжиться в следующем куске
+        is_number = isinstance(value, (int, float)) and not isinstance(
+            value, bool
+        )
+        if is_number and end == len(self._buffer) and not final:
+            raise _NeedMore
+        return value, end
+
+    def _step(self, items: list, final: bool) -> None:
+        if self._state == "start":
+            pos = self._skip(self._pos, _WHITESPACE)
+            self._expect(pos, "{")
+            self._pos, self._state = pos + 1, "field"
+        elif self._state == "field":
+            pos = self._skip(self._pos, _WHITESPACE + ",")
+            if self._buffer[pos] == "}":
+                self._pos, self._state = pos + 1, "done"
+                return
+            field, end = self._decode(pos, final)
+            pos = self._skip(end, _WHITESPACE)
+            self._expect(pos, ":")
+            self._field = field
+            self._pos = pos + 1
+            self._state = "array" if field == self.key else "value"
+        elif self._state == "value":
+            pos = self._skip(self._pos, _WHITESPACE)
+            self.meta[self._field], self._pos = self._decode(pos, final)
+            self._state = "field"
+        elif self._state == "array":
+            pos = self._skip(self._pos, _WHITESPACE)
+            self._expect(pos, "[")
+            self._pos, self._state = pos + 1, "item"
+        elif self._state == "item":
+            pos = self._skip(self._pos, _WHITESPACE + ",")
+            if self._buffer[pos] == "]":
+                self._pos, self._state = pos + 1, "field"
+                return
+            item, self._pos = self._decode(pos, final)
+            items.append(item)
+
+
+async def iter_items(
+    chunks: AsyncIterator[str], meta: dict | None = None, key: str = "items"
+) -> AsyncIterator:
+    """Отдаёт элементы массива ``key`` по мере чтения текста ответа."""
+    parser = ItemsParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+    if meta is not None:
+        meta.update(parser.meta)
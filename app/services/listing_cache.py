@@ -0,0 +1,116 @@
+"""
+Кэш ответов GET /vacancies/ в памяти процесса.
+
+Главная страница и популярные фильтры запрашиваются постоянно, а данные
+меняются только при записи. Кэш хранит готовое JSON-тело ответа по
+нормализованным параметрам запроса, ограничен числом записей (LRU) и
+временем жизни. Запись в вакансии увеличивает поколение кэша, и все
+записи прежних поколений перестают отдаваться.
+
+Роут добавляет в ключ номер изменения таблицы vacancies из базы
+(table_generations), поэтому записи из других процессов (сбор вакансий на
+лидере, другие воркеры) тоже сразу делают старые записи недостижимыми;
+они вытесняются по LRU или TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+LISTING_CACHE_SIZE = 512
+LISTING_CACHE_TTL = 30  # секунд
+COUNT_CACHE_TTL = 60  # секунд
+
+
+class CachedListing:
+    def __init__(self, body: bytes, headers: dict, generation: int):
+        self.body = body
+        self.headers = headers
+        self.generation = generation
+        self.stored_at = time.monotonic()
+
+
+class ListingCache:
+    def __init__(
+        self, max_entries: int = LISTING_CACHE_SIZE, ttl=LISTING_CACHE_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, CachedListing] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CachedListing | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.generation != self.generation
+                or time.monotonic() - entry.stored_at >= self.ttl
+            ):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, key: tuple, body: bytes, headers: dict, generation: int
+    ) -> None:
+        """
+        ``generation`` берётся до запроса в базу: если за время запроса
+        вакансии изменились, ответ сохранится уже устаревшим и не отдастся.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = CachedListing(body, headers, generation)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+listing_cache = ListingCache()
+# Заголовки X-Total-Count для режима count=cached. Запись в вакансии его не
+# сбрасывает: число может отставать от таблицы на COUNT_CACHE_TTL, зато
+# COUNT(*) не пересчитывается после каждого пакета сбора
+count_cache = ListingCache(ttl=COUNT_CACHE_TTL)
+
+
+def listing_key(**params) -> tuple:
+    """
+    Ключ кэша: параметры без пустых значений в фиксированном порядке.
+    Фильтры по подстроке регистронезависимы, поэтому приводятся к нижнему
+    регистру.
+    """
+    normalized = []
+    for name, value in sorted(params.items()):
+        if value is None or value == "":
+            continue
+        if name in ("title", "company", "location"):
+            value = value.lower()
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+def invalidate_listings() -> None:
+    listing_cache.invalidate()
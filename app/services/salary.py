@@ -0,0 +1,67 @@
+# app/services/salary.py
+from app.schemas.vacancy import SALARY_MAX
+from app.services import hh_dictionaries
+
+# Курсы в формате справочника hh.ru: сколько единиц валюты в одном рубле.
+# Используются, чтобы привести зарплаты к рублям для фильтрации
+# и сортировки, пока справочник валют ещё не загружен, и в миграции,
+# заполнившей колонки зарплаты.
+CURRENCY_RATES = {
+    "RUR": 1.0,
+    "USD": 0.0112,
+    "EUR": 0.0103,
+    "KZT": 5.48,
+    "BYR": 0.0367,
+    "UAH": 0.463,
+    "UZS": 138.0,
+    "AZN": 0.019,
+    "GEL": 0.0303,
+    "KGS": 0.98,
+}
+
+
+def to_rub(amount: float, currency: str | None) -> int | None:
+    currency = currency or "RUR"
+    dictionaries = hh_dictionaries.current()
+    rate = dictionaries.currency_rate(currency) or CURRENCY_RATES.get(currency)
+    if not rate:
+        return None
+    rub = round(amount / rate)
+    # Сумма вне integer-колонки salary_mid_rub не сохраняется
+    return rub if rub <= SALARY_MAX else None
+
+
+def _bound(value) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not 0 <= value <= SALARY_MAX:
+        return None
+    return round(value)
+
+
+def salary_columns(salary: dict | None) -> dict:
+    """
+    Раскладывает зарплату hh.ru (``{"from", "to", "currency", "gross"}``)
+    по типизированным колонкам вакансии.
+
+    ``salary_mid_rub`` — середина вилки (или её единственная граница)
+    в рублях; до вычета налогов или после, как указал работодатель.
+    """
+    salary = salary if isinstance(salary, dict) else {}
+    # Значения неподходящего типа не попадают в колонки: API проверяет
+    # зарплату схемой Salary, но в salary могут быть и старые данные
+    salary_from = _bound(salary.get("from"))
+    salary_to = _bound(salary.get("to"))
+    currency = salary.get("currency")
+    if not (isinstance(currency, str) and len(currency) == 3):
+        currency = None
+    gross = salary.get("gross")
+    bounds = [value for value in (salary_from, salary_to) if value]
+    mid = sum(bounds) / len(bounds) if bounds else None
+    return {
+        "salary_from": salary_from,
+        "salary_to": salary_to,
+        "salary_currency": currency,
+        "salary_gross": gross if isinstance(gross, bool) else None,
+        "salary_mid_rub": to_rub(mid, currency) if mid else None,
+    }
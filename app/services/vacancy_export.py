@@ -0,0 +1,101 @@
+"""
+Потоковая выгрузка вакансий в NDJSON и CSV.
+
+Строки читаются серверным курсором порциями по EXPORT_BATCH_SIZE в
+порядке id и сразу отдаются клиенту, поэтому память не зависит от объёма
+выгрузки. Прерванную выгрузку можно продолжить с after_id = id последней
+полученной строки.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.crud.vacancy import iter_vacancies_export
+from app.models import Vacancy
+from app.schemas import VacancyRead
+
+EXPORT_BATCH_SIZE = 1000
+# Поля выгрузки совпадают с ответом GET /vacancies/, id идёт первым
+EXPORT_FIELDS = ("id",) + tuple(
+    field for field in VacancyRead.model_fields if field != "id"
+)
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_rows(
+    bind,
+    since: datetime | None = None,
+    after_id: int | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    **filters,
+) -> Iterator[dict]:
+    """
+    Строки выгрузки. Сессия открывается здесь, а не берётся из запроса:
+    ответ отдаётся уже после того, как сессия запроса закрыта.
+    """
+    columns = [getattr(Vacancy, field) for field in EXPORT_FIELDS]
+    with Session(bind) as db:
+        rows = iter_vacancies_export(
+            db, columns, since, after_id, batch_size, **filters
+        )
+        for row in rows:
+            yield row._asdict()
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def to_ndjson(
+    rows: Iterable[dict], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    for batch in _batched(rows, batch_size):
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+            for row in batch
+        ).encode()
+
+
+def to_csv(
+    rows: Iterable[dict], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in _batched(rows, batch_size):
+        for row in batch:
+            writer.writerow([_csv_value(value) for value in row.values()])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -1,16 +1,55 @@
 # app/services/vacancy_formatter.py
-from app.schemas import VacancyCreate
+from app.schemas import VacancyCreate, VacancyIngest
+from app.services import hh_dictionaries
+
+
+def _name(value: dict | None) -> str | None:
+    return value.get("name") if value else None
+
+
+def _location(area: dict | None) -> str:
+    # Название берём из справочника регионов, если он загружен
+    area = area or {}
+    return (
+        hh_dictionaries.current().area_name(area.get("id"))
+        or area.get("name")
+        or "N/A"
+    )
+
+
+def _area_id(area: dict | None) -> int | None:
+    area_id = str((area or {}).get("id") or "")
+    return int(area_id) if area_id.isdigit() else None
+
+
+def format_hh_vacancy(
+    item: dict,
+    details: dict | None = None,
+    list_fingerprint: str | None = None,
+) -> VacancyIngest:
+    # Подробная карточка /vacancies/{id} содержит все поля элемента
+    # выдачи, поэтому при её наличии берём данные из неё
+    source = details or item
+    return VacancyIngest(
+        title=source["name"],
+        company=(source.get("employer") or {}).get("name") or "N/A",
+        location=_location(source.get("area")),
+        area_id=_area_id(source.get("area")),
+        url=source["alternate_url"],
+        salary=source.get("salary"),
+        source="hh.ru",
+        description=details.get("description") if details else None,
+        key_skills=(
+            [skill["name"] for skill in details.get("key_skills", [])]
+            if details
+            else None
+        ),
+        experience=_name(source.get("experience")),
+        employment=_name(source.get("employment")),
+        schedule=_name(source.get("schedule")),
+        list_fingerprint=list_fingerprint,
+    )
 
 
 def format_hh_vacancies(data: dict) -> list[VacancyCreate]:
-    return [
-        VacancyCreate(
-            title=v["name"],
-            company=v.get("employer", {}).get("name"),
-            location=v.get("area", {}).get("name"),
-            url=v["alternate_url"],
-            salary=v.get("salary"),
-            source="hh.ru",
-        )
-        for v in data.get("items", [])
-    ]
+    return [format_hh_vacancy(v) for v in data.get("items", [])]
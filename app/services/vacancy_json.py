@@ -0,0 +1,51 @@
+"""
+JSON списка вакансий прямо из строк запроса.
+
+Выдача выбирает только запрошенные колонки и сериализует кортежи без
+ORM-объектов и без повторной проверки через VacancyRead: данные прошли
+её при записи. Результат совпадает с тем, что отдал бы Pydantic:
+компактный JSON в UTF-8, дата в ISO 8601 с Z для UTC.
+"""
+
+import json
+from datetime import datetime
+
+from app.schemas import VacancyRead
+
+# Поля ответа GET /vacancies/ в порядке VacancyRead
+LISTING_FIELDS = tuple(VacancyRead.model_fields)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=_json_default
+)
+
+
+def parse_fields(fields: str | None) -> tuple:
+    """
+    Поля из параметра ``fields=title,company`` в порядке LISTING_FIELDS.
+    ValueError, если среди них есть неизвестные.
+    """
+    requested = {field.strip() for field in (fields or "").split(",")}
+    requested.discard("")
+    if not requested:
+        return LISTING_FIELDS
+    unknown = requested - set(LISTING_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in LISTING_FIELDS if field in requested)
+
+
+def dump_rows(rows, fields: tuple) -> bytes:
+    """
+    Строки — кортежи, первые колонки которых идут в порядке ``fields``
+    (лишние колонки в конце, например ключ курсора, отбрасываются).
+    """
+    return _encoder.encode([dict(zip(fields, row)) for row in rows]).encode()
@@ -9,6 +9,8 @@ from app.database import Base
 
 # Import all models so Alembic can detect them
 from app.models import HHToken, User, Vacancy  # noqa: F401
+from app.models.vacancy import TRIGRAM_INDEXES
+from app.models.vacancy_facet import FACET_TRIGRAM_INDEXES
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,6 +28,18 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Индексы pg_trgm живут только в миграциях (см. TRIGRAM_INDEXES)
+    if type_ == "index" and (
+        name in TRIGRAM_INDEXES or name in FACET_TRIGRAM_INDEXES
+    ):
+        return False
+    # Копии дубликатов, удалённых миграцией 5d2c81a7e4b3, моделью не описаны
+    if type_ == "table" and reflected and name == "vacancies_url_duplicates":
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -70,7 +85,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,74 @@
+"""add unique index ix_vacancies_url
+
+Перед созданием уникального индекса из vacancies удаляются дубликаты по
+url: для каждого url остаётся самая ранняя запись (наименьший id), а все
+более поздние удаляются. Удалённые строки не теряются молча: они
+копируются в таблицу vacancies_url_duplicates, их id пишутся в лог
+миграции. Таблицу можно удалить вручную после проверки, а downgrade
+возвращает строки из неё в vacancies.
+
+Revision ID: 5d2c81a7e4b3
+Revises: 73f66cb8617e
+Create Date: 2026-01-10 18:42:05.114273
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2c81a7e4b3"
+down_revision: Union[str, Sequence[str], None] = "73f66cb8617e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+DUPLICATES_TABLE = "vacancies_url_duplicates"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.execute(
+        f"""
+        CREATE TABLE {DUPLICATES_TABLE} AS
+        SELECT newer.* FROM vacancies AS newer
+        WHERE EXISTS (
+            SELECT 1 FROM vacancies AS older
+            WHERE older.url = newer.url AND older.id < newer.id
+        )
+        """
+    )
+    removed = bind.execute(
+        sa.text(f"SELECT id, url FROM {DUPLICATES_TABLE} ORDER BY id")
+    ).all()
+    if not removed:
+        op.execute(f"DROP TABLE {DUPLICATES_TABLE}")
+    else:
+        logger.warning(
+            f"Удалено {len(removed)} вакансий-дубликатов по url, "
+            f"копии сохранены в {DUPLICATES_TABLE}"
+        )
+        for vacancy_id, url in removed:
+            logger.warning(f"Дубликат удалён: id={vacancy_id} url={url}")
+        op.execute(
+            f"DELETE FROM vacancies WHERE id IN "
+            f"(SELECT id FROM {DUPLICATES_TABLE})"
+        )
+    op.create_index(
+        op.f("ix_vacancies_url"), "vacancies", ["url"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_vacancies_url"), table_name="vacancies")
+    if sa.inspect(op.get_bind()).has_table(DUPLICATES_TABLE):
+        op.execute(
+            f"INSERT INTO vacancies SELECT * FROM {DUPLICATES_TABLE}"
+        )
+        op.execute(f"DROP TABLE {DUPLICATES_TABLE}")
@@ -0,0 +1,107 @@
+"""prune empty vacancy facet counts
+
+Триггеры свёртки фасетов теперь удаляют строки, в которых число вакансий
+дошло до нуля, а уже накопившиеся такие строки удаляются здесь. Для
+фильтров фасетов по подстроке (ILIKE) добавлены индексы pg_trgm.
+
+Revision ID: c1ae1944e431
+Revises: f65848be319e
+Create Date: 2026-10-18 12:43:54.644594
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1ae1944e431"
+down_revision: Union[str, Sequence[str], None] = "f65848be319e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Как в app.models.vacancy_facet на момент миграции
+COLUMNS = "company, location, area_id, source, salary_band"
+SALARY_BAND = (
+    "CASE WHEN salary_mid_rub >= 300000 THEN 300000 "
+    "WHEN salary_mid_rub >= 200000 THEN 200000 "
+    "WHEN salary_mid_rub >= 150000 THEN 150000 "
+    "WHEN salary_mid_rub >= 100000 THEN 100000 "
+    "WHEN salary_mid_rub >= 50000 THEN 50000 "
+    "WHEN salary_mid_rub >= 0 THEN 0 END"
+)
+TRIGGERS = {
+    "insert": {"new_rows": 1},
+    "update": {"new_rows": 1, "old_rows": -1},
+    "delete": {"old_rows": -1},
+}
+# Колонка -> индекс, как в app.models.vacancy_facet.FACET_TRIGRAM_INDEXES
+INDEXES = {
+    "company": "ix_vacancy_facet_counts_company_trgm",
+    "location": "ix_vacancy_facet_counts_location_trgm",
+}
+
+
+def replace_functions(prune: bool) -> None:
+    for operation, sources in TRIGGERS.items():
+        delta = " UNION ALL ".join(
+            "SELECT company, location, area_id, source, "
+            f"{SALARY_BAND} AS salary_band, {sign} AS delta FROM {table}"
+            for table, sign in sources.items()
+        )
+        upsert = f"""
+            INSERT INTO vacancy_facet_counts AS facet ({COLUMNS}, vacancies)
+            SELECT {COLUMNS}, sum(delta) FROM ({delta}) AS changes
+            GROUP BY {COLUMNS} HAVING sum(delta) <> 0 ORDER BY {COLUMNS}
+            ON CONFLICT ({COLUMNS}) DO UPDATE
+            SET vacancies = facet.vacancies + excluded.vacancies
+        """
+        if prune:
+            # Удаляются только строки, обновлённые этим же оператором
+            body = f"""
+                WITH changed AS ({upsert} RETURNING id, vacancies)
+                SELECT array_agg(id) INTO emptied FROM changed
+                WHERE vacancies <= 0;
+                DELETE FROM vacancy_facet_counts
+                WHERE id = ANY(emptied) AND vacancies <= 0;
+            """
+        else:
+            body = f"{upsert};"
+        op.execute(
+            f"CREATE OR REPLACE FUNCTION vacancy_facets_{operation}() "
+            "RETURNS trigger LANGUAGE plpgsql AS $$ "
+            f"DECLARE emptied integer[]; BEGIN {body} RETURN NULL; END $$"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    replace_functions(prune=True)
+    op.execute("DELETE FROM vacancy_facet_counts WHERE vacancies <= 0")
+    with op.get_context().autocommit_block():
+        for column, name in INDEXES.items():
+            op.create_index(
+                name,
+                "vacancy_facet_counts",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES.values():
+            op.drop_index(
+                name,
+                table_name="vacancy_facet_counts",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    replace_functions(prune=False)
@@ -0,0 +1,57 @@
+"""trigram indexes
+
+Revision ID: c31a1cabdd8f
+Revises: ebfd0db596bb
+Create Date: 2026-10-18 11:30:07.656965
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c31a1cabdd8f"
+down_revision: Union[str, Sequence[str], None] = "ebfd0db596bb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Колонка -> индекс, как в app.models.vacancy.TRIGRAM_INDEXES
+INDEXES = {
+    "title": "ix_vacancies_title_trgm",
+    "company": "ix_vacancies_company_trgm",
+    "location": "ix_vacancies_location_trgm",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY не блокирует запись в большую таблицу, но не работает
+    # внутри транзакции
+    with op.get_context().autocommit_block():
+        for column, name in INDEXES.items():
+            op.create_index(
+                name,
+                "vacancies",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES.values():
+            op.drop_index(
+                name,
+                table_name="vacancies",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк фильтров по подстроке (title, company, location) на большой
+таблице вакансий.
+
+Создаёт схему bench с копией таблицы vacancies (со всеми индексами, в том
+числе триграммными), заполняет её синтетическими строками и выполняет
+первую страницу выдачи настоящим кодом (list_vacancies_page) дважды:
+с индексами pg_trgm и без них (индексы удаляются в транзакции, которая
+затем откатывается). Для каждого фильтра печатает медиану времени и узлы
+плана, которыми читается таблица.
+
+    python scripts/bench_filters.py --rows 3000000
+    python scripts/bench_filters.py --rows 3000000 --keep  # не удалять bench
+
+Нужна база из настроек приложения с применёнными миграциями
+(в том числе с расширением pg_trgm).
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.crud.vacancy import list_vacancies_page  # noqa: E402
+from app.database import engine  # noqa: E402
+
+SCHEMA = "bench"
+# Фильтр -> подстрока: от редкой до частой
+CASES = [
+    ("title", "7f3a"),
+    ("title", "kotlin"),
+    ("company", "Компания 4242"),
+    ("location", "Новосиб"),
+    ("location", "Москва"),
+]
+
+
+def populate(connection, rows: int) -> None:
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {SCHEMA}.vacancies "
+            "(LIKE public.vacancies INCLUDING ALL)"
+        )
+    )
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO {SCHEMA}.vacancies
+                (title, company, location, url, source, created_at)
+            SELECT
+                (ARRAY['Python', 'Java', 'Go', 'Kotlin', 'Frontend'])
+                    [1 + i % 5] || ' разработчик '
+                    || substr(md5(i::text), 1, 8),
+                'Компания ' || i % 50000,
+                (ARRAY['Москва', 'Санкт-Петербург', 'Минск', 'Казань',
+                       'Новосибирск', 'Екатеринбург', 'Алматы'])[1 + i % 7],
+                'https://bench.local/vacancy/' || i,
+                'bench',
+                now() - make_interval(secs => i)
+            FROM generate_series(1, :rows) AS i
+            """
+        ),
+        {"rows": rows},
+    )
+    connection.execute(text(f"ANALYZE {SCHEMA}.vacancies"))
+
+
+def scan_nodes(plan: dict) -> str:
+    nodes = []
+
+    def walk(node):
+        if "Relation Name" in node or "Index Name" in node:
+            nodes.append(
+                f"{node['Node Type']} {node.get('Index Name', '')}".strip()
+            )
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return ", ".join(nodes)
+
+
+def drop_trigram_indexes(db: Session) -> None:
+    # У копии таблицы свои имена индексов, ищем их по классу операторов
+    names = db.execute(
+        text(
+            "SELECT indexname FROM pg_indexes "
+            "WHERE schemaname = :schema AND indexdef LIKE '%gin_trgm_ops%'"
+        ),
+        {"schema": SCHEMA},
+    ).scalars()
+    for name in list(names):
+        db.execute(text(f'DROP INDEX {SCHEMA}."{name}"'))
+
+
+def measure(db: Session, field: str, value: str, repeat: int, limit: int):
+    connection = db.connection()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    timings = []
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list_vacancies_page(db, "created_at", limit, **{field: value})
+            timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    statement, parameters = statements[-1]
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    ).scalar()
+    return statistics.median(timings) * 1000, scan_nodes(plan[0])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк фильтров")
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--keep", action="store_true", help="не удалять схему bench"
+    )
+    parser.add_argument(
+        "--reuse", action="store_true", help="взять уже заполненную bench"
+    )
+    args = parser.parse_args(argv)
+
+    with engine.begin() as connection:
+        installed = connection.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar()
+        if not installed:
+            sys.exit("Расширение pg_trgm не установлено: alembic upgrade head")
+        if not args.reuse:
+            print(f"🧪 Заполняем {SCHEMA}.vacancies: {args.rows} строк...")
+            started = time.perf_counter()
+            populate(connection, args.rows)
+            print(f"   готово за {time.perf_counter() - started:.1f} с")
+
+    try:
+        for field, value in CASES:
+            for mode in ("pg_trgm", "без pg_trgm"):
+                with Session(engine) as db:
+                    # Запросы модели Vacancy уходят в bench.vacancies;
+                    # сессия закрывается без коммита, индексы вернутся
+                    db.execute(
+                        text(f"SET LOCAL search_path = {SCHEMA}, public")
+                    )
+                    if mode == "без pg_trgm":
+                        drop_trigram_indexes(db)
+                    elapsed, plan = measure(
+                        db, field, value, args.repeat, args.limit
+                    )
+                print(
+                    f"{field}={value!r:18} {mode:11} "
+                    f"{elapsed:9.1f} мс  {plan}"
+                )
+    finally:
+        if not args.keep:
+            with engine.begin() as connection:
+                connection.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
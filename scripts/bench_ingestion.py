@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сбора вакансий: job_fetch_vacancies → Postgres на заглушке hh.ru.
+
+По умолчанию поднимает синтетическую заглушку (scripts/hh_stub.py) в том
+же процессе, создаёт временный поисковый запрос и несколько раз запускает
+задание планировщика. Для каждого прогона печатает вакансий в секунду и
+разбивку времени из журнала ingestion_runs. Первый прогон наполняет
+базу, последующие показывают стоимость повторного прохода без изменений.
+
+    python scripts/bench_ingestion.py --found 2000 --latency-ms 30 --runs 3
+    python scripts/bench_ingestion.py --hh-api-url http://127.0.0.1:8090
+
+Нужна база из настроек приложения (DATABASE_URL или POSTGRES_*) с
+применёнными миграциями.
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(args: argparse.Namespace) -> str:
+    from hh_stub import app_from_args, build_parser
+
+    port = free_port()
+    stub_args = build_parser().parse_args(
+        [
+            "synthetic",
+            "--port",
+            str(port),
+            "--found",
+            str(args.found),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--error-rate",
+            str(args.error_rate),
+            "--throttle-rate",
+            str(args.throttle_rate),
+            "--seed",
+            "1",
+        ]
+    )
+    config = uvicorn.Config(
+        app_from_args(stub_args),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Бенчмарк сбора вакансий")
+    parser.add_argument(
+        "--hh-api-url", help="адрес уже запущенной заглушки hh.ru"
+    )
+    parser.add_argument("--text", default="Python")
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--found", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=200.0,
+        help="лимит запросов в секунду к заглушке",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="не удалять собранные данные"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    url = args.hh_api_url or start_stub(args)
+    # Адрес hh.ru читается из настроек при импорте модулей приложения
+    os.environ["HH_API_URL"] = url
+    os.environ.setdefault("HH_CLIENT_ID", "bench")
+    os.environ.setdefault("HH_CLIENT_SECRET", "bench")
+    os.environ.setdefault("HH_REDIRECT_URI", "http://localhost/callback")
+
+    from app.database import SessionLocal
+    from app.models import (
+        IngestionRun,
+        SearchDefinition,
+        SyncWatermark,
+        Vacancy,
+    )
+    from app.scheduler import job_fetch_vacancies
+    from app.services import hh_client
+    from app.services.ingestion import search_query_key
+
+    # Заглушке не нужен щадящий лимит hh.ru
+    limiter = hh_client.get_limiter(hh_client.client_limiter_key())
+    limiter.rate = limiter.max_rate = args.rate
+    limiter.capacity = max(int(args.rate), 1)
+
+    query_key = search_query_key(text=args.text)
+    db = SessionLocal()
+    definition = SearchDefinition(text=args.text, is_active=True)
+    db.add(definition)
+    db.commit()
+    print(f"🧪 hh.ru: {url}, вакансий в выдаче: {args.found}")
+
+    try:
+        for number in range(1, args.runs + 1):
+            # Инкрементальная отметка сдвигается после прогона; для
+            # честного сравнения каждый прогон читает выдачу целиком
+            db.query(SyncWatermark).filter(
+                SyncWatermark.query_key == query_key
+            ).delete()
+            db.commit()
+            hh_client.response_cache.clear()
+
+            started = time.perf_counter()
+            job_fetch_vacancies(definition.id)
+            elapsed = time.perf_counter() - started
+
+            run = (
+                db.query(IngestionRun)
+                .filter(IngestionRun.search_definition_id == definition.id)
+                .order_by(IngestionRun.id.desc())
+                .first()
+            )
+            print(
+                f"Прогон {number}: {run.status}, {elapsed:.2f} с, "
+                f"{run.items_seen / elapsed:.0f} вакансий/с "
+                f"(страниц {run.pages}, ошибок {run.page_errors}, "
+                f"добавлено {run.inserted}, обновлено {run.updated}, "
+                f"пропущено {run.skipped}, карточек {run.enriched}; "
+                f"hh.ru {run.http_seconds:.2f} с, БД {run.db_seconds:.2f} с)"
+            )
+    finally:
+        if not args.keep:
+            db.query(Vacancy).filter(Vacancy.url.like(f"{url}/%")).delete(
+                synchronize_session=False
+            )
+            db.query(IngestionRun).filter(
+                IngestionRun.search_definition_id == definition.id
+            ).delete()
+            db.query(SyncWatermark).filter(
+                SyncWatermark.query_key == query_key
+            ).delete()
+            db.delete(definition)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка API hh.ru для офлайн-бенчмарков сбора вакансий.
+
+Режимы:
+  record     проксирует запросы в api.hh.ru и сохраняет ответы на диск
+  replay     отдаёт ранее записанные ответы
+  synthetic  генерирует выдачу и карточки вакансий любого объёма
+
+Во всех режимах можно добавить задержку, ошибки 5xx и ответы 429.
+Приложение направляется на заглушку переменной HH_API_URL:
+
+    python scripts/hh_stub.py synthetic --found 2000 --latency-ms 50
+    HH_API_URL=http://127.0.0.1:8090 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+DEFAULT_UPSTREAM = "https://api.hh.ru"
+DEFAULT_DATA_DIR = Path("scripts/hh_recordings")
+# Заголовки ответа, которые сохраняются при записи
+RECORDED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+@dataclass
+class FaultProfile:
+    """Помехи, которые заглушка добавляет к каждому ответу."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    seed: int | None = None
+
+    def __post_init__(self):
+        self.random = random.Random(self.seed)
+
+    async def apply(self) -> Response | None:
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            return JSONResponse(
+                {"errors": [{"type": "too_many_requests"}]},
+                status_code=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if roll < self.throttle_rate + self.error_rate:
+            return JSONResponse(
+                {"errors": [{"type": "stub_error"}]}, status_code=503
+            )
+        return None
+
+
+class Recordings:
+    """Ответы hh.ru на диске: по файлу на метод, путь и параметры."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def path(self, method: str, path: str, query: str) -> Path:
+        params = "&".join(sorted(query.split("&"))) if query else ""
+        key = f"{method} {path}?{params}"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def load(self, method: str, path: str, query: str) -> dict | None:
+        file = self.path(method, path, query)
+        if not file.exists():
+            return None
+        return json.loads(file.read_text(encoding="utf-8"))
+
+    def save(
+        self, method: str, path: str, query: str, response: httpx.Response
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Токены и cookies не сохраняем: записи можно класть в репозиторий
+        record = {
+            "method": method,
+            "path": path,
+            "query": query,
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            "body": response.text,
+        }
+        self.path(method, path, query).write_text(
+            json.dumps(record, ensure_ascii=False), encoding="utf-8"
+        )
+
+
+def recorded_response(record: dict) -> Response:
+    return Response(
+        content=record["body"].encode(),
+        status_code=record["status"],
+        headers=record["headers"],
+    )
+
+
+class SyntheticData:
+    """Детерминированная выдача: одна и та же вакансия при каждом запросе."""
+
+    EXPERIENCE = [
+        {"id": "noExperience", "name": "Нет опыта"},
+        {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        {"id": "between3And6", "name": "От 3 до 6 лет"},
+    ]
+    SCHEDULE = [
+        {"id": "fullDay", "name": "Полный день"},
+        {"id": "remote", "name": "Удаленная работа"},
+    ]
+    EMPLOYMENT = [{"id": "full", "name": "Полная занятость"}]
+    AREAS = [
+        {"id": "1", "name": "Москва"},
+        {"id": "2", "name": "Санкт-Петербург"},
+        {"id": "1002", "name": "Минск"},
+    ]
+
+    def __init__(self, found: int, companies: int = 50):
+        self.found = found
+        self.companies = companies
+        self.published_from = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def item(self, index: int, base_url: str, text: str = "") -> dict:
+        vacancy_id = str(100000 + index)
+        salary = None
+        if index % 3:
+            salary = {
+                "from": 1000 * (50 + index % 200),
+                "to": None,
+                "currency": "RUR",
+                "gross": bool(index % 2),
+            }
+        published_at = self.published_from + timedelta(minutes=index)
+        return {
+            "id": vacancy_id,
+            "name": f"Разработчик {index}",
+            "area": self.AREAS[index % len(self.AREAS)],
+            "salary": salary,
+            "employer": {
+                "id": str(index % self.companies),
+                "name": f"Компания {index % self.companies}",
+            },
+            "alternate_url": f"{base_url}vacancy/{vacancy_id}",
+            "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "snippet": {
+                "requirement": f"Опыт работы с {text or 'Python'}",
+                "responsibility": "Разработка и поддержка сервисов",
+            },
+            "schedule": self.SCHEDULE[index % len(self.SCHEDULE)],
+            "experience": self.EXPERIENCE[index % len(self.EXPERIENCE)],
+            "employment": self.EMPLOYMENT[0],
+            "archived": False,
+        }
+
+    def window(
+        self,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        newest_first: bool = False,
+    ) -> range:
+        """Номера вакансий, опубликованных в [date_from, date_to]."""
+        minute = timedelta(minutes=1)
+        start, end = 0, self.found
+        if date_from is not None:
+            start = max(
+                start, math.ceil((date_from - self.published_from) / minute)
+            )
+        if date_to is not None:
+            end = min(end, (date_to - self.published_from) // minute + 1)
+        indices = range(start, max(start, end))
+        return indices[::-1] if newest_first else indices
+
+    def page(
+        self,
+        text: str,
+        page: int,
+        per_page: int,
+        base_url: str,
+        indices: range | None = None,
+    ):
+        if indices is None:
+            indices = range(self.found)
+        start = page * per_page
+        chunk = indices[start:][:per_page]
+        return {
+            "items": [self.item(index, base_url, text) for index in chunk],
+            "found": len(indices),
+            "pages": math.ceil(len(indices) / per_page),
+            "page": page,
+            "per_page": per_page,
+        }
+
+    def details(self, vacancy_id: str, base_url: str) -> dict | None:
+        index = int(vacancy_id) - 100000
+        if not 0 <= index < self.found:
+            return None
+        item = self.item(index, base_url)
+        item["description"] = "<p>Описание вакансии.</p>" * 20
+        item["key_skills"] = [{"name": "Python"}, {"name": "PostgreSQL"}]
+        return item
+
+
+def create_app(
+    mode: str,
+    profile: FaultProfile,
+    recordings: Recordings | None = None,
+    upstream: str = DEFAULT_UPSTREAM,
+    synthetic: SyntheticData | None = None,
+) -> FastAPI:
+    app = FastAPI(title="hh.ru stub", docs_url=None, redoc_url=None)
+    upstream_client = httpx.AsyncClient(base_url=upstream, timeout=30)
+
+    @app.middleware("http")
+    async def faults(request: Request, call_next):
+        fault = await profile.apply()
+        if fault is not None:
+            return fault
+        return await call_next(request)
+
+    if mode == "synthetic":
+
+        @app.get("/vacancies")
+        def search(
+            request: Request,
+            text: str = "",
+            page: int = 0,
+            per_page: int = 20,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+            order_by: str | None = None,
+        ):
+            indices = synthetic.window(
+                date_from, date_to, newest_first=order_by == "publication_time"
+            )
+            return synthetic.page(
+                text, page, per_page, str(request.base_url), indices
+            )
+
+        @app.get("/vacancies/{vacancy_id}")
+        def vacancy(vacancy_id: str, request: Request):
+            details = synthetic.details(vacancy_id, str(request.base_url))
+            if details is None:
+                return JSONResponse({"errors": [{"type": "not_found"}]}, 404)
+            return details
+
+        @app.get("/areas")
+        def areas():
+            return [
+                {**area, "parent_id": None, "areas": []}
+                for area in SyntheticData.AREAS
+            ]
+
+        @app.get("/dictionaries")
+        def dictionaries():
+            return {
+                "currency": [
+                    {"code": "RUR", "rate": 1.0},
+                    {"code": "USD", "rate": 0.0112},
+                    {"code": "EUR", "rate": 0.0103},
+                ]
+            }
+
+        @app.get("/professional_roles")
+        def professional_roles():
+            return {
+                "categories": [
+                    {
+                        "id": "11",
+                        "name": "Информационные технологии",
+                        "roles": [{"id": "96", "name": "Программист"}],
+                    }
+                ]
+            }
+
+        @app.get("/resumes/mine")
+        def resumes():
+            return {"items": [], "found": 0, "pages": 0, "page": 0}
+
+        return app
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def proxy(path: str, request: Request):
+        query = request.url.query
+        if mode == "replay":
+            record = recordings.load(request.method, f"/{path}", query)
+            if record is None:
+                return JSONResponse(
+                    {"errors": [{"type": "not_recorded"}]}, status_code=404
+                )
+            return recorded_response(record)
+
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name in ("authorization", "user-agent", "content-type")
+        }
+        response = await upstream_client.request(
+            request.method,
+            f"/{path}",
+            params=query,
+            headers=headers,
+            content=await request.body(),
+        )
+        recordings.save(request.method, f"/{path}", query, response)
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            headers={
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+        )
+
+    return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Заглушка API hh.ru")
+    parser.add_argument("mode", choices=["record", "replay", "synthetic"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+    parser.add_argument(
+        "--found", type=int, default=2000, help="вакансий в выдаче"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="доля ответов 503"
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="доля ответов 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def app_from_args(args: argparse.Namespace) -> FastAPI:
+    profile = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    return create_app(
+        args.mode,
+        profile,
+        recordings=Recordings(args.data_dir),
+        upstream=args.upstream,
+        synthetic=SyntheticData(args.found),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    print(f"🧪 Заглушка hh.ru ({args.mode}) на http://{args.host}:{args.port}")
+    uvicorn.run(app_from_args(args), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,6 +7,8 @@ from sqlalchemy.orm import sessionmaker
 
 from app.database import Base, get_db
 from app.main import app
+from app.models import Vacancy
+from app.services.listing_cache import listing_cache
 from tests.test_settings import test_settings
 
 
@@ -63,6 +65,21 @@ def test_session(test_db):
         session.close()
 
 
+@pytest.fixture(scope="function")
+def cleanup(request, test_session):
+    """
+    Удаляет после теста вакансии, url которых подходит под LIKE-шаблон
+    CLEANUP_URL модуля: test_get_vacancies_empty ждёт пустую таблицу.
+    Подключается в модуле через pytest.mark.usefixtures("cleanup").
+    """
+    yield
+    test_session.rollback()
+    test_session.query(Vacancy).filter(
+        Vacancy.url.like(request.module.CLEANUP_URL)
+    ).delete(synchronize_session=False)
+    test_session.commit()
+
+
 @pytest.fixture(scope="function")
 def client(test_session):
     def override_get_db():
@@ -72,6 +89,8 @@ def client(test_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Тесты меняют таблицу и в обход crud, кэш списка не должен их путать
+    listing_cache.invalidate()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
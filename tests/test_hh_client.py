@@ -0,0 +1,222 @@
+import re
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import hh_api, hh_client
+
+
+def response(status_code: int, headers: dict | None = None):
+    return SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(hh_client.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_call_retries_after_429(sleeps):
+    responses = [response(429, {"Retry-After": "3"}), response(200)]
+
+    result = hh_client.call(lambda: responses.pop(0), key="test:retry")
+
+    assert result.status_code == 200
+    assert max(sleeps) >= 3
+
+
+def test_call_gives_up_after_max_retries(sleeps):
+    calls = []
+
+    def send():
+        calls.append(1)
+        return response(429)
+
+    result = hh_client.call(send, key="test:give-up")
+
+    assert result.status_code == 429
+    assert len(calls) == hh_client.MAX_RETRIES + 1
+
+
+def test_limiter_adapts_rate():
+    limiter = hh_client.AdaptiveTokenBucket(rate=4.0)
+
+    limiter.on_throttled()
+    assert limiter.rate == 2.0
+
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(3.0)
+
+
+def test_limiter_honours_retry_after():
+    limiter = hh_client.AdaptiveTokenBucket(rate=100.0, capacity=10)
+    assert limiter.reserve() == 0
+
+    limiter.on_throttled(retry_after=5)
+    assert limiter.reserve() >= 4.9
+
+
+def test_limiters_are_separate_per_token():
+    first = hh_client.get_limiter(hh_client.token_limiter_key("first"))
+    second = hh_client.get_limiter(hh_client.token_limiter_key("second"))
+    assert first is not second
+    assert hh_client.get_limiter(hh_client.token_limiter_key("first")) is first
+
+
+def test_parse_retry_after():
+    assert hh_client.parse_retry_after("7") == 7.0
+    assert hh_client.parse_retry_after(None) is None
+    assert hh_client.parse_retry_after("garbage") is None
+
+
+def caching_client(handler, cache):
+    transport = hh_client.CachingTransport(httpx.MockTransport(handler), cache)
+    return httpx.Client(transport=transport)
+
+
+def test_cache_revalidates_with_etag(monkeypatch):
+    monkeypatch.setattr(
+        hh_client, "CACHE_TTLS", [(re.compile("^/resumes/mine$"), 0)]
+    )
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json={"items": [1]}, headers={"ETag": '"v1"'}
+        )
+
+    cache = hh_client.ResponseCache()
+    with caching_client(handler, cache) as client:
+        first = client.get("https://api.hh.ru/resumes/mine")
+        second = client.get("https://api.hh.ru/resumes/mine")
+
+    assert seen_headers == [None, '"v1"']
+    assert second.status_code == 200
+    assert second.json() == first.json() == {"items": [1]}
+
+
+def test_cache_serves_fresh_entries_without_request():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"items": []})
+
+    cache = hh_client.ResponseCache()
+    with caching_client(handler, cache) as client:
+        client.get("https://api.hh.ru/vacancies", params={"text": "python"})
+        cached = client.get(
+            "https://api.hh.ru/vacancies", params={"text": "python"}
+        )
+
+    assert len(calls) == 1
+    assert cached.extensions["from_cache"]
+
+
+def test_cache_is_size_bounded_lru():
+    def handler(request):
+        return httpx.Response(200, content=b"x" * 100)
+
+    cache = hh_client.ResponseCache(max_bytes=250)
+    with caching_client(handler, cache) as client:
+        for page in range(3):
+            client.get(f"https://api.hh.ru/vacancies?page={page}")
+
+    assert len(cache) == 2
+    assert cache.size == 200
+    assert cache.get(("", "https://api.hh.ru/vacancies?page=0")) is None
+
+
+def test_cache_is_per_token_and_invalidated_on_writes():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(200, json={"items": []})
+
+    cache = hh_client.ResponseCache()
+    url = "https://api.hh.ru/resumes/mine"
+    with caching_client(handler, cache) as client:
+        client.get(url, headers={"Authorization": "Bearer first"})
+        client.get(url, headers={"Authorization": "Bearer second"})
+        client.get(url, headers={"Authorization": "Bearer first"})
+        client.post(
+            "https://api.hh.ru/resumes/1/publish",
+            headers={"Authorization": "Bearer first"},
+        )
+        client.get(url, headers={"Authorization": "Bearer first"})
+
+    assert calls == ["GET", "GET", "POST", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_async_cache_tees_streamed_body():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"items": [1, 2]})
+
+    cache = hh_client.ResponseCache()
+    transport = hh_client.AsyncCachingTransport(
+        httpx.MockTransport(handler), cache
+    )
+    url = "https://api.hh.ru/vacancies"
+    async with httpx.AsyncClient(transport=transport) as client:
+        request = client.build_request("GET", url)
+        response = await client.send(request, stream=True)
+        # Пока тело не дочитано, в кэше ничего нет
+        assert len(cache) == 0
+        body = b"".join([chunk async for chunk in response.aiter_bytes()])
+        await response.aclose()
+        cached = await client.get(url)
+
+    assert len(calls) == 1
+    assert cached.extensions["from_cache"]
+    assert cached.content == body
+
+
+@pytest.mark.asyncio
+async def test_async_cache_skips_oversized_streamed_body():
+    def handler(request):
+        return httpx.Response(200, content=b"x" * 100)
+
+    cache = hh_client.ResponseCache(max_entry_bytes=10)
+    transport = hh_client.AsyncCachingTransport(
+        httpx.MockTransport(handler), cache
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("https://api.hh.ru/vacancies")
+
+    assert len(response.content) == 100
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_vacancy_details_revalidate_fresh_cache(monkeypatch):
+    versions = iter(["old", "new"])
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        version = next(versions)
+        return httpx.Response(
+            200, json={"name": version}, headers={"ETag": f'"{version}"'}
+        )
+
+    monkeypatch.setattr(hh_api, "BASE_URL", "https://api.hh.ru/vacancies")
+    transport = hh_client.AsyncCachingTransport(
+        httpx.MockTransport(handler), hh_client.ResponseCache()
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        first = await hh_api.fetch_vacancy_details(client, "1")
+        second = await hh_api.fetch_vacancy_details(client, "1")
+
+    assert seen_headers == [None, '"old"']
+    assert (first["name"], second["name"]) == ("old", "new")
@@ -0,0 +1,168 @@
+import pytest
+
+from app.models import AreaClosure, HHDictionary
+from app.services import hh_dictionaries
+from app.services.salary import salary_columns
+from app.services.vacancy_formatter import format_hh_vacancy
+
+AREAS = [
+    {
+        "id": "113",
+        "parent_id": None,
+        "name": "Россия",
+        "areas": [
+            {"id": "1", "parent_id": "113", "name": "Москва", "areas": []},
+            {
+                "id": "1620",
+                "parent_id": "113",
+                "name": "Республика Марий Эл",
+                "areas": [
+                    {
+                        "id": "1624",
+                        "parent_id": "1620",
+                        "name": "Москва",
+                        "areas": [],
+                    }
+                ],
+            },
+        ],
+    }
+]
+PAYLOADS = {
+    "/areas": AREAS,
+    "/dictionaries": {
+        "currency": [
+            {"code": "RUR", "rate": 1.0},
+            {"code": "USD", "rate": 0.01},
+        ]
+    },
+    "/professional_roles": {
+        "categories": [
+            {"id": "11", "roles": [{"id": "96", "name": "Программист"}]}
+        ]
+    },
+}
+
+
+CLEANUP_URL = "https://hh.ru/vacancy/area-%"
+pytestmark = pytest.mark.usefixtures("cleanup")
+
+
+@pytest.fixture(autouse=True)
+def reset_dictionaries(test_session):
+    original = hh_dictionaries.current()
+    yield
+    test_session.query(AreaClosure).delete()
+    test_session.query(HHDictionary).delete()
+    test_session.commit()
+    hh_dictionaries._current = original
+
+
+@pytest.fixture
+def fake_hh(monkeypatch):
+    requested = []
+
+    def fetch(path):
+        requested.append(path)
+        return PAYLOADS[path]
+
+    monkeypatch.setattr(hh_dictionaries, "fetch_dictionary", fetch)
+    return requested
+
+
+def test_refresh_persists_and_loads_snapshot(test_session, fake_hh):
+    dictionaries = hh_dictionaries.refresh_dictionaries(test_session)
+
+    assert sorted(fake_hh) == [
+        "/areas",
+        "/dictionaries",
+        "/professional_roles",
+    ]
+    assert dictionaries is hh_dictionaries.current()
+    assert dictionaries.area_name(1624) == "Москва"
+    assert dictionaries.area_parent("1624") == "1620"
+    # Из одноимённых регионов по названию находится ближайший к корню
+    assert dictionaries.area_id("москва") == "1"
+    assert dictionaries.currency_rate("USD") == 0.01
+    assert dictionaries.role_name(96) == "Программист"
+    assert not hh_dictionaries.is_stale(test_session)
+
+
+def test_reload_picks_up_new_snapshot(test_session, fake_hh):
+    hh_dictionaries.refresh_dictionaries(test_session)
+    loaded = hh_dictionaries.current()
+    assert not hh_dictionaries.reload_if_changed(test_session)
+
+    hh_dictionaries.refresh_dictionaries(test_session)
+    hh_dictionaries._current = loaded
+    assert hh_dictionaries.reload_if_changed(test_session)
+    assert hh_dictionaries.current() is not loaded
+
+
+def test_failed_source_keeps_previous_version(
+    test_session, fake_hh, monkeypatch
+):
+    hh_dictionaries.refresh_dictionaries(test_session)
+
+    def fetch(path):
+        if path == "/dictionaries":
+            raise RuntimeError("hh.ru недоступен")
+        return PAYLOADS[path]
+
+    monkeypatch.setattr(hh_dictionaries, "fetch_dictionary", fetch)
+    dictionaries = hh_dictionaries.refresh_dictionaries(test_session)
+    assert dictionaries.currency_rate("USD") == 0.01
+
+
+def test_salary_and_formatter_use_dictionaries(test_session, fake_hh):
+    hh_dictionaries.refresh_dictionaries(test_session)
+
+    columns = salary_columns({"from": 1000, "currency": "USD"})
+    assert columns["salary_mid_rub"] == 100000
+
+    vacancy = format_hh_vacancy(
+        {
+            "name": "Dev",
+            "area": {"id": "1624"},
+            "alternate_url": "https://hh.ru/vacancy/1",
+        }
+    )
+    assert vacancy.location == "Москва"
+    assert vacancy.area_id == 1624
+
+
+def test_area_filter_includes_descendants(client, test_session, fake_hh):
+    hh_dictionaries.refresh_dictionaries(test_session)
+    closure = {
+        (row.ancestor_id, row.descendant_id): row.depth
+        for row in test_session.query(AreaClosure)
+    }
+    assert closure[(113, 1624)] == 2
+    assert closure[(1620, 1620)] == 0
+    assert (1, 1624) not in closure
+
+    for area_id, location in ((1, "Москва"), (1624, "Москва"), (None, "")):
+        client.post(
+            "/vacancies/",
+            json={
+                "title": "Dev",
+                "company": "Acme",
+                "location": location,
+                "area_id": area_id,
+                "url": f"https://hh.ru/vacancy/area-{area_id}",
+            },
+        )
+
+    def areas(area):
+        response = client.get("/vacancies/", params={"area": area})
+        assert response.status_code == 200
+        return sorted(item["area_id"] for item in response.json())
+
+    assert areas("113") == [1, 1624]
+    assert areas("1620") == [1624]
+    # По названию выбирается ближайший к корню регион
+    assert areas("Москва") == [1]
+    assert (
+        client.get("/vacancies/", params={"area": "Атлантида"}).status_code
+        == 400
+    )
@@ -0,0 +1,220 @@
+import pytest
+
+from app.models import SyncWatermark, Vacancy
+from app.services import ingestion
+
+COMPANY = "Ingestion Test"
+CLEANUP_URL = "https://hh.ru/vacancy/%"
+pytestmark = pytest.mark.usefixtures("cleanup")
+
+
+def hh_item(item_id: int, published_at: str) -> dict:
+    return {
+        "id": str(item_id),
+        "name": f"Python Developer {item_id}",
+        "employer": {"name": COMPANY},
+        "area": {"name": "Minsk"},
+        "alternate_url": f"https://hh.ru/vacancy/{item_id}",
+        "published_at": published_at,
+    }
+
+
+def hh_details(item_id: str) -> dict:
+    return {
+        "id": item_id,
+        "name": f"Python Developer {item_id}",
+        "employer": {"name": COMPANY},
+        "area": {"name": "Minsk"},
+        "alternate_url": f"https://hh.ru/vacancy/{item_id}",
+        "salary": {"from": 1000, "to": 2000, "currency": "USD"},
+        "description": "<p>Описание</p>",
+        "key_skills": [{"name": "Python"}, {"name": "SQL"}],
+        "experience": {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        "employment": {"id": "full", "name": "Полная занятость"},
+        "schedule": {"id": "remote", "name": "Удаленная работа"},
+    }
+
+
+@pytest.fixture
+def fake_details(monkeypatch):
+    requested = []
+    failing = set()
+
+    async def fetch(client, vacancy_ids, concurrency=5):
+        requested.extend(vacancy_ids)
+        return {i: hh_details(i) for i in vacancy_ids if i not in failing}
+
+    monkeypatch.setattr(ingestion, "fetch_vacancies_details", fetch)
+    return requested, failing
+
+
+@pytest.fixture
+def fake_harvest(monkeypatch, fake_details):
+    calls = []
+    pages = []
+
+    async def harvest(keyword, area, date_from=None, stats=None, **kwargs):
+        calls.append(date_from)
+        items = pages.pop(0)
+        stats.update(
+            {"pages": 1, "errors": 0, "found": len(items), "truncated": False}
+        )
+        for item in items:
+            yield item
+
+    monkeypatch.setattr(ingestion, "harvest_vacancies", harvest)
+    return calls, pages
+
+
+@pytest.fixture(autouse=True)
+def clear_watermarks(test_session):
+    yield
+    test_session.query(SyncWatermark).delete()
+    test_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_ingest_advances_watermark(test_session, fake_harvest):
+    calls, pages = fake_harvest
+    pages.append(
+        [
+            hh_item(1, "2025-01-01T10:00:00+0300"),
+            hh_item(2, "2025-01-02T10:00:00+0300"),
+        ]
+    )
+    pages.append([hh_item(3, "2025-01-03T10:00:00+0300")])
+
+    counts = await ingestion.ingest_vacancies(test_session, "Python", 1002)
+    assert counts["inserted"] == 2
+
+    counts = await ingestion.ingest_vacancies(test_session, "Python", 1002)
+    assert counts["inserted"] == 1
+
+    assert calls[0] is None
+    assert calls[1].isoformat() == "2025-01-02T07:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_ingest_keeps_watermark_on_page_errors(
+    test_session, fake_harvest, monkeypatch
+):
+    calls, pages = fake_harvest
+    pages.append([hh_item(4, "2025-02-01T10:00:00+0300")])
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+
+    async def failing_harvest(keyword, date_from=None, stats=None, **kw):
+        calls.append(date_from)
+        stats.update({"pages": 1, "errors": 1, "found": 2, "truncated": False})
+        yield hh_item(5, "2025-03-01T10:00:00+0300")
+
+    monkeypatch.setattr(ingestion, "harvest_vacancies", failing_harvest)
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+
+    assert calls[1] == calls[2]
+
+
+@pytest.mark.asyncio
+async def test_ingest_keeps_watermark_on_truncated_results(
+    test_session, fake_harvest, monkeypatch
+):
+    calls, pages = fake_harvest
+    pages.append([hh_item(9, "2025-02-01T10:00:00+0300")])
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+
+    async def truncated_harvest(keyword, date_from=None, stats=None, **kw):
+        calls.append(date_from)
+        # Даже окнами по дате выдачу не удалось получить целиком
+        stats.update(
+            {"pages": 20, "errors": 0, "found": 2500, "truncated": True}
+        )
+        yield hh_item(10, "2025-03-01T10:00:00+0300")
+
+    monkeypatch.setattr(ingestion, "harvest_vacancies", truncated_harvest)
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+    await ingestion.ingest_vacancies(test_session, "Python", 1002)
+
+    assert calls[1] == calls[2]
+
+
+@pytest.mark.asyncio
+async def test_ingest_enriches_new_and_changed_items(
+    test_session, fake_harvest, fake_details
+):
+    _, pages = fake_harvest
+    requested, _ = fake_details
+    item = hh_item(6, "2025-04-01T10:00:00+0300")
+    pages.append([item])
+    pages.append([item])
+    pages.append([{**item, "name": "Senior Python Developer"}])
+
+    counts = await ingestion.ingest_vacancies(
+        test_session, "Python", 1002, incremental=False
+    )
+    assert counts["inserted"] == 1
+    assert counts["enriched"] == 1
+
+    counts = await ingestion.ingest_vacancies(
+        test_session, "Python", 1002, incremental=False
+    )
+    assert counts["unchanged"] == 1
+    assert counts["enriched"] == 0
+
+    await ingestion.ingest_vacancies(
+        test_session, "Python", 1002, incremental=False
+    )
+    assert requested == ["6", "6"]
+
+    vacancy = (
+        test_session.query(Vacancy)
+        .filter(Vacancy.url == "https://hh.ru/vacancy/6")
+        .one()
+    )
+    assert vacancy.source == "hh.ru"
+    assert vacancy.salary["currency"] == "USD"
+    assert vacancy.key_skills == ["Python", "SQL"]
+    assert vacancy.schedule == "Удаленная работа"
+
+
+@pytest.mark.asyncio
+async def test_ingest_retries_failed_details(
+    test_session, fake_harvest, fake_details
+):
+    _, pages = fake_harvest
+    requested, failing = fake_details
+    item = hh_item(7, "2025-05-01T10:00:00+0300")
+    pages.append([item])
+    pages.append([item])
+    failing.add("7")
+
+    counts = await ingestion.ingest_vacancies(
+        test_session, "Python", 1002, incremental=False
+    )
+    assert counts["inserted"] == 1
+    assert counts["enriched"] == 0
+
+    failing.clear()
+    counts = await ingestion.ingest_vacancies(
+        test_session, "Python", 1002, incremental=False
+    )
+    assert counts["enriched"] == 1
+    assert requested == ["7", "7"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_stores_fingerprint_of_list_only_change(
+    test_session, fake_harvest, fake_details
+):
+    _, pages = fake_harvest
+    requested, _ = fake_details
+    item = hh_item(8, "2025-06-01T10:00:00+0300")
+    # Сниппет есть только в выдаче: карточка и content_hash не меняются
+    edited = {**item, "snippet": {"requirement": "Django"}}
+    pages.extend([[item], [edited], [edited]])
+
+    for _ in range(3):
+        await ingestion.ingest_vacancies(
+            test_session, "Python", 1002, incremental=False
+        )
+
+    assert requested == ["8", "8"]
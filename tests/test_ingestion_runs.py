@@ -0,0 +1,105 @@
+import pytest
+
+from app import scheduler as scheduler_module
+from app.models import IngestionRun, IngestionRunTotal, SearchDefinition
+
+
+@pytest.fixture
+def definition_id(test_session):
+    definition = SearchDefinition(text="Ledger", area=1)
+    test_session.add(definition)
+    test_session.commit()
+    yield definition.id
+    test_session.query(IngestionRun).delete()
+    test_session.query(IngestionRunTotal).delete()
+    test_session.query(SearchDefinition).filter(
+        SearchDefinition.text == "Ledger"
+    ).delete()
+    test_session.commit()
+
+
+@pytest.fixture
+def run_job(monkeypatch, test_session):
+    monkeypatch.setattr(scheduler_module, "SessionLocal", lambda: test_session)
+
+    def run(definition_id, ingest):
+        monkeypatch.setattr(scheduler_module, "ingest_vacancies", ingest)
+        scheduler_module._fetch_vacancies(definition_id)
+
+    return run
+
+
+COUNTS = {
+    "inserted": 3,
+    "updated": 1,
+    "unchanged": 6,
+    "enriched": 4,
+    "items": 10,
+    "pages": 1,
+    "errors": 0,
+    "http_seconds": 0.5,
+    "db_seconds": 0.25,
+}
+
+
+def test_job_records_run(client, test_session, definition_id, run_job):
+    async def ingest(db, keyword, **filters):
+        return COUNTS
+
+    run_job(definition_id, ingest)
+
+    response = client.get(
+        "/ingestion/runs",
+        params={"search_definition_id": definition_id},
+    )
+    assert response.status_code == 200
+    [run] = response.json()
+    assert run["status"] == "success"
+    assert run["query_key"] == "area=1&text=Ledger"
+    assert run["items_seen"] == 10
+    assert run["skipped"] == 6
+    assert run["http_seconds"] == 0.5
+    assert run["finished_at"] is not None
+
+
+def test_job_records_failed_run(client, definition_id, run_job):
+    async def ingest(db, keyword, **filters):
+        raise RuntimeError("hh.ru недоступен")
+
+    run_job(definition_id, ingest)
+
+    response = client.get("/ingestion/runs", params={"status": "failed"})
+    [run] = response.json()
+    assert run["search_definition_id"] == definition_id
+    assert "hh.ru недоступен" in run["error"]
+
+
+def test_failed_run_keeps_committed_counts(client, definition_id, run_job):
+    async def ingest(db, keyword, totals, **filters):
+        # Первый батч записан и закоммичен, затем сбор падает
+        totals.update({**COUNTS, "errors": 1})
+        raise RuntimeError("обрыв соединения")
+
+    run_job(definition_id, ingest)
+
+    response = client.get("/ingestion/runs", params={"status": "failed"})
+    [run] = response.json()
+    assert run["inserted"] == 3
+    assert run["items_seen"] == 10
+    assert run["page_errors"] == 1
+
+
+def test_metrics_expose_ledger_totals(client, definition_id, run_job):
+    async def ingest(db, keyword, **filters):
+        return {**COUNTS, "errors": 1}
+
+    run_job(definition_id, ingest)
+    run_job(definition_id, ingest)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    query = 'query="area=1&text=Ledger"'
+    assert f'ingestion_runs_total{{{query},status="partial"}} 2.0' in body
+    assert f'ingestion_items_total{{{query},result="inserted"}} 6.0' in body
+    assert f"ingestion_http_seconds_total{{{query}}} 1.0" in body
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from app.services.json_stream import ItemsParser, iter_items
+
+PAGE = {
+    "items": [
+        {"id": str(i), "name": 'Разработчик "Python" ]}', "n": 1000 + i}
+        for i in range(20)
+    ],
+    "found": 12345,
+    "pages": 7,
+    "clusters": None,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 4096])
+def test_parser_yields_items_across_chunks(chunk_size):
+    text = json.dumps(PAGE, ensure_ascii=False, indent=2)
+    parser = ItemsParser()
+    items = []
+    for start in range(0, len(text), chunk_size):
+        end = start + chunk_size
+        items.extend(parser.feed(text[start:end]))
+    items.extend(parser.close())
+
+    assert items == PAGE["items"]
+    assert parser.meta == {"found": 12345, "pages": 7, "clusters": None}
+
+
+def test_parser_keeps_only_unparsed_tail():
+    parser = ItemsParser()
+    text = json.dumps(PAGE)
+    half = len(text) // 2
+    parsed = parser.feed(text[:half])
+    assert parsed
+    assert len(parser._buffer) < half
+
+
+def test_parser_rejects_truncated_body():
+    parser = ItemsParser()
+    parser.feed('{"items": [{"id": "1"}')
+    with pytest.raises(json.JSONDecodeError):
+        parser.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_items_fills_meta_after_items():
+    async def chunks():
+        text = json.dumps(PAGE)
+        for start in range(0, len(text), 100):
+            end = start + 100
+            yield text[start:end]
+
+    meta = {}
+    items = [item async for item in iter_items(chunks(), meta)]
+    assert len(items) == 20
+    assert meta["pages"] == 7
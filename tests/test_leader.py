@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.database import LOCK_CONNECT_ARGS
+from app.leader import SEARCH_JOB_LOCK_NAMESPACE, LeaderElector, advisory_lock
+from tests.test_settings import test_settings
+
+
+@pytest.fixture
+def lock_engine(test_db):
+    engine = create_engine(
+        test_settings.database_url,
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
+        connect_args=LOCK_CONNECT_ARGS,
+    )
+    yield engine
+    engine.dispose()
+
+
+def make_elector(engine, events, name):
+    return LeaderElector(
+        on_elected=lambda: events.append(f"{name} elected"),
+        on_demoted=lambda: events.append(f"{name} demoted"),
+        key=42,
+        engine=engine,
+    )
+
+
+def test_single_leader_and_failover(lock_engine):
+    events = []
+    first = make_elector(lock_engine, events, "first")
+    second = make_elector(lock_engine, events, "second")
+
+    first.poll()
+    second.poll()
+    assert first.is_leader
+    assert not second.is_leader
+
+    # Лидер ушёл: блокировка снимается вместе с его соединением
+    first.stop()
+    second.poll()
+    assert second.is_leader
+    assert events == ["first elected", "first demoted", "second elected"]
+
+    second.stop()
+
+
+def test_advisory_lock_is_exclusive(lock_engine):
+    namespace = SEARCH_JOB_LOCK_NAMESPACE
+    with advisory_lock(namespace, 7, lock_engine) as acquired:
+        assert acquired
+        with advisory_lock(namespace, 7, lock_engine) as other:
+            assert not other
+
+    with advisory_lock(namespace, 7, lock_engine) as acquired:
+        assert acquired
+
+
+def test_leader_connection_has_statement_timeout(lock_engine):
+    elector = make_elector(lock_engine, [], "leader")
+    elector.poll()
+    # Проверка лидерства не может зависнуть дольше statement_timeout
+    timeout = elector._connection.execute(
+        text("SHOW statement_timeout")
+    ).scalar()
+    assert timeout == "5s"
+    elector.stop()
@@ -0,0 +1,213 @@
+import pytest
+
+from app.models import Vacancy
+from app.routes import vacancies as vacancies_routes
+from app.services import listing_cache as listing_cache_module
+from app.services.listing_cache import (
+    ListingCache,
+    count_cache,
+    listing_cache,
+    listing_key,
+)
+
+CLEANUP_URL = "https://example.com/cached/%"
+pytestmark = pytest.mark.usefixtures("cleanup")
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    listing_cache.clear()
+    count_cache.clear()
+
+
+def test_cache_lru_ttl_and_generation(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(listing_cache_module.time, "monotonic", lambda: now[0])
+    cache = ListingCache(max_entries=2, ttl=10)
+
+    cache.put(("a",), b"a", {}, cache.generation)
+    cache.put(("b",), b"b", {}, cache.generation)
+    assert cache.get(("a",)).body == b"a"
+    cache.put(("c",), b"c", {}, cache.generation)
+    # Вытесняется давно не читанная запись
+    assert cache.get(("b",)) is None
+    assert cache.evictions == 1
+
+    now[0] += 10
+    assert cache.get(("a",)) is None
+
+    # Ответ, посчитанный до записи в базу, не сохраняется
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(("d",), b"d", {}, generation)
+    assert cache.get(("d",)) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_listing_key_normalizes_params():
+    assert listing_key(company="Acme", location=None, skip=0) == listing_key(
+        skip=0, company="ACME", title=""
+    )
+    assert listing_key(salary_min=0) != listing_key()
+
+
+def test_listing_served_from_cache_until_write(client, test_session):
+    params = {"company": "Cached Co"}
+    client.post(
+        "/vacancies",
+        json={
+            "title": "First",
+            "company": "Cached Co",
+            "url": "https://example.com/cached/1",
+        },
+    )
+    first = client.get("/vacancies", params=params)
+    hits = listing_cache.hits
+
+    # Изменение в обход crud кэш не видит до истечения TTL
+    test_session.query(Vacancy).filter(
+        Vacancy.url == "https://example.com/cached/1"
+    ).update({"title": "Changed"})
+    test_session.commit()
+    second = client.get("/vacancies", params={"company": "cached co"})
+    assert listing_cache.hits == hits + 1
+    assert second.content == first.content
+    assert second.json()[0]["title"] == "First"
+
+    # Запись через API сбрасывает кэш
+    client.post(
+        "/vacancies",
+        json={
+            "title": "Second",
+            "company": "Cached Co",
+            "url": "https://example.com/cached/2",
+        },
+    )
+    titles = [
+        item["title"]
+        for item in client.get("/vacancies", params=params).json()
+    ]
+    assert sorted(titles) == ["Changed", "Second"]
+
+    metrics = client.get("/metrics").text
+    assert (
+        f'listing_cache_requests_total{{result="hit"}} {hits + 1.0}' in metrics
+    )
+
+
+def test_etag_answers_not_modified_until_write(client, monkeypatch):
+    params = {"company": "Cached Co"}
+    client.post(
+        "/vacancies",
+        json={
+            "title": "First",
+            "company": "Cached Co",
+            "url": "https://example.com/cached/1",
+        },
+    )
+    response = client.get("/vacancies", params=params)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "max-age" in response.headers["Cache-Control"]
+    # Другие параметры — другой ETag
+    other = client.get("/vacancies", params={"company": "Other"})
+    assert other.headers["ETag"] != etag
+
+    def fail(*args, **kwargs):
+        raise AssertionError("запрос списка не должен выполняться")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.routes.vacancies._load_listing", fail)
+        response = client.get(
+            "/vacancies",
+            params=params,
+            headers={"If-None-Match": f'"other", {etag}'},
+        )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    client.post(
+        "/vacancies",
+        json={
+            "title": "Second",
+            "company": "Cached Co",
+            "url": "https://example.com/cached/2",
+        },
+    )
+    response = client.get(
+        "/vacancies", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_search_etag(client):
+    response = client.get("/vacancies/search", params={"q": "etag"})
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/vacancies/search",
+        params={"q": "etag"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+
+def test_total_count_modes(client):
+    def total(**params):
+        response = client.get(
+            "/vacancies", params={"company": "Counted", **params}
+        )
+        return response.headers.get("X-Total-Count")
+
+    for number in range(3):
+        client.post(
+            "/vacancies",
+            json={
+                "title": f"Counted {number}",
+                "company": "Counted Co",
+                "url": f"https://example.com/cached/count-{number}",
+            },
+        )
+
+    assert total() is None
+    assert total(count="exact", limit=1) == "3"
+    # Только фильтры из свёртки фасетов: оценка по ней совпадает с COUNT
+    assert total(count="estimate") == "3"
+    # С фильтром по названию — оценка планировщика
+    assert int(total(count="estimate", title="counted")) >= 0
+    assert total(count="cached") == "3"
+
+    client.post(
+        "/vacancies",
+        json={
+            "title": "Counted 3",
+            "company": "Counted Co",
+            "url": "https://example.com/cached/count-3",
+        },
+    )
+    # Кэш числа запись не сбрасывает, точный режим видит новую строку
+    assert total(count="cached", limit=2) == "3"
+    assert total(count="exact") == "4"
+
+
+def test_count_written_during_query_is_not_cached(client, monkeypatch):
+    counted = []
+
+    def count_with_write(db, **filters):
+        counted.append(filters)
+        # Запись в vacancies завершается, пока идёт COUNT(*)
+        count_cache.invalidate()
+        return 7
+
+    monkeypatch.setattr(vacancies_routes, "count_vacancies", count_with_write)
+    for _ in range(2):
+        # Ответ целиком не кэшируем, проверяем только кэш числа
+        listing_cache.clear()
+        response = client.get(
+            "/vacancies", params={"company": "Racy", "count": "cached"}
+        )
+        assert response.headers["X-Total-Count"] == "7"
+    assert len(counted) == 2
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import scheduler as scheduler_module
+
+
+def definition(definition_id: int, interval_minutes: int = 60):
+    return SimpleNamespace(id=definition_id, interval_minutes=interval_minutes)
+
+
+@pytest.fixture
+def definitions(monkeypatch):
+    current = []
+    monkeypatch.setattr(
+        scheduler_module,
+        "list_active_search_definitions",
+        lambda db: list(current),
+    )
+    yield current
+    scheduler_module.scheduler.remove_all_jobs()
+
+
+def search_jobs():
+    return {
+        job.id: job
+        for job in scheduler_module.scheduler.get_jobs()
+        if job.id.startswith(scheduler_module.SEARCH_JOB_PREFIX)
+    }
+
+
+def test_sync_search_jobs_expands_definitions(definitions):
+    definitions.extend([definition(1), definition(2, interval_minutes=15)])
+    scheduler_module.sync_search_jobs()
+
+    jobs = search_jobs()
+    assert set(jobs) == {"search:1", "search:2"}
+    assert jobs["search:2"].trigger.interval.total_seconds() == 15 * 60
+    # Первые запуски разнесены в порядке приоритета
+    assert jobs["search:1"].next_run_time < jobs["search:2"].next_run_time
+
+
+def test_sync_search_jobs_removes_inactive(definitions):
+    definitions.extend([definition(1), definition(2)])
+    scheduler_module.sync_search_jobs()
+
+    definitions.pop(0)
+    definitions[0] = definition(2, interval_minutes=30)
+    scheduler_module.sync_search_jobs()
+
+    jobs = search_jobs()
+    assert set(jobs) == {"search:2"}
+    assert jobs["search:2"].trigger.interval.total_seconds() == 30 * 60
@@ -1,6 +1,26 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import httpx
 import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
 
-from app.services.hh_api import fetch_vacancies
+from app.crud.vacancy import LIST_FIELDS, encode_cursor, upsert_vacancies
+from app.models import Vacancy
+from app.schemas import Salary, VacancyCreate, VacancyRead
+from app.services import hh_client
+from app.services.hh_api import (
+    create_async_client,
+    fetch_vacancies,
+    fetch_vacancies_details,
+    harvest_vacancies,
+)
+from app.services.salary import CURRENCY_RATES, salary_columns
+from app.services.vacancy_export import to_csv, to_ndjson
 
 
 def test_health_check(client):
@@ -124,3 +144,751 @@ def test_pagination(client):
     response = client.get("/vacancies/?skip=5&limit=5")
     assert response.status_code == 200
     assert len(response.json()) == 5
+
+
+def test_offset_pagination_honours_sort(client):
+    # Префикс ставит вакансии теста в начало сортировки по убыванию
+    for title in ["D", "A", "E", "B", "C", "A"]:
+        client.post(
+            "/vacancies/", json={"title": f"Zzz {title}", "company": "Test"}
+        )
+
+    pages = [
+        client.get(
+            "/vacancies/",
+            params={"sort_by": "title", "skip": skip, "limit": 2},
+        ).json()
+        for skip in (0, 2, 4)
+    ]
+    vacancies = [vacancy for page in pages for vacancy in page]
+    assert [v["title"][-1] for v in vacancies] == list("EDCBAA")
+    assert len({v["id"] for v in vacancies}) == 6
+
+
+@pytest.mark.asyncio
+async def test_harvest_vacancies_walks_all_pages():
+    requested_pages = []
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        requested_pages.append(page)
+        items = [{"id": f"{page}-{i}", "name": "Dev"} for i in range(2)]
+        return httpx.Response(200, json={"items": items, "pages": 3})
+
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        items = [
+            item
+            async for item in harvest_vacancies(
+                "python", per_page=2, client=client
+            )
+        ]
+
+    assert sorted(requested_pages) == [0, 1, 2]
+    assert len(items) == 6
+    assert len({item["id"] for item in items}) == 6
+
+
+@pytest.mark.asyncio
+async def test_harvest_vacancies_respects_search_depth(monkeypatch):
+    monkeypatch.setattr("app.services.hh_api.MAX_SEARCH_DEPTH", 4)
+    requested_pages = []
+
+    def handler(request):
+        requested_pages.append(int(request.url.params["page"]))
+        return httpx.Response(200, json={"items": [{}], "pages": 50})
+
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        async for _ in harvest_vacancies("python", per_page=2, client=client):
+            pass
+
+    assert sorted(requested_pages) == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_harvest_vacancies_splits_deep_results(monkeypatch):
+    monkeypatch.setattr("app.services.hh_api.MAX_SEARCH_DEPTH", 4)
+    # Пять вакансий с 1 по 5 января; hh.ru отдаёт новые первыми
+    published = {
+        str(day): datetime(2025, 1, day, tzinfo=timezone.utc)
+        for day in range(1, 6)
+    }
+    windows = []
+
+    def handler(request):
+        date_to = request.url.params.get("date_to")
+        windows.append(date_to)
+        ids = sorted(
+            (
+                vacancy_id
+                for vacancy_id, at in published.items()
+                if date_to is None or at <= datetime.fromisoformat(date_to)
+            ),
+            reverse=True,
+        )
+        start = int(request.url.params["page"]) * 2
+        items = [
+            {
+                "id": vacancy_id,
+                "published_at": published[vacancy_id].strftime(
+                    "%Y-%m-%dT%H:%M:%S%z"
+                ),
+            }
+            for vacancy_id in ids[start:][:2]
+        ]
+        return httpx.Response(
+            200,
+            json={"items": items, "found": len(ids), "pages": 3},
+        )
+
+    stats = {}
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        items = [
+            item
+            async for item in harvest_vacancies(
+                "python", per_page=2, client=client, stats=stats
+            )
+        ]
+
+    # Второе окно — до самой старой вакансии первого
+    assert windows.count(None) == 2
+    assert {item["id"] for item in items} == set(published)
+    assert stats["found"] == 5
+    assert stats["truncated"] is False
+
+
+@pytest_asyncio.fixture
+async def hh_server(monkeypatch):
+    """Локальный HTTP-сервер вместо hh.ru: выдача из 6 страниц по 2."""
+
+    async def handle(reader, writer):
+        while request_line := await reader.readline():
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            url = httpx.URL(request_line.split()[1].decode())
+            if url.path == "/vacancies":
+                page = int(url.params["page"])
+                items = [{"id": f"{page}-{i}"} for i in range(2)]
+                payload = {"items": items, "pages": 6}
+            else:
+                payload = {"id": url.path.rsplit("/", 1)[1]}
+            body = json.dumps(payload).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(
+        "app.services.hh_api.BASE_URL", f"http://127.0.0.1:{port}/vacancies"
+    )
+    hh_client.response_cache.clear()
+    yield
+    hh_client.response_cache.clear()
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_harvest_releases_pool_while_consumer_waits(hh_server):
+    # Пул на два соединения, как у сбора: пока потребитель стоит,
+    # воркеры заполняют очередь, но карточки тем же клиентом качаются
+    client = create_async_client(concurrency=2)
+    client.timeout = httpx.Timeout(5.0, pool=1.0)
+    async with client:
+        harvest = harvest_vacancies("python", per_page=2, client=client)
+        items = [await anext(harvest) for _ in range(4)]
+        # Даём воркерам упереться в заполненную очередь
+        await asyncio.sleep(0.2)
+        details = await fetch_vacancies_details(
+            client, [item["id"] for item in items]
+        )
+        items += [item async for item in harvest]
+
+    assert sorted(details) == sorted(item["id"] for item in items[:4])
+    assert len({item["id"] for item in items}) == 12
+
+
+def test_upsert_vacancies_counts(test_session):
+    batch = [
+        VacancyCreate(
+            title="Python Dev",
+            company="Upsert",
+            url=f"https://example.com/upsert/{i}",
+        )
+        for i in range(3)
+    ]
+    counts = upsert_vacancies(test_session, batch)
+    assert counts == {"inserted": 3, "updated": 0, "unchanged": 0}
+
+    batch[0] = VacancyCreate(
+        title="Senior Python Dev",
+        company="Upsert",
+        url="https://example.com/upsert/0",
+    )
+    batch.append(
+        VacancyCreate(
+            title="Go Dev",
+            company="Upsert",
+            url="https://example.com/upsert/3",
+        )
+    )
+    counts = upsert_vacancies(test_session, batch, chunk_size=2)
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 2}
+
+    titles = {
+        v.url: v.title
+        for v in test_session.query(Vacancy).filter(
+            Vacancy.company == "Upsert"
+        )
+    }
+    assert titles["https://example.com/upsert/0"] == "Senior Python Dev"
+    assert len(titles) == 4
+
+
+def test_upsert_vacancies_skips_same_content_hash(test_session):
+    vacancy = VacancyCreate(
+        title="Python Dev",
+        company="Hash",
+        url="https://example.com/hash/1",
+        salary={"from": 1000, "currency": "USD"},
+    )
+    upsert_vacancies(test_session, [vacancy])
+    stored = (
+        test_session.query(Vacancy).filter(Vacancy.company == "Hash").one()
+    )
+    first_hash = stored.content_hash
+    assert first_hash
+
+    counts = upsert_vacancies(test_session, [vacancy])
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 1}
+
+    changed = vacancy.model_copy(update={"salary": Salary(**{"from": 2000})})
+    counts = upsert_vacancies(test_session, [changed])
+    assert counts["updated"] == 1
+    test_session.refresh(stored)
+    assert stored.content_hash != first_hash
+
+    # Частичная запись сбрасывает хэш, следующая полная не пропускается
+    counts = upsert_vacancies(test_session, [vacancy], fields=LIST_FIELDS)
+    assert counts["updated"] == 1
+    test_session.refresh(stored)
+    assert stored.content_hash is None
+    counts = upsert_vacancies(test_session, [vacancy])
+    assert counts["updated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_harvest_vacancies_counts_broken_pages():
+    def handler(request):
+        page = int(request.url.params["page"])
+        if page == 1:
+            return httpx.Response(500)
+        if page == 2:
+            return httpx.Response(200, content=b'{"items": [{"id": "2-0"}')
+        return httpx.Response(200, json={"items": [{"id": "0"}], "pages": 4})
+
+    stats = {}
+    transport = httpx.MockTransport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        items = [
+            item
+            async for item in harvest_vacancies(
+                "python", per_page=1, client=client, stats=stats
+            )
+        ]
+
+    assert stats == {"pages": 2, "errors": 2, "found": 0, "truncated": False}
+    # Оборванная страница отбрасывается целиком вместе с уже разобранным
+    assert {item["id"] for item in items} == {"0"}
+
+
+def test_salary_columns_normalize_to_rub():
+    columns = salary_columns({"from": 1000, "to": 3000, "currency": "USD"})
+    assert columns["salary_from"] == 1000
+    assert columns["salary_currency"] == "USD"
+    assert columns["salary_mid_rub"] == round(2000 / CURRENCY_RATES["USD"])
+    assert (
+        salary_columns({"to": 50000, "currency": "RUR"})["salary_mid_rub"]
+        == 50000
+    )
+    assert salary_columns(None)["salary_mid_rub"] is None
+    # В рублях сумма не помещается в integer-колонку
+    assert (
+        salary_columns({"from": 100_000_000, "currency": "USD"})[
+            "salary_mid_rub"
+        ]
+        is None
+    )
+    # Старые данные неподходящего формата в колонки не попадают
+    assert salary_columns(
+        {"from": "abc", "to": 10**12, "currency": "RUBLES", "gross": "yes"}
+    ) == dict.fromkeys(
+        [
+            "salary_from",
+            "salary_to",
+            "salary_currency",
+            "salary_gross",
+            "salary_mid_rub",
+        ]
+    )
+
+
+def test_create_vacancy_validates_salary(client):
+    for salary in [{"from": "abc"}, {"currency": "RUBLES"}, {"to": 10**12}]:
+        response = client.post(
+            "/vacancies/",
+            json={
+                "title": "Dev",
+                "company": "Salary Overflow",
+                "salary": salary,
+            },
+        )
+        assert response.status_code == 422
+
+    response = client.post(
+        "/vacancies/",
+        json={
+            "title": "Dev",
+            "company": "Salary Overflow",
+            "salary": {"from": 100_000_000, "currency": "USD"},
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["salary_mid_rub"] is None
+
+
+def test_get_vacancies_salary_filter_and_sort(client):
+    salaries = {
+        "low": {"from": 50000, "currency": "RUR"},
+        "high": {"from": 200000, "to": 300000, "currency": "RUR"},
+        "usd": {"from": 1000, "to": 2000, "currency": "USD"},
+        "none": None,
+    }
+    for name, salary in salaries.items():
+        client.post(
+            "/vacancies",
+            json={
+                "title": f"Salary {name}",
+                "company": "Salary Test",
+                "url": f"https://example.com/salary/{name}",
+                "salary": salary,
+            },
+        )
+
+    response = client.get(
+        "/vacancies",
+        params={"company": "Salary Test", "sort_by": "salary", "limit": 10},
+    )
+    titles = [item["title"] for item in response.json()]
+    assert titles == ["Salary high", "Salary usd", "Salary low", "Salary none"]
+    assert response.json()[0]["salary_mid_rub"] == 250000
+
+    response = client.get(
+        "/vacancies",
+        params={
+            "company": "Salary Test",
+            "salary_min": 100000,
+            "salary_max": 200000,
+        },
+    )
+    assert [item["title"] for item in response.json()] == ["Salary usd"]
+
+
+def test_cursor_pagination_walks_both_ways(client):
+    for i in range(5):
+        client.post(
+            "/vacancies",
+            json={"title": f"Cursor {i}", "company": "Cursor Test"},
+        )
+    params = {"company": "Cursor Test", "sort_by": "title", "limit": 2}
+
+    pages, cursor = [], None
+    while True:
+        response = client.get(
+            "/vacancies", params={**params, "cursor": cursor}
+        )
+        assert response.status_code == 200
+        pages.append([item["title"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert pages == [
+        ["Cursor 4", "Cursor 3"],
+        ["Cursor 2", "Cursor 1"],
+        ["Cursor 0"],
+    ]
+
+    prev_cursor = response.headers["X-Prev-Cursor"]
+    response = client.get(
+        "/vacancies", params={**params, "cursor": prev_cursor}
+    )
+    assert [item["title"] for item in response.json()] == pages[1]
+    response = client.get(
+        "/vacancies",
+        params={**params, "cursor": response.headers["X-Prev-Cursor"]},
+    )
+    assert [item["title"] for item in response.json()] == pages[0]
+    assert "X-Prev-Cursor" not in response.headers
+
+    # Курсор другой сортировки или испорченный отклоняется
+    response = client.get(
+        "/vacancies",
+        params={**params, "sort_by": "created_at", "cursor": prev_cursor},
+    )
+    assert response.status_code == 400
+    response = client.get("/vacancies", params={**params, "cursor": "broken"})
+    assert response.status_code == 400
+    # Ключ и id не того типа, что колонки
+    for forged in [
+        encode_cursor("title", "Cursor 3", "abc", "next"),
+        encode_cursor("title", {"a": 1}, 1, "next"),
+    ]:
+        response = client.get(
+            "/vacancies", params={**params, "cursor": forged}
+        )
+        assert response.status_code == 400
+
+
+def test_substring_filters_escape_wildcards(client):
+    for title in ("100% remote", "Remote only", "snake_case dev"):
+        client.post(
+            "/vacancies", json={"title": title, "company": "Wildcard Test"}
+        )
+
+    def titles(**params):
+        response = client.get(
+            "/vacancies", params={"company": "wildcard", **params}
+        )
+        return sorted(item["title"] for item in response.json())
+
+    assert titles(title="0% r") == ["100% remote"]
+    assert titles(title="e_c") == ["snake_case dev"]
+    assert titles(title="%") == ["100% remote"]
+    assert titles(title="REMOTE") == ["100% remote", "Remote only"]
+
+
+def test_search_ranks_and_highlights(client):
+    vacancies = [
+        ("Scala-разработчик", "Описание: разработка сервисов", ["Akka"]),
+        ("Java developer", "<p>Backend на Scala и <b>Kafka</b></p>", []),
+        ("Аналитик данных", "SQL и отчёты для разработчиков", ["Scala"]),
+        ("Тестировщик", "Ручное тестирование", ["Postman"]),
+    ]
+    for title, description, skills in vacancies:
+        client.post(
+            "/vacancies",
+            json={
+                "title": title,
+                "company": "Search Test",
+                "url": f"https://example.com/search/{title}",
+                "description": description,
+                "key_skills": skills,
+            },
+        )
+
+    def titles(q):
+        response = client.get("/vacancies/search", params={"q": q})
+        assert response.status_code == 200
+        return [item["title"] for item in response.json()]
+
+    results = client.get("/vacancies/search", params={"q": "scala"}).json()
+    # Совпадение в названии весит больше, чем в навыках и описании
+    assert results[0]["title"] == "Scala-разработчик"
+    assert {item["title"] for item in results} == {
+        "Scala-разработчик",
+        "Java developer",
+        "Аналитик данных",
+    }
+    assert results == sorted(results, key=lambda item: -item["rank"])
+    java = next(item for item in results if item["title"] == "Java developer")
+    assert "<b>Scala</b>" in java["headline"]
+    assert "<p>" not in java["headline"]
+
+    # Русская морфология и английские слова в одном запросе
+    assert set(titles("scala разработчики")) == {
+        "Scala-разработчик",
+        "Аналитик данных",
+    }
+    assert titles("developers scala") == ["Java developer"]
+    assert titles("developers scala -java") == []
+
+
+def test_search_cursor_pagination(client):
+    for i in range(5):
+        client.post(
+            "/vacancies",
+            json={
+                "title": f"Kotlin developer {i}",
+                "company": "Search Cursor",
+                "url": f"https://example.com/search-cursor/{i}",
+            },
+        )
+
+    seen, cursor = [], None
+    while True:
+        response = client.get(
+            "/vacancies/search",
+            params={"q": "kotlin", "limit": 2, "cursor": cursor},
+        )
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+    for cursor in [
+        "broken",
+        encode_cursor("rank", 0.1, 1, "prev"),
+        encode_cursor("rank", "zz", 1, "next"),
+    ]:
+        response = client.get(
+            "/vacancies/search", params={"q": "kotlin", "cursor": cursor}
+        )
+        assert response.status_code == 400
+    assert client.get("/vacancies/search", params={"q": ""}).status_code == 422
+
+
+def test_export_streams_ndjson_and_csv(client):
+    ids = []
+    for i in range(5):
+        response = client.post(
+            "/vacancies",
+            json={
+                "title": f"Export {i}",
+                "company": "Export Test",
+                "url": f"https://example.com/export/{i}",
+                "salary": {"from": 1000 * (i + 1), "currency": "RUR"},
+                "key_skills": ["SQL", "Экспорт"],
+            },
+        )
+        ids.append(response.json()["id"])
+
+    params = {"company": "Export Test"}
+    response = client.get("/vacancies/export", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert rows[0]["salary"] == {"from": 1000, "currency": "RUR"}
+    assert rows[0]["key_skills"] == ["SQL", "Экспорт"]
+
+    # Продолжение после обрыва
+    response = client.get(
+        "/vacancies/export", params={**params, "after_id": ids[2]}
+    )
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == (
+        ids[3:]
+    )
+    since = rows[-1]["created_at"]
+    response = client.get(
+        "/vacancies/export", params={**params, "since": since}
+    )
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == (
+        [ids[-1]]
+    )
+
+    response = client.get(
+        "/vacancies/export", params={**params, "format": "csv"}
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(record["id"]) for record in records] == ids
+    assert json.loads(records[1]["key_skills"]) == ["SQL", "Экспорт"]
+    assert records[1]["title"] == "Export 1"
+
+
+def test_export_since_includes_updated_rows(client, test_session):
+    ids = []
+    for i in range(4):
+        response = client.post(
+            "/vacancies",
+            json={
+                "title": f"Export Updated {i}",
+                "company": "Export Updated",
+                "url": f"https://example.com/export-updated/{i}",
+            },
+        )
+        ids.append(response.json()["id"])
+    since = test_session.execute(select(func.now())).scalar()
+    test_session.rollback()
+
+    # Каждый путь записи сдвигает updated_at: PUT, PATCH /bulk и upsert
+    client.put(
+        f"/vacancies/{ids[0]}",
+        json={"title": "Export Updated 0 renamed"},
+    )
+    client.patch(
+        "/vacancies/bulk",
+        json=[{"id": ids[1], "title": "Export Updated 1 renamed"}],
+    )
+    upsert_vacancies(
+        test_session,
+        [
+            VacancyCreate(
+                title="Export Updated 2 renamed",
+                company="Export Updated",
+                url="https://example.com/export-updated/2",
+            )
+        ],
+    )
+
+    response = client.get(
+        "/vacancies/export",
+        params={"company": "Export Updated", "since": since.isoformat()},
+    )
+    exported = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert exported == ids[:3]
+
+
+def test_export_serializers_yield_batches():
+    rows = [{"id": i, "skills": ["SQL"]} for i in range(5)]
+    chunks = list(to_ndjson(iter(rows), batch_size=2))
+    assert len(chunks) == 3
+    assert b"".join(chunks).count(b"\n") == 5
+
+    chunks = list(to_csv(iter([]), batch_size=2))
+    assert chunks[0].startswith(b"id,")
+
+
+def test_bulk_create_update_delete(client):
+    existing = client.post(
+        "/vacancies",
+        json={
+            "title": "Bulk 0",
+            "company": "Bulk Test",
+            "url": "https://example.com/bulk/0",
+        },
+    ).json()
+    items = [
+        {
+            "title": "Bulk 0 again",
+            "company": "Bulk Test",
+            "url": "https://example.com/bulk/0",
+        },
+        {
+            "title": "Bulk 1",
+            "company": "Bulk Test",
+            "url": "https://example.com/bulk/1",
+        },
+        {
+            "title": "Bulk 1 again",
+            "company": "Bulk Test",
+            "url": "https://example.com/bulk/1",
+        },
+        {"title": "Bulk without url", "company": "Bulk Test"},
+    ]
+    response = client.post("/vacancies/bulk", json=items)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == [
+        "exists",
+        "created",
+        "exists",
+        "created",
+    ]
+    assert results[0]["id"] == existing["id"]
+    assert results[2]["id"] == results[1]["id"]
+    created_id = results[1]["id"]
+
+    response = client.patch(
+        "/vacancies/bulk",
+        json=[
+            {"id": created_id, "salary": {"from": 100, "currency": "USD"}},
+            {"id": created_id, "title": "Bulk 1 renamed"},
+            {"id": 999999999, "title": "Missing"},
+        ],
+    )
+    assert [result["status"] for result in response.json()] == [
+        "updated",
+        "updated",
+        "not_found",
+    ]
+    vacancies = client.get(
+        "/vacancies", params={"title": "Bulk 1 renamed"}
+    ).json()
+    assert vacancies[0]["salary_mid_rub"] == round(100 / CURRENCY_RATES["USD"])
+
+    # Повторяющийся url откатывает весь пакет
+    response = client.patch(
+        "/vacancies/bulk",
+        json=[
+            {"id": created_id, "title": "Not saved"},
+            {"id": existing["id"], "url": "https://example.com/bulk/1"},
+        ],
+    )
+    assert response.status_code == 409
+    assert client.get("/vacancies", params={"title": "Bulk 1 renamed"}).json()
+    # Обязательное поле не обнуляется
+    response = client.patch(
+        "/vacancies/bulk", json=[{"id": created_id, "title": None}]
+    )
+    assert response.status_code == 422
+
+    response = client.request(
+        "DELETE",
+        "/vacancies/bulk",
+        json={"ids": [existing["id"], created_id, 999999999, created_id]},
+    )
+    assert [result["status"] for result in response.json()] == [
+        "deleted",
+        "deleted",
+        "not_found",
+    ]
+    titles = [
+        item["title"]
+        for item in client.get(
+            "/vacancies", params={"company": "Bulk Test"}
+        ).json()
+    ]
+    assert titles == ["Bulk without url"]
+    assert client.post("/vacancies/bulk", json=[]).status_code == 422
+
+
+def test_sparse_fieldsets(client):
+    for number in range(3):
+        client.post(
+            "/vacancies",
+            json={
+                "title": f"Sparse {number}",
+                "company": "Sparse Test",
+                "url": f"https://example.com/sparse/{number}",
+                "salary": {"from": 1000, "currency": "RUR"},
+            },
+        )
+    params = {"company": "Sparse Test", "sort_by": "title", "limit": 2}
+
+    full = client.get("/vacancies", params=params)
+    # Быстрый путь отдаёт то же, что VacancyRead
+    for item in full.json():
+        assert VacancyRead.model_validate(item).model_dump(mode="json") == (
+            item
+        )
+
+    response = client.get(
+        "/vacancies", params={**params, "fields": "salary, title"}
+    )
+    assert response.json() == [
+        {"title": "Sparse 2", "salary": {"from": 1000, "currency": "RUR"}},
+        {"title": "Sparse 1", "salary": {"from": 1000, "currency": "RUR"}},
+    ]
+    # Курсор строится и без id в ответе
+    response = client.get(
+        "/vacancies",
+        params={
+            **params,
+            "fields": "title",
+            "cursor": response.headers["X-Next-Cursor"],
+        },
+    )
+    assert response.json() == [{"title": "Sparse 0"}]
+
+    response = client.get("/vacancies", params={"fields": "title,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["error"]
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import select
+
+from app.crud.vacancy import upsert_vacancies
+from app.models import Vacancy, VacancyFacetCount
+from app.schemas import VacancyCreate
+
+URL = "https://example.com/facets/{}"
+CLEANUP_URL = URL.format("%")
+SALARY = {"from": 120000, "to": 140000, "currency": "RUR"}
+pytestmark = pytest.mark.usefixtures("cleanup")
+
+
+def make_vacancy(number, company="Facet Co", **fields):
+    return VacancyCreate(
+        title=f"Facet {number}",
+        company=company,
+        url=URL.format(number),
+        source="hh.ru",
+        **fields,
+    )
+
+
+def test_rollup_follows_every_write(test_session):
+    upsert_vacancies(
+        test_session,
+        [
+            make_vacancy(1, location="Москва", salary=SALARY),
+            make_vacancy(2, location="Москва", salary=SALARY),
+            make_vacancy(3, company="Facet Labs", location="Казань"),
+        ],
+    )
+    # Пакет с изменённой и новой вакансией, затем удаление в обход crud
+    upsert_vacancies(
+        test_session,
+        [
+            make_vacancy(2, location="Казань", salary=SALARY),
+            make_vacancy(4, company="Facet Labs", location="Казань"),
+        ],
+    )
+    test_session.query(Vacancy).filter(Vacancy.url == URL.format(1)).delete()
+    test_session.commit()
+
+    rows = test_session.execute(
+        select(
+            VacancyFacetCount.company,
+            VacancyFacetCount.location,
+            VacancyFacetCount.salary_band,
+            VacancyFacetCount.vacancies,
+        ).where(VacancyFacetCount.company.like("Facet%"))
+    ).all()
+    # Обнулившиеся сочетания удалены триггером, а не оставлены с нулём
+    assert set(rows) == {
+        ("Facet Co", "Казань", 100000, 1),
+        ("Facet Labs", "Казань", None, 2),
+    }
+
+
+def test_facets_endpoint(client, test_session):
+    upsert_vacancies(
+        test_session,
+        [
+            make_vacancy(1, location="Москва", salary=SALARY),
+            make_vacancy(2, location="Казань", salary=SALARY),
+            make_vacancy(3, company="Facet Labs", location="Казань"),
+        ],
+    )
+
+    response = client.get("/vacancies/facets", params={"company": "facet"})
+    assert response.status_code == 200
+    facets = response.json()
+    assert facets["total"] == 3
+    assert facets["company"] == [
+        {"value": "Facet Co", "name": None, "count": 2},
+        {"value": "Facet Labs", "name": None, "count": 1},
+    ]
+    assert facets["location"][0] == {
+        "value": "Казань",
+        "name": None,
+        "count": 2,
+    }
+    assert facets["source"] == [{"value": "hh.ru", "name": None, "count": 3}]
+    assert {"value": 100000, "name": "100000–150000", "count": 2} in facets[
+        "salary"
+    ]
+
+    # Значение фасета можно передать фильтром
+    response = client.get(
+        "/vacancies/facets",
+        params={"company": "facet", "salary_band": 100000, "limit": 1},
+    )
+    facets = response.json()
+    assert facets["total"] == 2
+    assert facets["company"] == [
+        {"value": "Facet Co", "name": None, "count": 2}
+    ]
+    assert len(facets["location"]) == 1
+
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/vacancies/facets",
+        params={"company": "facet", "salary_band": 100000, "limit": 1},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304